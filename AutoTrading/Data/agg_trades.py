@@ -0,0 +1,468 @@
+"""
+aggTrades(체결 단위) 재생 체결 모드 (메모리 맵 바이너리 파일)
+
+신호/지표는 기존처럼 리샘플링 봉으로 계산하고, 체결 가격만 실제 체결 순서에서 결정.
+고정 SLIPPAGE_RATE와 "한 봉에서 손절/익절이 모두 닿으면 손절 우선" 가정을 대신함.
+
+- 진입(시장가): 봉 시작부터 같은 방향 테이커 체결(롱 = 매수 테이커/매도 호가, 숏 = 매도 테이커/매수 호가)을
+  순서대로 소화해 주문 수량을 채운 평균가 (VWAP)
+- 손절(시장가): 가격이 손절가를 처음 넘은 체결부터 같은 방향 테이커 체결로 남은 수량을 채운 평균가
+  (갭으로 넘어가거나 급락 중이면 그만큼 불리하게 체결)
+- 익절/부분 익절(지정가): 처음 닿은 체결이 있으면 지정가에 체결
+- 한 봉에서 여러 트리거가 닿으면 먼저 닿은 체결 순서로 결정 (같은 체결이면 손절 > 부분 익절 > 익절)
+- 해당 봉 체결이 없으면(데이터 공백) 기존 봉 고가/저가 판정으로 대체 (이때 슬리피지 없이 트리거 가격)
+
+저장 형식: <디렉터리>/time.i8 (체결 시각 ns), price.f8, qty.f8, buyer_maker.u1 (컬럼별 원시 배열, 시간순)
+- np.memmap으로 열고 봉 구간은 시각 컬럼 searchsorted로 찾아서 그 구간만 읽음
+  -> 파일 크기(수십억 건)와 무관하게 메모리 일정, 페이지 캐시가 실제 I/O를 담당
+- 트리거 탐색/테이커 VWAP 체결은 numba(@njit) 커널로 체결을 앞에서부터 한 건씩 처리 (닿으면 바로 멈춤)
+  numba가 없으면 같은 결과의 NumPy 경로 (SCAN_CHUNK 단위 비교 + argmax, cumsum + searchsorted)
+- convert: Binance aggTrades CSV/ZIP(data.binance.vision)을 CHUNK_ROWS 행씩 읽어 덧붙임 (메모리 일정)
+- stream_bars: 같은 체결로 리샘플링 봉 생성 (data_pipeline.resample_stream, 신호와 체결이 같은 데이터)
+
+사용법:
+    python agg_trades.py convert <디렉터리> <CSV/ZIP ...>   # 날짜순 파일 이름 (ETHUSDT-aggTrades-2024-01-01.zip 등)
+    python agg_trades.py info <디렉터리>
+    python agg_trades.py bench <디렉터리> [--timeframe=15min]  # resolve/entry_fill 재생 속도 (건/초, numba/NumPy)
+    python agg_trades.py backtest <디렉터리> [--timeframe=15min]  # 체결로 만든 봉 + 체결 재생 백테스트
+
+    backtest = BinanceETHFuturesBacktest(exit_resolver=AggTradeExecutor(AggTradeStore(디렉터리)))
+"""
+
+import hashlib
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from data_pipeline import OHLCV_COLUMNS, resample_stream
+
+try:
+    from numba import njit
+except ImportError:  # 선택 의존성 (requirements.txt), 없으면 NumPy 경로
+    njit = None
+
+# ================================
+# 설정
+# ================================
+AGG_TRADE_COLUMNS = {'time': np.int64, 'price': np.float64, 'qty': np.float64, 'buyer_maker': np.uint8}
+CHUNK_ROWS = 2_000_000  # convert/스트리밍 시 한 번에 다루는 체결 수 (청크당 메모리 ≈ 행 수 x 25바이트)
+SCAN_CHUNK = 1 << 16    # 봉 안에서 트리거를 찾을 때 한 번에 비교하는 체결 수 (앞에서 찾으면 나머지는 읽지 않음)
+SAMPLE_ROWS = 4096      # fingerprint에 쓰는 표본 체결 수
+CSV_FIELDS = ('agg_trade_id', 'price', 'quantity', 'first_trade_id', 'last_trade_id', 'transact_time',
+              'is_buyer_maker')
+
+
+# 트리거 코드 (같은 체결에서 여러 개가 닿으면 작은 값 우선)
+HIT_NONE, HIT_STOP, HIT_PARTIAL, HIT_TAKE = 0, 1, 2, 3
+HIT_REASONS = {HIT_STOP: ("STOP_LOSS", False), HIT_PARTIAL: ("PARTIAL_TAKE_PROFIT", True),
+               HIT_TAKE: ("TAKE_PROFIT", False)}
+
+
+def _column_path(directory: Path, name: str) -> Path:
+    return Path(directory) / f"{name}.{np.dtype(AGG_TRADE_COLUMNS[name]).str[1:]}"
+
+
+# ================================
+# 저장소
+# ================================
+class AggTradeStore:
+    """컬럼별 메모리 맵 체결 저장소 (읽기 전용)"""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        sizes = {name: _column_path(self.directory, name).stat().st_size // np.dtype(dtype).itemsize
+                 for name, dtype in AGG_TRADE_COLUMNS.items()}
+        if len(set(sizes.values())) != 1:
+            raise ValueError(f"컬럼 길이가 다릅니다 (변환이 중간에 끊겼을 수 있음): {sizes}")
+        self.size = sizes['time']
+        for name, dtype in AGG_TRADE_COLUMNS.items():
+            values = np.memmap(_column_path(self.directory, name), dtype=dtype, mode='r', shape=(self.size,)) \
+                if self.size else np.empty(0, dtype=dtype)
+            setattr(self, name, values)
+        self._fingerprint: Optional[str] = None
+
+    def __len__(self) -> int:
+        return self.size
+
+    def bounds(self, start_ns: int, end_ns: int) -> Tuple[int, int]:
+        """[start_ns, end_ns) 체결 위치 구간 (이진 탐색이라 읽는 페이지는 log n개)"""
+        return (int(np.searchsorted(self.time, start_ns, side='left')),
+                int(np.searchsorted(self.time, end_ns, side='left')))
+
+    def fingerprint(self) -> str:
+        """저장소 내용 해시 (건수 + 앞/뒤/등간격 표본, 실행 캐시/저장 키용)"""
+        if self._fingerprint is None:
+            digest = hashlib.sha256(str(self.size).encode())
+            if self.size:
+                sample = np.unique(np.concatenate((
+                    np.arange(min(SAMPLE_ROWS, self.size)),
+                    np.linspace(0, self.size - 1, SAMPLE_ROWS).astype(np.int64),
+                    np.arange(max(self.size - SAMPLE_ROWS, 0), self.size))))
+                for name in AGG_TRADE_COLUMNS:
+                    digest.update(np.ascontiguousarray(getattr(self, name)[sample]).data)
+            self._fingerprint = digest.hexdigest()[:16]
+        return self._fingerprint
+
+    def chunks(self, start: int = 0, end: Optional[int] = None, rows: int = CHUNK_ROWS) -> Iterator[Tuple[int, int]]:
+        """[start, end) 위치를 rows개씩 나눈 구간"""
+        end = self.size if end is None else end
+        for i in range(start, end, rows):
+            yield i, min(i + rows, end)
+
+
+def _read_csv_chunks(path: Path, rows: int) -> Iterator[pd.DataFrame]:
+    """aggTrades CSV/ZIP (헤더 유무 모두) -> (time ns, price, qty, buyer_maker) 청크"""
+    with open(path, 'rb') as f:
+        head = f.read(2)
+    compression = 'zip' if head == b'PK' else 'infer'
+    first = pd.read_csv(path, header=None, nrows=1, compression=compression)
+    header = 0 if not str(first.iloc[0, 0]).strip().lstrip('-').isdigit() else None
+    # 현물 파일은 8번째 컬럼(best_match)이 더 있으므로 앞 7개만 사용
+    for chunk in pd.read_csv(path, header=header, usecols=range(7), chunksize=rows, compression=compression):
+        chunk.columns = CSV_FIELDS
+        ts = chunk['transact_time'].to_numpy(dtype=np.int64)
+        # 선물은 ms, 2025년 이후 현물은 us 단위
+        ts = ts * 1_000 if len(ts) and ts[0] > 10**14 else ts * 1_000_000
+        maker = chunk['is_buyer_maker']
+        if maker.dtype != bool:
+            maker = maker.astype(str).str.lower() == 'true'
+        yield pd.DataFrame({'time': ts, 'price': chunk['price'].to_numpy(dtype=np.float64),
+                            'qty': chunk['quantity'].to_numpy(dtype=np.float64),
+                            'buyer_maker': maker.to_numpy(dtype=np.uint8)})
+
+
+def convert(directory: Path, sources: Iterable[Path], rows: int = CHUNK_ROWS, verbose: bool = True) -> int:
+    """
+    aggTrades CSV/ZIP -> 컬럼별 바이너리 저장소 (임시 디렉터리에 쓴 뒤 이름 변경) -> 체결 수
+    sources는 시간순이어야 함 (파일 이름 순으로 정렬해서 처리)
+    """
+    directory = Path(directory)
+    if directory.exists():
+        raise ValueError(f"이미 있는 디렉터리입니다: {directory}")
+    tmp_dir = directory.with_name(f".{directory.name}.{os.getpid()}.tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+
+    total = 0
+    last_time = np.iinfo(np.int64).min
+    files = {name: open(_column_path(tmp_dir, name), 'wb') for name in AGG_TRADE_COLUMNS}
+    try:
+        for source in sorted(Path(s) for s in sources):
+            started = time.perf_counter()
+            count = 0
+            for chunk in _read_csv_chunks(source, rows):
+                ts = chunk['time'].to_numpy()
+                if len(ts) and (ts[0] < last_time or np.any(np.diff(ts) < 0)):
+                    raise ValueError(f"체결 시각이 시간순이 아닙니다: {source}")
+                for name, dtype in AGG_TRADE_COLUMNS.items():
+                    chunk[name].to_numpy(dtype=dtype).tofile(files[name])
+                last_time = ts[-1] if len(ts) else last_time
+                count += len(chunk)
+            total += count
+            if verbose:
+                print(f"  {source.name}: {count:,}건 ({time.perf_counter() - started:.1f}초)")
+    finally:
+        for f in files.values():
+            f.close()
+    os.rename(tmp_dir, directory)
+    return total
+
+
+# ================================
+# 체결 커널 (numba / NumPy 같은 결과)
+# ================================
+def _first_trigger_loop(price, is_long, stop, partial, take):
+    """
+    처음 닿은 트리거 -> (위치, HIT_*) / 없으면 (-1, HIT_NONE)
+    partial이 NaN이면 부분 익절은 확인하지 않음 (NaN 비교는 항상 거짓)
+    """
+    for i in range(len(price)):
+        p = price[i]
+        if is_long:
+            if p <= stop:
+                return i, HIT_STOP
+            if p >= partial:
+                return i, HIT_PARTIAL
+            if p >= take:
+                return i, HIT_TAKE
+        else:
+            if p >= stop:
+                return i, HIT_STOP
+            if p <= partial:
+                return i, HIT_PARTIAL
+            if p <= take:
+                return i, HIT_TAKE
+    return -1, HIT_NONE
+
+
+def _taker_fill_loop(price, qty, buyer_maker, maker_flag, quantity):
+    """
+    buyer_maker == maker_flag인 테이커 체결로 quantity를 채운 평균가 -> (평균가, 읽은 체결 수)
+    다 못 채우면 남은 수량은 마지막으로 소화한 체결 가격, 해당 체결이 없으면 NaN
+    """
+    filled = 0.0
+    notional = 0.0
+    last_price = np.nan
+    for i in range(len(price)):
+        if buyer_maker[i] != maker_flag:
+            continue
+        q = qty[i]
+        if filled + q >= quantity:
+            notional += price[i] * (quantity - filled)
+            return notional / quantity, i + 1
+        notional += price[i] * q
+        filled += q
+        last_price = price[i]
+    if last_price != last_price:
+        return np.nan, len(price)
+    return (notional + last_price * (quantity - filled)) / quantity, len(price)
+
+
+def _first_trigger_numpy(price, is_long, stop, partial, take):
+    """_first_trigger_loop의 NumPy 경로 (SCAN_CHUNK 단위 비교 + argmax, 앞 청크에서 찾으면 나머지는 읽지 않음)"""
+    for a in range(0, len(price), SCAN_CHUNK):
+        chunk = price[a:a + SCAN_CHUNK]
+        if is_long:
+            hits = ((chunk <= stop, HIT_STOP), (chunk >= partial, HIT_PARTIAL), (chunk >= take, HIT_TAKE))
+        else:
+            hits = ((chunk >= stop, HIT_STOP), (chunk <= partial, HIT_PARTIAL), (chunk <= take, HIT_TAKE))
+        best, best_at = HIT_NONE, len(chunk)
+        for hit, code in hits:
+            at = int(np.argmax(hit))
+            if hit[at] and at < best_at:
+                best, best_at = code, at
+        if best != HIT_NONE:
+            return a + best_at, best
+    return -1, HIT_NONE
+
+
+def _taker_fill_numpy(price, qty, buyer_maker, maker_flag, quantity):
+    """_taker_fill_loop의 NumPy 경로 (SCAN_CHUNK 단위 cumsum + searchsorted)"""
+    filled = 0.0
+    notional = 0.0
+    last_price = None
+    for a in range(0, len(price), SCAN_CHUNK):
+        b = min(a + SCAN_CHUNK, len(price))
+        mask = buyer_maker[a:b] == maker_flag
+        p = price[a:b][mask]
+        q = qty[a:b][mask]
+        if len(p) == 0:
+            continue
+        cum = np.cumsum(q)
+        k = int(np.searchsorted(cum, quantity - filled, side='left'))
+        if k < len(p):
+            before = cum[k - 1] if k > 0 else 0.0
+            notional += float(np.dot(p[:k], q[:k])) + p[k] * (quantity - filled - before)
+            return notional / quantity, b
+        notional += float(np.dot(p, q))
+        filled += float(cum[-1])
+        last_price = float(p[-1])
+    if last_price is None:
+        return np.nan, len(price)
+    return (notional + last_price * (quantity - filled)) / quantity, len(price)
+
+
+HAS_NUMBA = njit is not None
+if HAS_NUMBA:
+    _first_trigger_jit = njit(cache=True, nogil=True)(_first_trigger_loop)
+    _taker_fill_jit = njit(cache=True, nogil=True)(_taker_fill_loop)
+
+
+# ================================
+# 체결 재생 (BinanceETHFuturesBacktest exit_resolver)
+# ================================
+class AggTradeExecutor:
+    """
+    aggTrades 기반 체결기 (IntrabarExitResolver와 같은 자리에 사용)
+    fills_from_trades=True: 백테스터가 진입 가격도 entry_fill로 정하고 청산 가격에 슬리피지를 더하지 않음
+    use_numba=False면 numba가 있어도 NumPy 경로 (bench 비교용)
+    """
+
+    fills_from_trades = True
+
+    def __init__(self, store: AggTradeStore, timeframe: str = '15min', use_numba: bool = HAS_NUMBA):
+        self.store = store
+        self.bar_ns = pd.Timedelta(timeframe).value
+        self.use_numba = use_numba and HAS_NUMBA
+        self._first_trigger = _first_trigger_jit if self.use_numba else _first_trigger_numpy
+        self._fill_kernel = _taker_fill_jit if self.use_numba else _taker_fill_numpy
+        self.lookups = 0          # 체결을 확인한 봉 수 (통계용)
+        self.trades_scanned = 0   # 실제로 비교한 체결 수 (통계용)
+
+    def fingerprint(self) -> str:
+        return self.store.fingerprint()
+
+    def run_config(self) -> Dict:
+        """저장 키에 더할 설정 (저장소 해시는 _run_config가 fingerprint로 기록)"""
+        return {'fill_model': 'agg_trades'}
+
+    def _bar_bounds(self, bar_time) -> Tuple[int, int]:
+        start = pd.Timestamp(bar_time).value
+        return self.store.bounds(start, start + self.bar_ns)
+
+    def _taker_fill(self, start: int, end: int, taker_sells: bool, quantity: float) -> Optional[float]:
+        """
+        start부터 같은 방향 테이커 체결로 quantity를 채운 평균가
+        봉 안 체결로 다 못 채우면 남은 수량은 마지막으로 소화한 체결 가격, 같은 방향 체결이 없으면 None
+        """
+        store = self.store
+        fill, scanned = self._fill_kernel(store.price[start:end], store.qty[start:end],
+                                          store.buyer_maker[start:end], 1 if taker_sells else 0, float(quantity))
+        self.trades_scanned += int(scanned)
+        return None if np.isnan(fill) else float(fill)
+
+    def entry_fill(self, bar_time, side: str, quantity: float) -> Optional[float]:
+        """봉 시작 시장가 진입 평균가 (봉 체결이 없으면 None)"""
+        start, end = self._bar_bounds(bar_time)
+        if start == end:
+            return None
+        self.lookups += 1
+        return self._taker_fill(start, end, side != "long", quantity)
+
+    def resolve(self, bar_time, position) -> Optional[Tuple[float, str, bool]]:
+        """
+        봉 안에서 가장 먼저 닿은 트리거와 실제 체결 가격
+        Returns: (exit_price, exit_reason, is_partial) / 봉 체결이 없거나 아무것도 닿지 않으면 None
+        """
+        start, end = self._bar_bounds(bar_time)
+        if start == end:
+            return None
+        self.lookups += 1
+        is_long = position.side == "long"
+        check_partial = not position.partial_taken and position.partial_take_profit is not None
+        partial = float(position.partial_take_profit) if check_partial else np.nan
+
+        at, code = self._first_trigger(self.store.price[start:end], is_long, float(position.stop_loss),
+                                       partial, float(position.take_profit))
+        at, code = int(at), int(code)
+        self.trades_scanned += at + 1 if code != HIT_NONE else end - start
+        if code == HIT_NONE:
+            return None
+        reason, is_partial = HIT_REASONS[code]
+        if code != HIT_STOP:
+            limit = position.partial_take_profit if is_partial else position.take_profit
+            return limit, reason, is_partial
+        # 손절은 시장가: 트리거 체결부터 청산 방향 테이커 체결로 남은 수량 소화
+        fill = self._taker_fill(start + at, end, is_long, position.remaining_quantity)
+        return (position.stop_loss if fill is None else fill), reason, is_partial
+
+
+# ================================
+# 체결 -> 리샘플링 봉
+# ================================
+def _trade_chunks(store: AggTradeStore, start: int, end: int) -> Iterator[pd.DataFrame]:
+    """체결 구간 -> 1건 = 1행 OHLCV 청크 (open=high=low=close=가격, volume=수량)"""
+    for a, b in store.chunks(start, end):
+        price = np.asarray(store.price[a:b])
+        index = pd.DatetimeIndex(np.asarray(store.time[a:b]).view('datetime64[ns]'), name='timestamp')
+        yield pd.DataFrame({'open': price, 'high': price, 'low': price, 'close': price,
+                            'volume': np.asarray(store.qty[a:b])}, index=index, copy=False)
+
+
+def stream_bars(store: AggTradeStore, timeframe: str = '15min', start: Optional[pd.Timestamp] = None,
+                end: Optional[pd.Timestamp] = None) -> Iterator[pd.DataFrame]:
+    """체결 -> 리샘플링 봉 청크 (data_pipeline.resample_stream, 메모리 일정)"""
+    i, j = store.bounds(pd.Timestamp(start).value if start is not None else np.iinfo(np.int64).min,
+                        pd.Timestamp(end).value if end is not None else np.iinfo(np.int64).max)
+    return resample_stream(_trade_chunks(store, i, j), timeframe)
+
+
+def load_trade_bars(store: AggTradeStore, timeframe: str = '15min', start: Optional[pd.Timestamp] = None,
+              end: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+    """체결로 만든 OHLCV 봉 (bt.load_data와 같은 컬럼)"""
+    bars = list(stream_bars(store, timeframe, start, end))
+    if not bars:
+        return pd.DataFrame(columns=OHLCV_COLUMNS)
+    return pd.concat(bars)
+
+
+# ================================
+# 측정
+# ================================
+def replay_rate(store: AggTradeStore, timeframe: str = '15min', use_numba: bool = HAS_NUMBA) -> Dict:
+    """
+    저장소 전체 봉에 AggTradeExecutor.entry_fill/resolve를 그대로 호출해 재생 속도 측정
+    가상 포지션은 손절/익절이 저장소 가격 범위 밖이고 수량이 전체 거래량보다 커서 봉 전체 체결을 읽음
+    (봉 찾기 + 커널 호출을 포함한 실제 백테스트 경로의 최악 경우)
+    Returns: {'kernel', 'bars', 'entry_trades', 'entry_seconds', 'resolve_trades', 'resolve_seconds'}
+    """
+    executor = AggTradeExecutor(store, timeframe, use_numba)
+    if len(store) == 0:
+        return {'kernel': 'numba' if executor.use_numba else 'numpy', 'bars': 0, 'entry_trades': 0,
+                'entry_seconds': 0.0, 'resolve_trades': 0, 'resolve_seconds': 0.0}
+    first = int(store.time[0]) - int(store.time[0]) % executor.bar_ns
+    bar_times = [pd.Timestamp(t) for t in range(first, int(store.time[-1]) + 1, executor.bar_ns)]
+    low, high = float(np.min(store.price)), float(np.max(store.price))
+    quantity = float(np.sum(store.qty)) + 1.0
+    position = SimpleNamespace(side="long", partial_taken=False, stop_loss=low / 2, partial_take_profit=high * 2,
+                               take_profit=high * 3, remaining_quantity=quantity)
+
+    # 첫 호출의 numba 컴파일(또는 캐시 로드)은 측정에서 제외
+    executor.entry_fill(bar_times[0], "long", quantity)
+    executor.resolve(bar_times[0], position)
+
+    result = {'kernel': 'numba' if executor.use_numba else 'numpy', 'bars': len(bar_times)}
+    for name, call in (('entry', lambda t: executor.entry_fill(t, "long", quantity)),
+                       ('resolve', lambda t: executor.resolve(t, position))):
+        executor.trades_scanned = 0
+        started = time.perf_counter()
+        for bar_time in bar_times:
+            call(bar_time)
+        result[f'{name}_seconds'] = time.perf_counter() - started
+        result[f'{name}_trades'] = executor.trades_scanned
+    return result
+
+
+def main():
+    args = sys.argv[1:]
+    if len(args) < 2 or args[0] not in ('convert', 'info', 'bench', 'backtest'):
+        print(__doc__)
+        return
+    command, directory = args[0], Path(args[1])
+    options = dict(a[2:].split('=', 1) for a in args[2:] if a.startswith('--') and '=' in a)
+
+    if command == 'convert':
+        sources = [Path(a) for a in args[2:] if not a.startswith('--')]
+        started = time.perf_counter()
+        total = convert(directory, sources)
+        print(f"  [저장] aggTrades {total:,}건 -> {directory} ({time.perf_counter() - started:.1f}초)")
+        return
+
+    store = AggTradeStore(directory)
+    if command == 'info':
+        first, last = (pd.Timestamp(int(store.time[k])) for k in (0, -1)) if len(store) else (None, None)
+        print(f"[aggTrades] {directory}: {len(store):,}건, {first} ~ {last}, 해시 {store.fingerprint()}")
+
+    elif command == 'bench':
+        timeframe = options.get('timeframe', '15min')
+        for use_numba in ((True, False) if HAS_NUMBA else (False,)):
+            r = replay_rate(store, timeframe, use_numba)
+            for name in ('entry', 'resolve'):
+                trades, seconds = r[f'{name}_trades'], r[f'{name}_seconds']
+                print(f"[aggTrades] {r['kernel']:5s} {name:7s} {r['bars']:,}봉, {trades:,}건 / {seconds:.2f}초 "
+                      f"= {trades / max(seconds, 1e-9) / 1e6:.1f}M건/초")
+        if not HAS_NUMBA:
+            print("  numba 미설치: NumPy 경로만 측정 (pip install numba)")
+
+    else:
+        import binance_eth_futures_backtest as bt  # bt가 이 모듈을 참조하지 않도록 실행 시점에 로드
+        from feature_store import with_indicators
+        bt.RESAMPLE_TIMEFRAME = options.get('timeframe', bt.RESAMPLE_TIMEFRAME)
+        df = with_indicators(load_trade_bars(store, bt.RESAMPLE_TIMEFRAME))
+        executor = AggTradeExecutor(store, bt.RESAMPLE_TIMEFRAME)
+        backtest = bt.BinanceETHFuturesBacktest(exit_resolver=executor)
+        results = backtest.run_backtest(df)
+        print(f"[aggTrades] 체결 확인 봉 {executor.lookups:,}개, 비교한 체결 {executor.trades_scanned:,}건")
+        print(f"  최종 자본 {results['final_capital']:.2f} USDT, 거래 {results['total_trades']}건, "
+              f"최대 낙폭 {results['max_drawdown']:.2f}%")
+
+
+if __name__ == "__main__":
+    main()
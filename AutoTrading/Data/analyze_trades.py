@@ -1,13 +1,41 @@
-"""거래 내역 분석 스크립트"""
+"""
+거래 내역 분석 스크립트
+
+사용법: python analyze_trades.py [실행 id 또는 폴더 이름]
+인자가 없으면 카탈로그(run_catalog)에서 수익률이 가장 높은 실행을 분석
+"""
+import sys
+from pathlib import Path
+
 import pandas as pd
 
-df = pd.read_csv('backtest_results/20260105_150115_backtest/trades.csv')
+from binance_eth_futures_backtest import OUTPUT_DIR
+from run_catalog import best, get_run
+from run_store import load_run
+
+results_root = Path(__file__).parent / OUTPUT_DIR
+if len(sys.argv) > 1:
+    run = get_run(results_root, sys.argv[1])
+else:
+    top = best(results_root, 'total_return_pct', limit=1, where='total_trades > 0')
+    if top.empty:
+        print("카탈로그에 거래가 있는 실행이 없습니다. 'python run_catalog.py reindex'로 기존 결과를 등록하거나 "
+              "백테스트를 먼저 실행하세요.")
+        sys.exit(1)
+    run = top.iloc[0]
+run_dir = results_root / run['run_dir']
+print(f"[분석 대상] {run['run_dir']}")
+
+if (run_dir / 'run.json').exists():
+    df = load_run(run_dir)['trades']
+else:
+    df = pd.read_csv(run_dir / 'trades.csv')
 
 wins = df[df['net_pnl'] > 0]
 losses = df[df['net_pnl'] <= 0]
 
 print("="*60)
-print("수익률 22.90% 원인 분석")
+print(f"수익률 {run['total_return_pct']:.2f}% 원인 분석")
 print("="*60)
 print(f"\n총 거래: {len(df)}건")
 print(f"승리: {len(wins)}건, 손실: {len(losses)}건")
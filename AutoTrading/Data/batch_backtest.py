@@ -0,0 +1,314 @@
+"""
+파라미터 브로드캐스트 배치 백테스트 (K개 전략 상수 세트를 한 번의 봉 루프로 동시 실행)
+
+- 전략 상수(STRATEGY_PARAM_NAMES)는 모두 같은 지표 컬럼에 대한 임계값/배수이므로
+  지표는 한 번만 계산하고, 세트별 상태(포지션/자본/손절·익절 가격/최대 낙폭)를 길이 K 배열로 보관
+- 봉 루프는 한 번만 돌고 진입/청산/평가손익은 K축 배열 연산으로 처리 (세트별 파이썬 분기 없음)
+  어떤 세트도 포지션이 없고 직전 봉에 EMA 교차도 없으면 봉을 건너뜀 (교차는 모든 진입의 필요조건)
+- 진입 신호/추세 강도/포지션 비율은 trading_strategy.entry_rules에 길이 K 상수 배열을 넘겨 봉마다 한 번 계산
+  (백테스터/실전 봇/섀도 변형과 같은 규칙 구현)
+- 청산 규칙은 BinanceETHFuturesBacktest.run_backtest와 같음 (봉 내부 체결 판별 없이 손절 우선 가정)
+  --verify=N: 무작위 N개 세트를 기존 엔진으로 다시 실행해서 결과 비교
+- 자산 곡선은 저장하지 않고 세트별 최고점/최대 낙폭만 누적 (메모리 K x 상태 수)
+
+사용법:
+    python batch_backtest.py                     # SEARCH_SPACE에서 BATCH_SIZE개, 전체 데이터
+    python batch_backtest.py 6 --size=5000       # 최근 6개월, 5000개 세트
+    python batch_backtest.py --verify=20         # 기존 엔진과 20개 세트 비교
+"""
+
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+import binance_eth_futures_backtest as bt
+from binance_eth_futures_backtest import TREND_STRONG, TREND_WEAK
+import trading_strategy as ts
+from feature_store import with_indicators
+from successive_halving import SEARCH_SPACE, sample_candidates, score
+
+# ================================
+# 설정
+# ================================
+BATCH_SIZE = 2000
+REQUIRED_COLS = ['ema_fast', 'ema_slow', 'rsi', 'atr', 'volume_ratio']
+REASON_STOP, REASON_PARTIAL, REASON_TP = 0, 1, 2
+
+
+def param_matrix(param_sets: List[Dict[str, float]]) -> Dict[str, np.ndarray]:
+    """파라미터 세트 목록 -> 상수별 길이 K 배열 (지정하지 않은 상수는 현재 전역값)"""
+    defaults = bt.get_strategy_params()
+    for params in param_sets:
+        unknown = set(params) - set(defaults)
+        if unknown:
+            raise KeyError(f"알 수 없는 전략 파라미터: {sorted(unknown)}")
+    return {name: np.array([params.get(name, value) for params in param_sets], dtype=np.float64)
+            for name, value in defaults.items()}
+
+
+def _rule_values(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """entry_rules 입력 컬럼 (봉 축 배열, 직전 봉 EMA 포함)"""
+    values = {col: df[col].to_numpy(dtype=np.float64) for col in ts.RULE_COLUMNS}
+    values['prev_ema_fast'] = df['ema_fast'].shift(1).to_numpy(dtype=np.float64)
+    values['prev_ema_slow'] = df['ema_slow'].shift(1).to_numpy(dtype=np.float64)
+    return values
+
+
+def _bar_rules(values: Dict[str, np.ndarray], t: int, p: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """봉 t의 세트별 진입 규칙 (ts.entry_rules, 봉 1개 x 세트 K개 -> 길이 K 배열)"""
+    return ts.entry_rules({col: v[t] for col, v in values.items()}, p)
+
+
+def run_batch(df: pd.DataFrame, param_sets: List[Dict[str, float]], verbose: bool = True) -> pd.DataFrame:
+    """
+    K개 세트 동시 백테스트
+    df: load_data() 결과 (지표가 없으면 피처 저장소에서 가져옴)
+    Returns: 세트별 한 행 (파라미터 + _generate_results의 주요 지표)
+    """
+    log = print if verbose else bt._silent
+    df = with_indicators(df)
+    df = df.dropna(subset=REQUIRED_COLS).reset_index()
+    T, K = len(df), len(param_sets)
+    p = param_matrix(param_sets)
+    log(f"[배치 백테스트] {K:,}개 세트 x {T:,}개 봉")
+
+    opens, highs, lows, closes = (df[c].to_numpy(dtype=np.float64) for c in ('open', 'high', 'low', 'close'))
+    atr = df['atr'].to_numpy(dtype=np.float64)
+    times = df['timestamp'].to_numpy().astype('datetime64[ns]').view(np.int64)
+    values = _rule_values(df)
+    # 파라미터와 무관한 진입 필요조건 (EMA 교차): 없는 봉은 entry_rules를 부르지 않음
+    with np.errstate(invalid='ignore'):
+        fast, slow = values['ema_fast'], values['ema_slow']
+        prev_fast, prev_slow = values['prev_ema_fast'], values['prev_ema_slow']
+        has_candidate = ((prev_fast <= prev_slow) & (fast > slow)) | ((prev_fast >= prev_slow) & (fast < slow))
+
+    # 세트별 상태 (side: +1 롱 / -1 숏 / 0 없음)
+    side = np.zeros(K, dtype=np.int8)
+    entry_price = np.zeros(K)
+    quantity = np.zeros(K)
+    remaining = np.zeros(K)
+    stop_loss = np.zeros(K)
+    take_profit = np.zeros(K)
+    partial_tp = np.zeros(K)
+    partial_taken = np.zeros(K, dtype=bool)
+    capital_used = np.zeros(K)
+    entry_time = np.zeros(K, dtype=np.int64)
+    trend_at_entry = np.zeros(K, dtype=np.int8)
+    capital = np.full(K, bt.INITIAL_CAPITAL)
+    funding_total = np.zeros(K)
+    peak = np.full(K, -np.inf)
+    max_dd = np.zeros(K)
+    trade_log = {'k': [], 'net_pnl': [], 'reason': [], 'trend': []}
+
+    started = time.perf_counter()
+    visited = 0
+    for t in range(1, T):
+        is_open = side != 0
+        any_open = is_open.any()
+        # 아무 세트도 할 일이 없는 봉: 모든 세트의 자산 = 자본 (최고점/낙폭 변화 없음)
+        if not any_open and not has_candidate[t-1] and t > 1:
+            continue
+        visited += 1
+
+        # 1) 진입: 직전 봉 신호 (세트별 임계값), 현재 봉 시가 체결
+        if has_candidate[t-1]:
+            signal = _bar_rules(values, t-1, p)
+            direction = np.where(~is_open & signal['long'], 1, np.where(~is_open & signal['short'], -1, 0))
+            enter = direction != 0
+            if enter.any():
+                # 포지션 크기는 현재 봉의 추세 강도 (enter_position과 동일)
+                now = _bar_rules(values, t, p)
+                trend_now, ratio = now['trend'], now['capital_ratio']
+                available = capital * ratio
+                qty = available * bt.LEVERAGE / opens[t]
+                enter &= (ratio > 0) & (qty > 0) & np.isfinite(atr[t]) & (atr[t] > 0)
+                if enter.any():
+                    is_long = direction == 1
+                    fill = np.where(is_long, opens[t] * (1 + bt.SLIPPAGE_RATE), opens[t] * (1 - bt.SLIPPAGE_RATE))
+                    fee = fill * qty * bt.FEE_RATE
+                    side[enter] = direction[enter]
+                    entry_price[enter] = fill[enter]
+                    quantity[enter] = qty[enter]
+                    remaining[enter] = qty[enter]
+                    stop_loss[enter] = np.where(is_long, fill - atr[t] * p['STOP_LOSS_ATR_MULT'],
+                                                fill + atr[t] * p['STOP_LOSS_ATR_MULT'])[enter]
+                    take_profit[enter] = np.where(is_long, fill + atr[t] * p['TAKE_PROFIT_ATR_MULT'],
+                                                  fill - atr[t] * p['TAKE_PROFIT_ATR_MULT'])[enter]
+                    partial_tp[enter] = np.where(is_long, fill + atr[t] * p['PARTIAL_TAKE_PROFIT_ATR_MULT'],
+                                                 fill - atr[t] * p['PARTIAL_TAKE_PROFIT_ATR_MULT'])[enter]
+                    partial_taken[enter] = False
+                    capital_used[enter] = available[enter]
+                    entry_time[enter] = times[t]
+                    trend_at_entry[enter] = trend_now[enter]
+                    capital[enter] -= fee[enter]
+
+        # 2) 청산: 봉 시작 시점에 열려 있던 포지션 (손절 > 부분 익절 > 익절)
+        if any_open:
+            is_long = side == 1
+            stop_hit = is_open & np.where(is_long, lows[t] <= stop_loss, highs[t] >= stop_loss)
+            partial_hit = is_open & ~stop_hit & ~partial_taken & np.where(is_long, highs[t] >= partial_tp,
+                                                                          lows[t] <= partial_tp)
+            tp_hit = is_open & ~stop_hit & ~partial_hit & np.where(is_long, highs[t] >= take_profit,
+                                                                   lows[t] <= take_profit)
+            exiting = stop_hit | partial_hit | tp_hit
+            if exiting.any():
+                k = np.flatnonzero(exiting)
+                partial = partial_hit[k]
+                long_k = is_long[k]
+                exit_price = np.where(stop_hit[k], stop_loss[k], np.where(partial, partial_tp[k], take_profit[k]))
+                # 청산 슬리피지: apply_slippage(price, "sell"/"buy")는 롱/숏 모두 (1 - SLIPPAGE_RATE)
+                fill = exit_price * (1 - bt.SLIPPAGE_RATE)
+                exit_qty = np.where(partial, quantity[k] * p['PARTIAL_TAKE_PROFIT_RATIO'][k], remaining[k])
+                used = np.where(partial, capital_used[k] * p['PARTIAL_TAKE_PROFIT_RATIO'][k], capital_used[k])
+                gross = np.where(long_k, (fill - entry_price[k]) * exit_qty, (entry_price[k] - fill) * exit_qty)
+                exit_fee = fill * exit_qty * bt.FEE_RATE
+                holding_hours = ((times[t] - entry_time[k]) / 1e9) / 3600
+                funding = used * bt.FUNDING_RATE * np.floor(holding_hours / 8)
+                funding = np.where(long_k, funding, -funding)
+                net = gross - exit_fee - funding
+                capital[k] += net
+                funding_total[k] += funding
+
+                remaining[k] = np.where(partial, quantity[k] - exit_qty, remaining[k])
+                partial_taken[k[partial]] = True
+                side[k[~partial]] = 0
+
+                trade_log['k'].append(k)
+                trade_log['net_pnl'].append(net)
+                trade_log['reason'].append(np.where(stop_hit[k], REASON_STOP,
+                                                    np.where(partial, REASON_PARTIAL, REASON_TP)))
+                trade_log['trend'].append(trend_at_entry[k])
+
+        # 3) 자산 평가 -> 최고점/최대 낙폭 누적
+        open_now = side != 0
+        if open_now.any():
+            unrealized = np.where(side == 1, closes[t] - entry_price, entry_price - closes[t]) * remaining
+            equity = np.where(open_now, capital + unrealized, capital)
+        else:
+            equity = capital
+        peak = np.maximum(peak, equity)
+        max_dd = np.maximum(max_dd, (peak - equity) / peak)
+
+    log(f"[배치 백테스트] 완료 ({time.perf_counter() - started:.2f}초, 방문 봉 {visited:,}/{max(T - 1, 0):,})")
+    return _summarize(param_sets, p, trade_log, capital, funding_total, max_dd)
+
+
+def _summarize(param_sets, p, trade_log, capital, funding_total, max_dd) -> pd.DataFrame:
+    """세트별 거래 기록 -> 결과 지표 (bincount, _generate_results와 같은 정의)"""
+    K = len(param_sets)
+    if trade_log['k']:
+        k = np.concatenate(trade_log['k'])
+        net = np.concatenate(trade_log['net_pnl'])
+        reason = np.concatenate(trade_log['reason'])
+        trend = np.concatenate(trade_log['trend'])
+    else:
+        k = np.zeros(0, dtype=np.int64)
+        net = reason = trend = np.zeros(0)
+
+    def count(mask):
+        return np.bincount(k[mask], minlength=K)
+
+    def total(mask):
+        return np.bincount(k[mask], weights=net[mask], minlength=K)
+
+    win = net > 0
+    trades = count(np.ones(len(k), dtype=bool))
+    wins, losses = count(win), count(~win)
+    win_sum, loss_sum = total(win), total(~win)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        avg_win = np.where(wins > 0, win_sum / wins, 0.0)
+        avg_loss = np.where(losses > 0, loss_sum / losses, 0.0)
+        profit_factor = np.where((losses > 0) & (loss_sum < 0), np.abs(win_sum / loss_sum), 0.0)
+        win_rate = np.where(trades > 0, wins / trades * 100, 0.0)
+    total_return = capital - bt.INITIAL_CAPITAL
+    traded = trades > 0
+
+    out = pd.DataFrame({
+        'total_trades': trades,
+        'winning_trades': wins,
+        'losing_trades': losses,
+        'win_rate': win_rate,
+        'final_capital': capital,
+        'total_return': np.where(traded, total_return, 0.0),
+        'total_return_pct': np.where(traded, total_return / bt.INITIAL_CAPITAL * 100, 0.0),
+        'max_drawdown': max_dd * 100,
+        'profit_factor': profit_factor,
+        'avg_win': avg_win,
+        'avg_loss': avg_loss,
+        'stop_loss_trades': count(reason == REASON_STOP),
+        'take_profit_trades': count(reason == REASON_TP),
+        'strong_trend_trades': count(trend == TREND_STRONG),
+        'strong_trend_pnl': total(trend == TREND_STRONG),
+        'weak_trend_trades': count(trend == TREND_WEAK),
+        'weak_trend_pnl': total(trend == TREND_WEAK),
+        'total_funding_cost': funding_total,
+    })
+    out.insert(0, 'params', [json.dumps(params, sort_keys=True) for params in param_sets])
+    out['score'] = [score(row) for row in out.to_dict('records')]
+    return out
+
+
+def verify(df: pd.DataFrame, param_sets: List[Dict[str, float]], batch: pd.DataFrame) -> List[str]:
+    """배치 결과를 기존 엔진(세트별 run_backtest)과 비교. Returns: 차이 목록"""
+    defaults = bt.get_strategy_params()
+    problems = []
+    try:
+        for i, params in enumerate(param_sets):
+            bt.set_strategy_params({**defaults, **params})
+            results = bt.BinanceETHFuturesBacktest().run_backtest(df, verbose=False)
+            for key in ('total_trades', 'final_capital', 'max_drawdown', 'total_funding_cost'):
+                if results[key] != batch[key].iat[i]:
+                    problems.append(f"세트 {i} {key}: 기존 {results[key]} / 배치 {batch[key].iat[i]}")
+            for key in ('win_rate', 'profit_factor', 'avg_win', 'avg_loss', 'strong_trend_pnl', 'weak_trend_pnl'):
+                if not np.isclose(results[key], batch[key].iat[i], rtol=1e-9, atol=1e-12):
+                    problems.append(f"세트 {i} {key}: 기존 {results[key]} / 배치 {batch[key].iat[i]}")
+    finally:
+        bt.set_strategy_params(defaults)
+    return problems
+
+
+def main():
+    args = sys.argv[1:]
+    size, n_verify = BATCH_SIZE, 0
+    for arg in args:
+        if arg.startswith('--size='):
+            size = int(arg.split('=', 1)[1])
+        elif arg.startswith('--verify='):
+            n_verify = int(arg.split('=', 1)[1])
+    positional = [a for a in args if not a.startswith('--')]
+    months = int(positional[0]) if positional else bt.TEST_MONTHS
+
+    csv_path = Path(__file__).parent / bt.CSV_FILE
+    df = with_indicators(bt.load_data(str(csv_path), months=months), verbose=True)
+    param_sets = sample_candidates(SEARCH_SPACE, size)
+
+    started = time.perf_counter()
+    batch = run_batch(df, param_sets)
+    elapsed = time.perf_counter() - started
+    print(f"\n{len(param_sets):,}개 세트: {elapsed:.2f}초 (세트당 {elapsed / len(param_sets) * 1000:.2f} ms)")
+
+    top = batch.sort_values('score', ascending=False).head(10)
+    print(top[['score', 'total_trades', 'total_return_pct', 'max_drawdown', 'win_rate', 'params']].to_string())
+
+    if n_verify:
+        rng = np.random.default_rng(0)
+        picks = sorted(rng.choice(len(param_sets), size=min(n_verify, len(param_sets)), replace=False))
+        problems = verify(df, [param_sets[i] for i in picks], batch.iloc[picks].reset_index(drop=True))
+        print(f"\n[검증] {len(picks)}개 세트: " + ("일치" if not problems else f"{len(problems)}건 불일치"))
+        for problem in problems[:20]:
+            print(f"  {problem}")
+
+    output_dir = Path(__file__).parent / bt.OUTPUT_DIR / f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_batch"
+    output_dir.mkdir(parents=True, exist_ok=True)
+    batch.to_csv(output_dir / 'batch_results.csv', index=False, encoding='utf-8-sig')
+    print(f"  [저장] 세트별 결과: batch_results.csv ({len(batch)}개)")
+
+
+if __name__ == "__main__":
+    main()
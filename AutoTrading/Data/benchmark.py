@@ -0,0 +1,225 @@
+"""
+백테스터 성능 벤치마크 (실제 CSV 불필요, 오프라인 실행)
+
+- 고정 시드 합성 1분봉 생성: 기하 브라운 운동(GBM) + 구간별 추세 + 거래량 급증
+- 단계별 시간 측정: load_data, calculate_indicators, run_backtest, save_results
+- 단계별 최대 메모리 측정 (tracemalloc, 시간 측정과 별도 실행이라 시간에 영향 없음)
+- 기준값(benchmark_baseline.json)과 비교해서 REGRESSION_THRESHOLD 이상 느려지면 종료 코드 1
+- 결과 지문(거래 수/최종 자본)도 기준값과 비교 (같은 데이터에서 결과가 바뀌면 경고)
+- 벡터 진입 신호(generate_signals)와 행 단위 경로가 다른 봉이 있으면 회귀로 보고
+
+사용법:
+    python benchmark.py                  # 기본 크기 (1m 3m 1y)
+    python benchmark.py 1m 3y 5y         # 크기 선택 (1m, 3m, 1y, 3y, 5y)
+    python benchmark.py --save-baseline  # 이번 결과를 기준값으로 저장
+    python benchmark.py --threshold=0.5  # 회귀 임계값 변경 (공유 머신 등 측정 잡음이 클 때)
+"""
+
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+import binance_eth_futures_backtest as bt
+
+# ================================
+# 설정
+# ================================
+SIZES = {'1m': 1, '3m': 3, '1y': 12, '3y': 36, '5y': 60}  # 이름 -> 개월 수 (30일 기준)
+DEFAULT_SIZES = ('1m', '3m', '1y')
+SEED = 7
+START_PRICE = 1200.0
+MINUTE_VOL = 0.0012          # 1분 수익률 표준편차
+REGIME_MINUTES = 2000        # 추세(드리프트)가 유지되는 구간 길이
+REGIME_DRIFT_VOL = 0.00004   # 구간별 드리프트 표준편차
+BURST_MINUTES = 45           # 거래량 급증 구간 길이
+BURST_PROB = 0.05            # 구간별 거래량 급증 확률
+BURST_MULT = 3.0             # 거래량 급증 배수
+REPEATS = 3                  # 시간 측정 반복 횟수 (최솟값 사용)
+REGRESSION_THRESHOLD = 0.20  # 기준값 대비 20% 이상 느려지면 회귀
+REGRESSION_MIN_SECONDS = 0.05  # 이보다 작은 차이는 측정 잡음으로 보고 무시
+BASELINE_FILE = Path(__file__).parent / 'benchmark_baseline.json'
+PHASES = ('load_data', 'calculate_indicators', 'run_backtest', 'save_results')
+
+
+def generate_minutes(months: int, seed: int = SEED) -> pd.DataFrame:
+    """합성 1분봉 (같은 months/seed면 항상 같은 데이터)"""
+    n = months * 30 * 24 * 60
+    rng = np.random.default_rng(seed)
+
+    returns = rng.normal(0.0, MINUTE_VOL, n)
+    returns += np.repeat(rng.normal(0.0, REGIME_DRIFT_VOL, n // REGIME_MINUTES + 1), REGIME_MINUTES)[:n]
+    close = START_PRICE * np.exp(np.cumsum(returns))
+    open_ = np.concatenate(([START_PRICE], close[:-1]))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0.0, 0.0005, n)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0.0, 0.0005, n)))
+    bursts = np.repeat(rng.random(n // BURST_MINUTES + 1) < BURST_PROB, BURST_MINUTES)[:n]
+    volume = rng.lognormal(3.0, 0.8, n) * np.where(bursts, BURST_MULT, 1.0)
+
+    return pd.DataFrame({
+        'timestamp': pd.date_range('2021-01-01', periods=n, freq='1min'),
+        'open': open_, 'high': high, 'low': low, 'close': close, 'volume': volume,
+    })
+
+
+@contextmanager
+def _phase(name: str, timings: Dict[str, float], peaks: Dict[str, float]):
+    if tracemalloc.is_tracing():
+        tracemalloc.reset_peak()
+    started = time.perf_counter()
+    yield
+    timings[name] = time.perf_counter() - started
+    if tracemalloc.is_tracing():
+        peaks[name] = tracemalloc.get_traced_memory()[1] / 1e6
+
+
+def run_phases(csv_path: Path, work_dir: Path):
+    """단계 1회 실행. Returns: (단계별 초, 단계별 최대 MB, 결과 지문)"""
+    timings, peaks = {}, {}
+    with _phase('load_data', timings, peaks):
+        df = bt.load_data(str(csv_path))
+    backtest = bt.BinanceETHFuturesBacktest()
+    with _phase('calculate_indicators', timings, peaks):
+        df = backtest.calculate_indicators(df)
+    with _phase('run_backtest', timings, peaks):
+        results = backtest.run_backtest(df, verbose=False)
+    with _phase('save_results', timings, peaks):
+        backtest.save_results(work_dir / 'results' / 'run', results)
+
+    fingerprint = {
+        'bars': len(df),
+        'total_trades': int(results['total_trades']),
+        'final_capital': round(float(results['final_capital']), 8),
+    }
+    return timings, peaks, fingerprint
+
+
+def _quiet(func, *args):
+    """단계 내부 출력 숨김 (load_data/save_results 진행 출력)"""
+    stdout = sys.stdout
+    with open(os.devnull, 'w') as devnull:
+        sys.stdout = devnull
+        try:
+            return func(*args)
+        finally:
+            sys.stdout = stdout
+
+
+def benchmark_size(name: str, work_dir: Path) -> Dict:
+    """한 크기 벤치마크: 시간은 REPEATS회 중 최솟값, 메모리는 tracemalloc 켠 별도 1회"""
+    csv_path = work_dir / f'synthetic_{name}.csv'
+    if not csv_path.exists():
+        generate_minutes(SIZES[name]).to_csv(csv_path, index=False)
+
+    best = {}
+    for _ in range(REPEATS):
+        timings, _, fingerprint = _quiet(run_phases, csv_path, work_dir)
+        for phase, seconds in timings.items():
+            best[phase] = min(best.get(phase, float('inf')), seconds)
+
+    tracemalloc.start()
+    try:
+        _, peaks, _ = _quiet(run_phases, csv_path, work_dir)
+    finally:
+        tracemalloc.stop()
+
+    # 벡터 신호 동등성 (행 단위 경로는 느리므로 시간 측정과 별도로 1회)
+    backtest = bt.BinanceETHFuturesBacktest()
+    df = backtest.calculate_indicators(_quiet(bt.load_data, str(csv_path)))
+    mismatches = backtest.signal_mismatches(df)
+
+    return {
+        'minutes': SIZES[name] * 30 * 24 * 60,
+        'seconds': best,
+        'peak_mb': peaks,
+        'fingerprint': fingerprint,
+        'signal_mismatches': mismatches,
+    }
+
+
+def environment() -> Dict:
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold: float = REGRESSION_THRESHOLD) -> List[str]:
+    """기준값 대비 회귀 목록 (시간 회귀 + 결과 지문 변경 + 신호 동등성)"""
+    problems = []
+    for name, result in current['sizes'].items():
+        if result.get('signal_mismatches'):
+            problems.append(f"{name}: 벡터 진입 신호가 행 단위 경로와 {result['signal_mismatches']}개 봉에서 다름")
+        base = baseline.get('sizes', {}).get(name)
+        if base is None:
+            continue
+        for phase, seconds in result['seconds'].items():
+            base_seconds = base['seconds'].get(phase)
+            if base_seconds and seconds > base_seconds * (1 + threshold) \
+                    and seconds - base_seconds > REGRESSION_MIN_SECONDS:
+                problems.append(f"{name}/{phase}: {base_seconds:.3f}s -> {seconds:.3f}s "
+                                f"(+{(seconds / base_seconds - 1) * 100:.0f}%)")
+        if result['fingerprint'] != base.get('fingerprint'):
+            problems.append(f"{name}: 결과 지문 변경 {base.get('fingerprint')} -> {result['fingerprint']}")
+    return problems
+
+
+def main():
+    args = sys.argv[1:]
+    save_baseline = '--save-baseline' in args
+    threshold = REGRESSION_THRESHOLD
+    for arg in args:
+        if arg.startswith('--threshold='):
+            threshold = float(arg.split('=', 1)[1])
+    sizes = [a for a in args if not a.startswith('--')] or list(DEFAULT_SIZES)
+    unknown = [s for s in sizes if s not in SIZES]
+    if unknown:
+        print(f"알 수 없는 크기: {unknown} (가능: {', '.join(SIZES)})")
+        sys.exit(1)
+
+    current = {'environment': environment(), 'sizes': {}}
+    with tempfile.TemporaryDirectory(prefix='backtest_bench_') as tmp:
+        for name in sizes:
+            print(f"[벤치마크] {name} ({SIZES[name]}개월 합성 1분봉) 실행 중...")
+            result = benchmark_size(name, Path(tmp))
+            current['sizes'][name] = result
+            for phase in PHASES:
+                print(f"  {phase:<22} {result['seconds'][phase]:>9.3f}s  최대 {result['peak_mb'][phase]:>8.1f} MB")
+            print(f"  거래 {result['fingerprint']['total_trades']}건, "
+                  f"최종 자본 {result['fingerprint']['final_capital']:.2f} USDT, "
+                  f"신호 불일치 {result['signal_mismatches']}봉")
+
+    if save_baseline:
+        baseline = json.loads(BASELINE_FILE.read_text()) if BASELINE_FILE.exists() else {'sizes': {}}
+        baseline['environment'] = current['environment']
+        baseline['sizes'].update(current['sizes'])
+        BASELINE_FILE.write_text(json.dumps(baseline, indent=2))
+        print(f"\n[기준값 저장] {BASELINE_FILE.name}")
+        return
+
+    if not BASELINE_FILE.exists():
+        print(f"\n기준값 없음: --save-baseline으로 {BASELINE_FILE.name}을 먼저 만드세요")
+        return
+    problems = compare(current, json.loads(BASELINE_FILE.read_text()), threshold)
+    if problems:
+        print(f"\n[회귀 감지] (임계값 {threshold * 100:.0f}%)")
+        for problem in problems:
+            print(f"  {problem}")
+        sys.exit(1)
+    print("\n[통과] 기준값 대비 회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
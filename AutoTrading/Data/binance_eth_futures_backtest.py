@@ -11,6 +11,11 @@
 - 백테스트 오류 방지 (look-ahead bias, 슬리피지, 수수료 등)
 """
 
+import copy
+import os
+import pickle
+import sys
+import time
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
@@ -18,6 +23,23 @@ from pathlib import Path
 from typing import Optional, Tuple, Dict, List
 import warnings
 
+# 백테스트와 실전 봇 공용 모듈 (AutoTrading/performance_metrics.py, trading_strategy.py)
+AUTOTRADING_DIR = Path(__file__).resolve().parent.parent
+if str(AUTOTRADING_DIR) not in sys.path:
+    sys.path.append(str(AUTOTRADING_DIR))
+from performance_metrics import PerformanceMetrics, bars_per_year
+import trading_strategy as ts
+
+from agg_trades import AggTradeExecutor, AggTradeStore
+from data_pipeline import OHLCV_COLUMNS, last_timestamp, resample_stream, stream_minutes
+from intrabar import IntrabarExitResolver
+import equity
+from ledger import EVENT_FIELDS, TRADE_FIELDS, Ledger
+from profiling import NULL_PROFILER, Profiler
+import run_catalog
+from run_cache import RunCache
+import run_store
+
 warnings.filterwarnings('ignore')
 
 # ================================
@@ -59,13 +81,183 @@ PARTIAL_TAKE_PROFIT_RATIO = 0.5     # 부분 익절 비율 (50%)
 # 데이터 설정
 TEST_MONTHS = 0  # 0이면 전체 데이터 사용 (3년)
 CSV_FILE = "ETH_USDT_1m_3Y.csv"
+RESAMPLE_TIMEFRAME = '15min'
+USE_INTRABAR_EXITS = True  # 한 봉에서 손절/익절이 모두 닿으면 1분봉으로 실제 체결 순서 확인
+AGG_TRADES_DIR = None  # aggTrades 저장소 디렉터리 (agg_trades.py convert). 지정하면 진입/청산 가격을 실제 체결로 결정
 OUTPUT_DIR = Path("backtest_results")
+PROFILE = False           # True면 단계별 시간/이벤트 수를 실행 폴더에 저장 (profile.json)
+PROFILE_CPROFILE = False  # True면 cProfile 통계도 저장 (profile.prof, 플레임그래프 변환용)
+EXPORT_CSV = False  # True면 save_results에서 CSV도 함께 저장 (기본은 run_store 압축 형식 + summary.txt)
+CHECKPOINT_FORMAT = 2  # 체크포인트 파일 형식 버전 (형식이 바뀌면 이전 체크포인트는 무시하고 전체 재실행)
+USE_FEATURE_STORE = True  # True면 main에서 지표를 feature_store(.feature_store/)에서 재사용 (없는 지표만 계산)
+USE_RUN_CACHE = True  # True면 main/스윕에서 같은 입력의 실행 결과를 run_cache(.run_cache/)에서 재사용
+
+# 최적화/스윕 대상 전략 상수 (지표 기간은 제외: 값이 바뀌어도 지표를 다시 계산할 필요가 없는 것들)
+STRATEGY_PARAM_NAMES = (
+    'ADX_STRONG_THRESHOLD', 'ADX_WEAK_THRESHOLD',
+    'VOLUME_STRONG_MULT', 'VOLUME_MIN_THRESHOLD',
+    'STRONG_TREND_POSITION_RATIO', 'WEAK_TREND_POSITION_RATIO', 'MAX_POSITION_RATIO',
+    'RSI_LONG_MIN', 'RSI_SHORT_MAX',
+    'STOP_LOSS_ATR_MULT', 'TAKE_PROFIT_ATR_MULT',
+    'PARTIAL_TAKE_PROFIT_ATR_MULT', 'PARTIAL_TAKE_PROFIT_RATIO',
+)
+
+# 결과에 영향을 주는 엔진 설정 상수 (전략 상수와 함께 저장 키에 포함)
+CONFIG_PARAM_NAMES = (
+    'INITIAL_CAPITAL', 'LEVERAGE', 'FEE_RATE', 'SLIPPAGE_RATE', 'FUNDING_RATE',
+    'ADX_PERIOD', 'VOLUME_MA_PERIOD', 'EMA_FAST', 'EMA_SLOW', 'RSI_PERIOD', 'ATR_PERIOD',
+    'RESAMPLE_TIMEFRAME',
+)
+
+# 백테스트 결과에 영향을 주는 소스 파일 (코드 버전 해시용)
+SOURCE_FILES = (Path(__file__).resolve(), Path(__file__).resolve().parent / 'intrabar.py',
+                Path(__file__).resolve().parent / 'equity.py', Path(__file__).resolve().parent / 'agg_trades.py',
+                AUTOTRADING_DIR / 'performance_metrics.py', AUTOTRADING_DIR / 'trading_strategy.py')
+
+# calculate_indicators가 만드는 컬럼 (모두 있으면 run_backtest에서 재계산 생략)
+INDICATOR_COLUMNS = (
+    'ema_fast', 'ema_slow', 'rsi', 'atr', 'adx', 'plus_di', 'minus_di',
+    'volume_ma', 'volume_ratio',
+)
+
+
+# 지표 그룹: 그룹 -> (기간 상수, 만드는 컬럼). 값은 봉 데이터와 기간에만 의존 (feature_store 저장 단위)
+INDICATOR_GROUPS = {
+    'ema_fast': ('EMA_FAST', ('ema_fast',)),
+    'ema_slow': ('EMA_SLOW', ('ema_slow',)),
+    'rsi': ('RSI_PERIOD', ('rsi',)),
+    'atr': ('ATR_PERIOD', ('atr',)),
+    'adx': ('ADX_PERIOD', ('adx', 'plus_di', 'minus_di')),
+    'volume': ('VOLUME_MA_PERIOD', ('volume_ma', 'volume_ratio')),
+}
+
+# 추세 강도 코드 (generate_signals의 trend 컬럼)
+TREND_NONE, TREND_WEAK, TREND_STRONG = ts.TREND_NONE, ts.TREND_WEAK, ts.TREND_STRONG
+TREND_NAMES = ts.TREND_NAMES
+
+
+def get_strategy_params() -> Dict[str, float]:
+    """현재 전략 상수 값 조회"""
+    return {name: globals()[name] for name in STRATEGY_PARAM_NAMES}
+
+
+def get_run_config() -> Dict:
+    """저장 키/카탈로그용 전체 설정 (엔진 설정 + 전략 상수)"""
+    config = {name: globals()[name] for name in CONFIG_PARAM_NAMES}
+    config.update(get_strategy_params())
+    return config
+
+
+def set_strategy_params(params: Dict[str, float]):
+    """
+    전략 상수 덮어쓰기 (워커 프로세스별로 파라미터 세트를 바꿔가며 실행할 때 사용)
+    모듈 전역값을 바꾸므로 한 프로세스 안에서는 동시에 여러 세트를 돌릴 수 없음
+    """
+    for name, value in params.items():
+        if name not in STRATEGY_PARAM_NAMES:
+            raise KeyError(f"알 수 없는 전략 파라미터: {name}")
+        globals()[name] = value
+
+
+def indicator_periods() -> Dict[str, int]:
+    """지표 그룹별 현재 기간"""
+    return {group: globals()[const] for group, (const, _) in INDICATOR_GROUPS.items()}
+
+
+def compute_indicator_group(df: pd.DataFrame, group: str, period: int) -> Dict[str, pd.Series]:
+    """지표 그룹 하나 계산 -> {컬럼: 값} (calculate_indicators와 feature_store 공용)"""
+    if group in ('ema_fast', 'ema_slow'):
+        return {group: df['close'].ewm(span=period, adjust=False).mean()}
+    
+    if group == 'rsi':
+        delta = df['close'].diff()
+        gain = delta.where(delta > 0, 0).rolling(window=period).mean()
+        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+        rs = gain / loss
+        return {'rsi': 100 - (100 / (1 + rs))}
+    
+    if group == 'atr':
+        high_low = df['high'] - df['low']
+        high_close = np.abs(df['high'] - df['close'].shift(1))
+        low_close = np.abs(df['low'] - df['close'].shift(1))
+        tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
+        return {'atr': tr.rolling(window=period).mean()}
+    
+    if group == 'adx':
+        return _adx_columns(df, period)
+    
+    if group == 'volume':
+        volume_ma = df['volume'].rolling(window=period).mean()
+        return {'volume_ma': volume_ma, 'volume_ratio': df['volume'] / volume_ma}
+    
+    raise KeyError(f"알 수 없는 지표 그룹: {group}")
+
+
+def _adx_columns(df: pd.DataFrame, period: int) -> Dict[str, pd.Series]:
+    """ADX 계산 (Average Directional Index)"""
+    # True Range
+    high_low = df['high'] - df['low']
+    high_close = np.abs(df['high'] - df['close'].shift(1))
+    low_close = np.abs(df['low'] - df['close'].shift(1))
+    ranges = pd.concat([high_low, high_close, low_close], axis=1)
+    tr = np.max(ranges, axis=1)
+    
+    # +DM, -DM 계산
+    up_move = df['high'] - df['high'].shift(1)
+    down_move = df['low'].shift(1) - df['low']
+    
+    plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0)
+    minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0)
+    
+    # Wilder's smoothing
+    atr_smooth = tr.rolling(window=period).mean()
+    plus_dm_series = pd.Series(plus_dm, index=df.index)
+    minus_dm_series = pd.Series(minus_dm, index=df.index)
+    plus_dm_smooth = plus_dm_series.rolling(window=period).mean()
+    minus_dm_smooth = minus_dm_series.rolling(window=period).mean()
+    
+    # +DI, -DI 계산 (0 나누기 방지)
+    plus_di = np.where(atr_smooth.values > 0, 100 * (plus_dm_smooth.values / atr_smooth.values), 0)
+    minus_di = np.where(atr_smooth.values > 0, 100 * (minus_dm_smooth.values / atr_smooth.values), 0)
+    plus_di = pd.Series(plus_di, index=df.index)
+    minus_di = pd.Series(minus_di, index=df.index)
+    
+    # DX 및 ADX (0 나누기 방지)
+    di_sum = plus_di + minus_di
+    dx = np.where(di_sum.values > 0, 100 * np.abs(plus_di.values - minus_di.values) / di_sum.values, 0)
+    adx = pd.Series(dx, index=df.index).rolling(window=period).mean()
+    
+    return {'adx': adx, 'plus_di': plus_di, 'minus_di': minus_di}
+
+
+def entry_signals(df: pd.DataFrame, params: Dict[str, float]) -> pd.DataFrame:
+    """
+    진입 신호 벡터 계산 (BinanceETHFuturesBacktest.generate_signals, strategy_api.EmaAdxStrategy 공용)
+    규칙은 실전 봇/섀도 변형과 같은 trading_strategy.entry_rules, 임계값만 params
+    params: 전략 상수 (get_strategy_params()와 같은 키)
+    """
+    values = {col: df[col].to_numpy(dtype=np.float64) for col in ts.RULE_COLUMNS}
+    values['prev_ema_fast'] = df['ema_fast'].shift(1).to_numpy(dtype=np.float64)
+    values['prev_ema_slow'] = df['ema_slow'].shift(1).to_numpy(dtype=np.float64)
+    rules = ts.entry_rules(values, params)
+    return pd.DataFrame({'long': rules['long'], 'short': rules['short'], 'trend': rules['trend'],
+                         'volume_ratio': values['volume_ratio'], 'capital_ratio': rules['capital_ratio']},
+                        index=df.index)
+
+
+def _silent(*args, **kwargs):
+    pass
 
 
 # ================================
 # 포지션 정보 클래스
 # ================================
 class Position:
+    # 인스턴스 __dict__ 없이 고정 슬롯만 사용 (포지션마다 메모리/속성 접근 비용 감소)
+    __slots__ = ('side', 'entry_price', 'entry_time', 'quantity', 'remaining_quantity',
+                 'stop_loss', 'take_profit', 'partial_take_profit', 'partial_taken',
+                 'trend_strength', 'volume_ratio', 'capital_used')
+    
     def __init__(self, side: str, entry_price: float, entry_time: pd.Timestamp,
                  quantity: float, stop_loss: float, take_profit: float,
                  trend_strength: str, volume_ratio: float, capital_used: float,
@@ -88,84 +280,49 @@ class Position:
 # 백테스트 클래스
 # ================================
 class BinanceETHFuturesBacktest:
-    def __init__(self):
+    # 장부 필드 (하위 클래스에서 필드 추가 가능, 예: 포트폴리오의 symbol)
+    trade_fields = TRADE_FIELDS
+    event_fields = EVENT_FIELDS
+    # 지표 컬럼 (모두 있으면 지표 계산 생략)과 유효 봉 판정 컬럼 (ADX는 선택적). 전략 플러그인은 strategy_api에서 바꿈
+    indicator_columns = INDICATOR_COLUMNS
+    required_columns = ('ema_fast', 'ema_slow', 'rsi', 'atr', 'volume_ratio')
+    
+    def __init__(self, exit_resolver=None, profiler=None, spill_dir: Optional[Path] = None,
+                 cache: Optional[RunCache] = None):
+        """
+        Args:
+            exit_resolver: 봉 내부 체결 순서 판별기 (intrabar.IntrabarExitResolver). None이면 손절 우선 가정
+                           agg_trades.AggTradeExecutor면 진입/청산 가격도 실제 체결에서 결정 (fills_from_trades)
+            profiler: profiling.Profiler (None이면 프로파일링 안 함)
+            spill_dir: 지정하면 거래/이벤트 장부를 일정 행마다 이 폴더로 내보냄 (메모리 상한)
+            cache: run_cache.RunCache (같은 입력이면 시뮬레이션 없이 저장된 결과 반환, spill_dir와 함께 쓰면 무시)
+        """
+        self.exit_resolver = exit_resolver
+        self.profiler = profiler or NULL_PROFILER
+        self.cache = cache if spill_dir is None else None
         self.capital = INITIAL_CAPITAL
         self.position: Optional[Position] = None
-        self.trades: List[Dict] = []
-        self.equity_curve: List[float] = []
-        self.events: List[Dict] = []
+        self.trades = Ledger(self.trade_fields, spill_dir=spill_dir, name='trades')
+        # 자산/노출 곡선과 봉 시각: 실행이 끝난 뒤 이벤트 장부로 재구성 (equity.rebuild_equity)
+        self.equity_curve = np.empty(0)
+        self.exposure_curve = np.empty(0)
+        self.bar_times = np.empty(0, dtype='datetime64[ns]')
+        self.events = Ledger(self.event_fields, spill_dir=spill_dir, name='events')
         self.total_funding_cost = 0.0
+        self.run_key: Optional[str] = None  # 입력 해시 (run_store 저장 키)
+        self.run_meta: Dict = {}  # 데이터 구간, 설정, 코드 버전 (run.json/카탈로그 기록용)
+        self._checkpoint: Optional[Dict] = None  # run_backtest(checkpoint=True)가 보관한 상태
+        self._resume_from: Optional[Dict] = None  # from_checkpoint로 복원한 봉 데이터/위치
         
     def calculate_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
-        """기술적 지표 계산"""
+        """기술적 지표 계산 (EMA, RSI, ATR, ADX, 거래량 비율)"""
         df = df.copy()
-        
-        # EMA
-        df['ema_fast'] = df['close'].ewm(span=EMA_FAST, adjust=False).mean()
-        df['ema_slow'] = df['close'].ewm(span=EMA_SLOW, adjust=False).mean()
-        
-        # RSI
-        delta = df['close'].diff()
-        gain = delta.where(delta > 0, 0).rolling(window=RSI_PERIOD).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=RSI_PERIOD).mean()
-        rs = gain / loss
-        df['rsi'] = 100 - (100 / (1 + rs))
-        
-        # ATR
-        high_low = df['high'] - df['low']
-        high_close = np.abs(df['high'] - df['close'].shift(1))
-        low_close = np.abs(df['low'] - df['close'].shift(1))
-        tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-        df['atr'] = tr.rolling(window=ATR_PERIOD).mean()
-        
-        # ADX 계산
-        df = self._calculate_adx(df)
-        
-        # 거래량 비율
-        df['volume_ma'] = df['volume'].rolling(window=VOLUME_MA_PERIOD).mean()
-        df['volume_ratio'] = df['volume'] / df['volume_ma']
-        
-        return df
-    
-    def _calculate_adx(self, df: pd.DataFrame) -> pd.DataFrame:
-        """ADX 계산 (Average Directional Index)"""
-        # True Range
-        high_low = df['high'] - df['low']
-        high_close = np.abs(df['high'] - df['close'].shift(1))
-        low_close = np.abs(df['low'] - df['close'].shift(1))
-        ranges = pd.concat([high_low, high_close, low_close], axis=1)
-        tr = np.max(ranges, axis=1)
-        
-        # +DM, -DM 계산
-        up_move = df['high'] - df['high'].shift(1)
-        down_move = df['low'].shift(1) - df['low']
-        
-        plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0)
-        minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0)
-        
-        # Wilder's smoothing
-        period = ADX_PERIOD
-        atr_smooth = tr.rolling(window=period).mean()
-        plus_dm_series = pd.Series(plus_dm, index=df.index)
-        minus_dm_series = pd.Series(minus_dm, index=df.index)
-        plus_dm_smooth = plus_dm_series.rolling(window=period).mean()
-        minus_dm_smooth = minus_dm_series.rolling(window=period).mean()
-        
-        # +DI, -DI 계산 (0 나누기 방지)
-        plus_di = np.where(atr_smooth.values > 0, 100 * (plus_dm_smooth.values / atr_smooth.values), 0)
-        minus_di = np.where(atr_smooth.values > 0, 100 * (minus_dm_smooth.values / atr_smooth.values), 0)
-        plus_di = pd.Series(plus_di, index=df.index)
-        minus_di = pd.Series(minus_di, index=df.index)
-        
-        # DX 및 ADX (0 나누기 방지)
-        di_sum = plus_di + minus_di
-        dx = np.where(di_sum.values > 0, 100 * np.abs(plus_di.values - minus_di.values) / di_sum.values, 0)
-        adx = pd.Series(dx, index=df.index).rolling(window=period).mean()
-        
-        df['adx'] = adx
-        df['plus_di'] = plus_di
-        df['minus_di'] = minus_di
-        
+        prof = self.profiler
+        for group, period in indicator_periods().items():
+            # 프로파일 구간 이름은 ema/rsi/atr/adx/volume (EMA 두 개는 한 구간)
+            with prof.span(f"indicators/{group.split('_')[0]}"):
+                for col, values in compute_indicator_group(df, group, period).items():
+                    df[col] = values
         return df
     
     def get_trend_strength(self, row: pd.Series) -> Tuple[str, float]:
@@ -278,6 +435,34 @@ class BinanceETHFuturesBacktest:
         
         return False, ""
     
+    def generate_signals(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        check_entry_signal / get_trend_strength / calculate_position_size 비율을 전체 봉에 대해 벡터로 계산
+        i번째 행은 check_entry_signal(df.iloc[i], df.iloc[i-1])과 같음 (첫 행은 이전 봉이 없어 신호 없음)
+        Returns: long/short(해당 봉 기준 신호), trend(TREND_*), volume_ratio, capital_ratio(자본 대비 사용 비율)
+        """
+        return entry_signals(df, get_strategy_params())
+    
+    def signal_mismatches(self, df: pd.DataFrame) -> int:
+        """
+        generate_signals와 행 단위 경로(check_entry_signal/get_trend_strength/calculate_position_size) 비교
+        df: 지표 계산된 봉. Returns: 결과가 다른 행 수 (0이어야 함)
+        """
+        signals = self.generate_signals(df)
+        mismatches = 0
+        for i in range(len(df)):
+            row = df.iloc[i]
+            should_enter, direction = self.check_entry_signal(row, df.iloc[i-1] if i >= 1 else row)
+            trend_strength, _ = self.get_trend_strength(row)
+            _, capital_used = self.calculate_position_size(1.0, trend_strength)
+            sig = signals.iloc[i]
+            expected = "long" if sig['long'] else ("short" if sig['short'] else "")
+            if (direction if should_enter else "") != expected \
+                    or trend_strength != TREND_NAMES[int(sig['trend'])] \
+                    or capital_used != self.capital * sig['capital_ratio']:
+                mismatches += 1
+        return mismatches
+    
     def apply_slippage(self, price: float, side: str) -> float:
         """슬리피지 적용"""
         if side == "long":
@@ -289,26 +474,23 @@ class BinanceETHFuturesBacktest:
         """수수료 계산"""
         return price * quantity * FEE_RATE
     
-    def enter_position(self, row: pd.Series, direction: str, entry_price: float):
-        """포지션 진입"""
+    def entry_size(self, row: pd.Series, entry_price: float) -> Tuple[str, float, float, float]:
+        """
+        진입 봉의 추세 강도와 포지션 크기
+        Returns: (trend_strength, volume_ratio, quantity, capital_used)
+        """
         trend_strength, volume_ratio = self.get_trend_strength(row)
-        
-        # 포지션 크기 계산
         quantity, capital_used = self.calculate_position_size(entry_price, trend_strength)
-        
-        if quantity <= 0:
-            return
-        
-        # 슬리피지 적용
-        fill_price = self.apply_slippage(entry_price, direction)
-        
-        # 수수료
-        entry_fee = self.calculate_fee(fill_price, quantity)
-        
-        # 손절/익절 가격 계산
+        return trend_strength, volume_ratio, quantity, capital_used
+    
+    def exit_levels(self, row: pd.Series, direction: str, fill_price: float) -> Optional[Tuple[float, float, float]]:
+        """
+        체결가 기준 손절/익절/부분 익절 가격 (ATR 배수)
+        Returns: (stop_loss, take_profit, partial_take_profit) / ATR이 없으면 None (진입 안 함)
+        """
         atr = row.get('atr', np.nan)
         if not np.isfinite(atr) or atr <= 0:
-            return
+            return None
         
         if direction == "long":
             stop_loss = fill_price - (atr * STOP_LOSS_ATR_MULT)
@@ -318,6 +500,35 @@ class BinanceETHFuturesBacktest:
             stop_loss = fill_price + (atr * STOP_LOSS_ATR_MULT)
             take_profit = fill_price - (atr * TAKE_PROFIT_ATR_MULT)
             partial_take_profit = fill_price - (atr * PARTIAL_TAKE_PROFIT_ATR_MULT)
+        return stop_loss, take_profit, partial_take_profit
+    
+    def partial_ratio(self) -> float:
+        """부분 익절 때 청산하는 진입 수량 비율"""
+        return PARTIAL_TAKE_PROFIT_RATIO
+    
+    def enter_position(self, row: pd.Series, direction: str, entry_price: float):
+        """포지션 진입"""
+        # 추세 강도 + 포지션 크기 계산
+        trend_strength, volume_ratio, quantity, capital_used = self.entry_size(row, entry_price)
+        
+        if quantity <= 0:
+            return
+        
+        # 슬리피지 적용 (체결 재생 모드면 봉 시작부터 실제 체결로 주문 수량을 채운 평균가)
+        fill_price = None
+        if self.exit_resolver is not None and self.exit_resolver.fills_from_trades:
+            fill_price = self.exit_resolver.entry_fill(row['timestamp'], direction, quantity)
+        if fill_price is None:
+            fill_price = self.apply_slippage(entry_price, direction)
+        
+        # 수수료
+        entry_fee = self.calculate_fee(fill_price, quantity)
+        
+        # 손절/익절 가격 계산
+        levels = self.exit_levels(row, direction, fill_price)
+        if levels is None:
+            return
+        stop_loss, take_profit, partial_take_profit = levels
         
         # 포지션 생성
         entry_time = pd.Timestamp(row['timestamp']) if 'timestamp' in row else row.name
@@ -337,25 +548,26 @@ class BinanceETHFuturesBacktest:
         # 자본 차감 (수수료만)
         self.capital -= entry_fee
         
-        # 이벤트 로그
-        self.events.append({
-            'timestamp': row.name,
-            'event_type': 'ENTRY',
-            'side': direction,
-            'price': fill_price,
-            'quantity': quantity,
-            'trend_strength': trend_strength,
-            'volume_ratio': volume_ratio,
-            'capital_used': capital_used,
-            'stop_loss': stop_loss,
-            'take_profit': take_profit,
-            'fee': entry_fee,
-            'capital_after': self.capital,
-            'rsi': row.get('rsi', np.nan),
-            'adx': row.get('adx', np.nan),
-            'ema_fast': row.get('ema_fast', np.nan),
-            'ema_slow': row.get('ema_slow', np.nan)
-        })
+        # 이벤트 로그 (bar_index: run_backtest 유효 봉 기준 위치)
+        self.events.append(
+            timestamp=entry_time,
+            bar_index=row.name,
+            event_type='ENTRY',
+            side=direction,
+            price=fill_price,
+            quantity=quantity,
+            trend_strength=trend_strength,
+            volume_ratio=volume_ratio,
+            capital_used=capital_used,
+            stop_loss=stop_loss,
+            take_profit=take_profit,
+            fee=entry_fee,
+            capital_after=self.capital,
+            rsi=row.get('rsi', np.nan),
+            adx=row.get('adx', np.nan),
+            ema_fast=row.get('ema_fast', np.nan),
+            ema_slow=row.get('ema_slow', np.nan)
+        )
     
     def check_exit(self, row: pd.Series) -> Tuple[bool, float, str, bool]:
         """
@@ -372,30 +584,38 @@ class BinanceETHFuturesBacktest:
         if not all(np.isfinite([high, low, close])):
             return False, 0.0, "", False
         
-        # 손절 확인 (우선순위 1)
-        if self.position.side == "long":
-            if low <= self.position.stop_loss:
-                return True, self.position.stop_loss, "STOP_LOSS", False
+        pos = self.position
+        if pos.side == "long":
+            stop_hit = low <= pos.stop_loss
+            partial_hit = high >= pos.partial_take_profit if pos.partial_take_profit is not None else False
+            tp_hit = high >= pos.take_profit
         else:  # short
-            if high >= self.position.stop_loss:
-                return True, self.position.stop_loss, "STOP_LOSS", False
+            stop_hit = high >= pos.stop_loss
+            partial_hit = low <= pos.partial_take_profit if pos.partial_take_profit is not None else False
+            tp_hit = low <= pos.take_profit
+        partial_hit = partial_hit and not pos.partial_taken
+        
+        # 손절과 익절이 한 봉에서 모두 닿은 경우에만 1분봉으로 실제 순서 확인
+        # 체결 재생 모드는 트리거가 하나라도 닿으면 실제 체결 순서/가격 확인
+        resolver = self.exit_resolver
+        if resolver is not None and (stop_hit and (partial_hit or tp_hit)
+                                     or resolver.fills_from_trades and (stop_hit or partial_hit or tp_hit)):
+            resolved = resolver.resolve(row['timestamp'], pos)
+            if resolved is not None:
+                exit_price, exit_reason, is_partial = resolved
+                return True, exit_price, exit_reason, is_partial
+        
+        # 손절 확인 (우선순위 1)
+        if stop_hit:
+            return True, pos.stop_loss, "STOP_LOSS", False
         
         # 부분 익절 확인 (우선순위 2, 아직 부분 익절 안 했으면)
-        if not self.position.partial_taken and self.position.partial_take_profit is not None:
-            if self.position.side == "long":
-                if high >= self.position.partial_take_profit:
-                    return True, self.position.partial_take_profit, "PARTIAL_TAKE_PROFIT", True
-            else:  # short
-                if low <= self.position.partial_take_profit:
-                    return True, self.position.partial_take_profit, "PARTIAL_TAKE_PROFIT", True
+        if partial_hit:
+            return True, pos.partial_take_profit, "PARTIAL_TAKE_PROFIT", True
         
         # 전체 익절 확인 (우선순위 3)
-        if self.position.side == "long":
-            if high >= self.position.take_profit:
-                return True, self.position.take_profit, "TAKE_PROFIT", False
-        else:  # short
-            if low <= self.position.take_profit:
-                return True, self.position.take_profit, "TAKE_PROFIT", False
+        if tp_hit:
+            return True, pos.take_profit, "TAKE_PROFIT", False
         
         return False, 0.0, "", False
     
@@ -412,19 +632,22 @@ class BinanceETHFuturesBacktest:
         pos_volume_ratio = self.position.volume_ratio
         pos_capital_used = self.position.capital_used
         
-        # 슬리피지 적용
-        if pos_side == "long":
+        # 슬리피지 적용 (체결 재생 모드면 exit_price가 이미 실제 체결 가격)
+        if self.exit_resolver is not None and self.exit_resolver.fills_from_trades:
+            fill_price = exit_price
+        elif pos_side == "long":
             fill_price = self.apply_slippage(exit_price, "sell")
         else:
             fill_price = self.apply_slippage(exit_price, "buy")
         
         # 부분 익절 처리
         if is_partial and not self.position.partial_taken:
-            exit_quantity = self.position.quantity * PARTIAL_TAKE_PROFIT_RATIO
+            ratio = self.partial_ratio()
+            exit_quantity = self.position.quantity * ratio
             self.position.remaining_quantity = self.position.quantity - exit_quantity
             self.position.partial_taken = True
             # 부분 익절 시 capital_used도 비례적으로 조정
-            partial_capital_used = pos_capital_used * PARTIAL_TAKE_PROFIT_RATIO
+            partial_capital_used = pos_capital_used * ratio
         else:
             exit_quantity = self.position.remaining_quantity if hasattr(self.position, 'remaining_quantity') else self.position.quantity
             partial_capital_used = pos_capital_used
@@ -453,228 +676,372 @@ class BinanceETHFuturesBacktest:
         self.total_funding_cost += funding_cost
         
         # 거래 로그
-        trade = {
-            'entry_time': pos_entry_time,
-            'exit_time': row.name,
-            'side': pos_side,
-            'entry_price': pos_entry,
-            'exit_price': fill_price,
-            'quantity': exit_quantity,
-            'gross_pnl': gross_pnl,
-            'entry_fee': partial_capital_used * FEE_RATE,
-            'exit_fee': exit_fee,
-            'funding_cost': funding_cost,
-            'net_pnl': net_pnl,
-            'return_pct': (net_pnl / partial_capital_used) * 100 if partial_capital_used > 0 else 0,
-            'trend_strength': pos_trend_strength,
-            'volume_ratio_entry': pos_volume_ratio,
-            'exit_reason': exit_reason,
-            'holding_hours': holding_hours,
-            'capital_before': self.capital - net_pnl,
-            'capital_after': self.capital
-        }
-        self.trades.append(trade)
+        self.trades.append(
+            entry_time=pos_entry_time,
+            exit_time=current_time,
+            side=pos_side,
+            entry_price=pos_entry,
+            exit_price=fill_price,
+            quantity=exit_quantity,
+            gross_pnl=gross_pnl,
+            entry_fee=partial_capital_used * FEE_RATE,
+            exit_fee=exit_fee,
+            funding_cost=funding_cost,
+            net_pnl=net_pnl,
+            return_pct=(net_pnl / partial_capital_used) * 100 if partial_capital_used > 0 else 0,
+            trend_strength=pos_trend_strength,
+            volume_ratio_entry=pos_volume_ratio,
+            exit_reason=exit_reason,
+            holding_hours=holding_hours,
+            capital_before=self.capital - net_pnl,
+            capital_after=self.capital
+        )
         
         # 이벤트 로그
-        exit_time = pd.Timestamp(row['timestamp']) if 'timestamp' in row.index else pd.Timestamp.now()
-        self.events.append({
-            'timestamp': exit_time,
-            'event_type': 'EXIT' if not is_partial else 'PARTIAL_EXIT',
-            'side': pos_side,
-            'price': fill_price,
-            'exit_reason': exit_reason,
-            'gross_pnl': gross_pnl,
-            'net_pnl': net_pnl,
-            'funding_cost': funding_cost,
-            'capital_after': self.capital
-        })
-    
-    def run_backtest(self, df: pd.DataFrame) -> Dict:
-        """백테스트 실행"""
-        print(f"\n{'='*60}")
-        print("백테스팅 시작")
-        print(f"{'='*60}")
-        print(f"데이터 기간: {df.index[0]} ~ {df.index[-1]}")
-        print(f"데이터 개수: {len(df):,}개 봉")
-        print(f"초기 자본: {INITIAL_CAPITAL} USDT")
-        print(f"레버리지: {LEVERAGE}배")
-        print(f"{'='*60}\n")
+        self.events.append(
+            timestamp=current_time,
+            bar_index=row.name,
+            event_type='EXIT' if not is_partial else 'PARTIAL_EXIT',
+            side=pos_side,
+            price=fill_price,
+            quantity=exit_quantity,
+            exit_reason=exit_reason,
+            gross_pnl=gross_pnl,
+            net_pnl=net_pnl,
+            funding_cost=funding_cost,
+            capital_after=self.capital
+        )
+    
+    def _exit_config(self) -> Dict:
+        """체결 판별기 종류 + 판별에 쓰는 데이터 해시 (1분봉/aggTrades가 바뀌면 다른 실행)"""
+        if self.exit_resolver is None:
+            return {}
+        return {'exit_resolver': type(self.exit_resolver).__name__,
+                'exit_data': self.exit_resolver.fingerprint(), **self.exit_resolver.run_config()}
+    
+    def _run_config(self, extra_config: Optional[Dict] = None) -> Dict:
+        """저장 키/체크포인트 검증용 설정 (전역 설정 + 체결 판별기 + 실행 옵션)"""
+        config = get_run_config()
+        config['intrabar_exits'] = self.exit_resolver is not None
+        config.update(self._exit_config())
+        config.update(extra_config or {})
+        return config
+    
+    def _record_run_inputs(self, frames: List[pd.DataFrame], extra_config: Optional[Dict] = None,
+                           extra_sources: Tuple[Path, ...] = ()):
+        """입력 해시(run_key)와 데이터 구간/설정 기록 (save_results에서 사용)"""
+        config = self._run_config(extra_config)
+        code = run_store.code_version(SOURCE_FILES + tuple(extra_sources))
+        self.run_key = run_store.run_key(frames, config, code)
+        self.run_meta = {
+            'data_from': str(min(df.index[0] for df in frames)) if frames else None,
+            'data_to': str(max(df.index[-1] for df in frames)) if frames else None,
+            'bars': int(sum(len(df) for df in frames)),
+            'code_version': code,
+            'config': config,
+        }
+    
+    def run_backtest(self, df: pd.DataFrame, verbose: bool = True, checkpoint: bool = False,
+                     start_bar: int = 1) -> Dict:
+        """
+        백테스트 실행
+        - df에 indicator_columns가 이미 있으면 지표 계산을 생략 (전체 기간에서 미리 계산한 지표를 구간별로 잘라 쓸 때)
+        - verbose=False면 진행 출력 없음 (스윕/워크포워드용)
+        - checkpoint=True면 마지막 봉 처리 직전 상태를 보관 (save_checkpoint로 저장)
+        - start_bar: 루프 시작 위치 (유효 봉 기준, resume에서 체크포인트 다음 봉부터 이어서 실행할 때 사용)
+        - cache가 있으면 같은 입력(봉 데이터 + 상수 + 코드)의 결과를 재사용 (체크포인트/이어서 실행은 제외)
+        """
+        log = print if verbose else _silent
+        self._record_run_inputs([df])
+        cache_key = self.run_key if self.cache is not None and not checkpoint and start_bar == 1 \
+            and self._resume_from is None else None
+        if cache_key is not None:
+            state = self.cache.get(cache_key)
+            if state is not None:
+                log(f"\n[실행 캐시] 같은 입력 결과 재사용 ({cache_key}, 총 거래: {len(state['trades'])}건)")
+                self.profiler.count('cache_hits')
+                return self._restore_run_state(state)
+        raw = df
+        log(f"\n{'='*60}")
+        log("백테스팅 시작")
+        log(f"{'='*60}")
+        log(f"데이터 기간: {df.index[0]} ~ {df.index[-1]}")
+        log(f"데이터 개수: {len(df):,}개 봉")
+        log(f"초기 자본: {INITIAL_CAPITAL} USDT")
+        log(f"레버리지: {LEVERAGE}배")
+        log(f"{'='*60}\n")
         
         # 지표 계산
-        print("[1/3] 지표 계산 중...")
-        df = self.calculate_indicators(df)
+        prof = self.profiler
+        if all(col in df.columns for col in self.indicator_columns):
+            log("[1/3] 지표 재사용 (사전 계산됨)")
+        else:
+            log("[1/3] 지표 계산 중...")
+            with prof.span('indicators'):
+                df = self.calculate_indicators(df)
         # 필요한 컬럼만 확인 (ADX는 선택적)
-        required_cols = ['ema_fast', 'ema_slow', 'rsi', 'atr', 'volume_ratio']
-        valid_count = len(df.dropna(subset=required_cols))
-        print(f"지표 계산 완료 (유효 데이터: {valid_count:,}개)\n")
+        valid_count = len(df.dropna(subset=list(self.required_columns)))
+        log(f"지표 계산 완료 (유효 데이터: {valid_count:,}개)\n")
         
         # 백테스트 루프 (look-ahead bias 방지: 현재 봉의 데이터만 사용)
-        print("[2/3] 백테스트 실행 중...")
+        log("[2/3] 백테스트 실행 중...")
         # 필요한 지표 컬럼만 확인 (ADX는 선택적, 기본 OHLCV는 필수)
-        required_cols = ['ema_fast', 'ema_slow', 'rsi', 'atr', 'volume_ratio']
-        df = df.dropna(subset=required_cols).reset_index()
+        df = df.dropna(subset=list(self.required_columns)).reset_index()
         total_bars = len(df)
         
         if total_bars == 0:
-            print("오류: 유효한 데이터가 없습니다. 지표 계산을 확인해주세요.")
+            log("오류: 유효한 데이터가 없습니다. 지표 계산을 확인해주세요.")
+            self._rebuild_equity(df)
             return self._generate_results()
         
-        print(f"유효 데이터: {total_bars:,}개 봉")
-        
-        for i in range(1, total_bars):
-            if i % 10000 == 0:
+        log(f"유효 데이터: {total_bars:,}개 봉")
+        
+        # 진입 신호는 전체 봉에 대해 한 번에 계산: 루프는 신호 다음 봉과 포지션 보유 구간만 방문
+        with prof.span('backtest/signals'):
+            signals = self.generate_signals(df)
+            direction_at = np.where(signals['long'].to_numpy(), "long",
+                                    np.where(signals['short'].to_numpy(), "short", ""))
+            # 진입을 확인할 봉 = 신호가 난 봉의 다음 봉
+            entry_bars = np.flatnonzero(direction_at != "") + 1
+        # 체크포인트는 마지막 봉 직전에 저장해야 하므로 건너뛰기는 마지막 봉 앞에서 멈춤
+        skip_limit = total_bars - 1 if checkpoint else total_bars
+        
+        if start_bar > 1:
+            log(f"체크포인트에서 이어서 실행: {df['timestamp'].iloc[start_bar]}부터 {total_bars - start_bar:,}개 봉")
+        
+        loop_started = time.perf_counter()
+        visited = 0
+        i = start_bar
+        while i < total_bars:
+            # 포지션이 없으면 다음 신호 봉까지 건너뜀 (자산 곡선은 실행 후 이벤트 장부로 재구성)
+            if self.position is None:
+                k = int(np.searchsorted(entry_bars, i))
+                next_bar = min(int(entry_bars[k]) if k < len(entry_bars) else total_bars, skip_limit)
+                if next_bar > i:
+                    i = next_bar
+                    if i >= total_bars:
+                        break
+            
+            if verbose and visited % 10000 == 0:
                 pct = (i / total_bars) * 100
                 print(f"  진행률: {pct:.1f}% ({i:,}/{total_bars:,}봉)", end="\r")
+            visited += 1
+            
+            # 마지막 봉은 아직 채워지는 중일 수 있으므로 그 직전 상태를 체크포인트로 보관
+            if checkpoint and i == total_bars - 1:
+                self._checkpoint = self._snapshot(raw, df, i)
             
             row = df.iloc[i]
-            prev_row = df.iloc[i-1]
             
             # 현재 포지션이 없으면 진입 확인 (이전 봉 완성 후 신호 확인)
             if self.position is None:
-                # 이전 봉(prev_row) 기준으로 신호 확인 (look-ahead bias 방지)
-                should_enter, direction = self.check_entry_signal(prev_row, df.iloc[i-2] if i >= 2 else prev_row)
-                if should_enter:
-                    # 현재 봉(다음 봉)의 시가로 진입 (look-ahead bias 방지)
-                    if i < total_bars:
+                with prof.span('backtest/entry_check'):
+                    # 이전 봉 기준 신호 (generate_signals, look-ahead bias 방지)
+                    direction = direction_at[i-1]
+                    if direction:
+                        prof.count('entry_signals')
+                        # 현재 봉(다음 봉)의 시가로 진입 (look-ahead bias 방지)
                         entry_price = row['open']
                         self.enter_position(row, direction, entry_price)
+                        prof.count('entries' if self.position is not None else 'rejected_signals')
             else:
-                # 포지션이 있으면 청산 확인 (현재 봉의 고가/저가로 체결 확인)
-                should_exit, exit_price, exit_reason, is_partial = self.check_exit(row)
-                if should_exit:
-                    self.exit_position(row, exit_price, exit_reason, is_partial)
-            
-            # 자산 가치 기록 (미실현 손익 포함)
-            if self.position is not None:
-                current_price = row['close']
-                # 부분 익절 후에는 remaining_quantity 사용
-                qty = self.position.remaining_quantity if hasattr(self.position, 'remaining_quantity') else self.position.quantity
-                if self.position.side == "long":
-                    unrealized_pnl = (current_price - self.position.entry_price) * qty
-                else:
-                    unrealized_pnl = (self.position.entry_price - current_price) * qty
-                equity = self.capital + unrealized_pnl
-            else:
-                equity = self.capital
-            
-            self.equity_curve.append(equity)
-        
-        print(f"\n[3/3] 백테스팅 완료! (총 거래: {len(self.trades)}건)\n")
-        
-        # 결과 생성
-        return self._generate_results()
+                with prof.span('backtest/exit_check'):
+                    # 포지션이 있으면 청산 확인 (현재 봉의 고가/저가로 체결 확인)
+                    should_exit, exit_price, exit_reason, is_partial = self.check_exit(row)
+                    if should_exit:
+                        self.exit_position(row, exit_price, exit_reason, is_partial)
+                        prof.count('partial_exits' if is_partial else 'exits')
+            i += 1
+        prof.add('backtest/loop', time.perf_counter() - loop_started)
+        prof.count('bars', max(total_bars - start_bar, 0))
+        prof.count('bars_visited', visited)
+        
+        log(f"\n[3/3] 백테스팅 완료! (총 거래: {len(self.trades)}건)\n")
+        
+        # 자산 곡선 재구성 + 결과 생성
+        with prof.span('backtest/equity'):
+            self._rebuild_equity(df)
+        with prof.span('backtest/results'):
+            results = self._generate_results()
+        if cache_key is not None:
+            self.cache.put(cache_key, self._run_state(results))
+        return results
     
-    def _generate_results(self) -> Dict:
-        """결과 생성"""
-        if len(self.trades) == 0:
-            return {
-                'total_trades': 0,
-                'winning_trades': 0,
-                'losing_trades': 0,
-                'win_rate': 0.0,
-                'final_capital': self.capital,
-                'total_return': 0.0,
-                'total_return_pct': 0.0,
-                'max_drawdown': self._calculate_max_drawdown(),
-                'profit_factor': 0.0,
-                'avg_win': 0.0,
-                'avg_loss': 0.0,
-                'strong_trend_trades': 0,
-                'strong_trend_pnl': 0.0,
-                'weak_trend_trades': 0,
-                'weak_trend_pnl': 0.0,
-                'total_funding_cost': self.total_funding_cost
-            }
-        
-        trades_df = pd.DataFrame(self.trades)
-        
-        # 기본 통계
-        winning_trades = trades_df[trades_df['net_pnl'] > 0]
-        losing_trades = trades_df[trades_df['net_pnl'] <= 0]
-        
-        total_return = self.capital - INITIAL_CAPITAL
-        total_return_pct = (total_return / INITIAL_CAPITAL) * 100
-        
-        # 추세 강도별 성과
-        strong_trend_trades = trades_df[trades_df['trend_strength'] == 'STRONG']
-        weak_trend_trades = trades_df[trades_df['trend_strength'] == 'WEAK']
-        
-        # 추가 통계: 손익비, 최대 수익/손실
-        avg_win = winning_trades['net_pnl'].mean() if len(winning_trades) > 0 else 0
-        avg_loss = abs(losing_trades['net_pnl'].mean()) if len(losing_trades) > 0 else 0
-        risk_reward_ratio = avg_win / avg_loss if avg_loss > 0 else 0
-        
-        max_win = winning_trades['net_pnl'].max() if len(winning_trades) > 0 else 0
-        max_loss = losing_trades['net_pnl'].min() if len(losing_trades) > 0 else 0
-        
-        # 손절/익절별 통계
-        stop_loss_trades = trades_df[trades_df['exit_reason'] == 'STOP_LOSS']
-        take_profit_trades = trades_df[trades_df['exit_reason'] == 'TAKE_PROFIT']
-        
-        results = {
-            'total_trades': len(trades_df),
-            'winning_trades': len(winning_trades),
-            'losing_trades': len(losing_trades),
-            'win_rate': len(winning_trades) / len(trades_df) * 100 if len(trades_df) > 0 else 0,
-            'total_return': total_return,
-            'total_return_pct': total_return_pct,
-            'final_capital': self.capital,
-            'max_drawdown': self._calculate_max_drawdown(),
-            'profit_factor': abs(winning_trades['net_pnl'].sum() / losing_trades['net_pnl'].sum()) if len(losing_trades) > 0 and losing_trades['net_pnl'].sum() < 0 else 0,
-            'avg_win': avg_win,
-            'avg_loss': losing_trades['net_pnl'].mean() if len(losing_trades) > 0 else 0,
-            'risk_reward_ratio': risk_reward_ratio,
-            'max_win': max_win,
-            'max_loss': max_loss,
-            'stop_loss_trades': len(stop_loss_trades),
-            'take_profit_trades': len(take_profit_trades),
-            'stop_loss_rate': len(stop_loss_trades) / len(trades_df) * 100 if len(trades_df) > 0 else 0,
-            'take_profit_rate': len(take_profit_trades) / len(trades_df) * 100 if len(trades_df) > 0 else 0,
-            'strong_trend_trades': len(strong_trend_trades),
-            'strong_trend_pnl': strong_trend_trades['net_pnl'].sum() if len(strong_trend_trades) > 0 else 0,
-            'weak_trend_trades': len(weak_trend_trades),
-            'weak_trend_pnl': weak_trend_trades['net_pnl'].sum() if len(weak_trend_trades) > 0 else 0,
-            'total_funding_cost': self.total_funding_cost
+    # ================================
+    # 실행 캐시
+    # ================================
+    def _run_state(self, results: Dict) -> Dict:
+        """run_backtest 후 상태 (캐시 저장용)"""
+        return {
+            'results': results,
+            'capital': self.capital,
+            'position': self.position,
+            'total_funding_cost': self.total_funding_cost,
+            'trades': self.trades,
+            'events': self.events,
+            'equity_curve': self.equity_curve,
+            'exposure_curve': self.exposure_curve,
+            'bar_times': self.bar_times,
         }
-        
-        return results
     
-    def _calculate_max_drawdown(self) -> float:
-        """최대 낙폭 계산"""
-        if len(self.equity_curve) == 0:
-            return 0.0
-        
-        equity_array = np.array(self.equity_curve)
-        peak = np.maximum.accumulate(equity_array)
-        drawdown = (equity_array - peak) / peak
-        max_drawdown = abs(np.min(drawdown)) * 100
-        
-        return max_drawdown
+    def _restore_run_state(self, state: Dict) -> Dict:
+        """캐시에서 읽은 상태 복원 -> 결과 dict"""
+        self.capital = state['capital']
+        self.position = state['position']
+        self.total_funding_cost = state['total_funding_cost']
+        self.trades = state['trades']
+        self.events = state['events']
+        self.equity_curve = state['equity_curve']
+        self.exposure_curve = state['exposure_curve']
+        self.bar_times = state['bar_times']
+        return dict(state['results'])
+    
+    def _rebuild_equity(self, df: pd.DataFrame):
+        """이벤트 장부 + 유효 봉 종가로 봉 1부터의 자산/노출 곡선 재구성 (루프에서 봉마다 기록하던 값과 같음)"""
+        curves = equity.rebuild_equity(self.events.to_frame(), df['close'].to_numpy(dtype=np.float64),
+                                       INITIAL_CAPITAL) if len(df) else {'equity': np.empty(0),
+                                                                         'exposure': np.empty(0)}
+        self.equity_curve = curves['equity']
+        self.exposure_curve = curves['exposure']
+        self.bar_times = df['timestamp'].to_numpy().astype('datetime64[ns]')[1:] if len(df) else \
+            np.empty(0, dtype='datetime64[ns]')
+    
+    def equity_frame(self, resolution: Optional[str] = None) -> pd.DataFrame:
+        """
+        자산/낙폭/노출 DataFrame (run_backtest 후)
+        resolution: None이면 봉 단위, '1h'(시간)/'1D'(일) 등 pandas 주기 문자열이면 해당 주기로 묶음
+        """
+        return equity.resample_equity(self.bar_times, self.equity_curve, self.exposure_curve, resolution)
+    
+    # ================================
+    # 체크포인트 (증분 백테스트)
+    # ================================
+    def _snapshot(self, raw: pd.DataFrame, df: pd.DataFrame, i: int) -> Dict:
+        """
+        유효 봉 i를 처리하기 직전 상태
+        지표는 저장하지 않고 i번째 봉 이전의 원본 봉(OHLCV)을 저장:
+        pandas rolling 평균은 시계열 처음부터 누적한 보정 합으로 계산되므로
+        이어서 계산해도 전체 재실행과 비트 단위로 같으려면 처음부터 다시 계산해야 함 (벡터 연산이라 수십 ms)
+        """
+        bar_time = pd.Timestamp(df['timestamp'].iloc[i])
+        # 체결 판별 데이터는 resume 때 새 봉 구간으로 다시 만드므로 검증 설정에서 제외 (사용 여부만 비교)
+        config = self._run_config()
+        for key in self._exit_config():
+            config.pop(key)
+        return {
+            'format': CHECKPOINT_FORMAT,
+            'config': config,
+            'code_version': self.run_meta['code_version'],
+            'bars': raw.loc[raw.index < bar_time, OHLCV_COLUMNS].copy(),
+            'next_bar': i,
+            'next_bar_time': bar_time,
+            'capital': self.capital,
+            'position': copy.copy(self.position),
+            'total_funding_cost': self.total_funding_cost,
+            'trades': copy.deepcopy(self.trades),
+            'events': copy.deepcopy(self.events),
+        }
+    
+    def save_checkpoint(self, path: Path):
+        """run_backtest(checkpoint=True) 후 상태 저장 (임시 파일 후 교체)"""
+        if self._checkpoint is None:
+            raise ValueError("저장할 체크포인트가 없습니다 (run_backtest(checkpoint=True)로 실행하세요)")
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(self._checkpoint, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    
+    @classmethod
+    def from_checkpoint(cls, path: Path, exit_resolver=None, profiler=None) -> 'BinanceETHFuturesBacktest':
+        """
+        체크포인트에서 백테스터 복원 (이후 resume으로 새 봉만 실행)
+        설정 상수/코드가 저장 당시와 다르면 ValueError (전체 재실행 필요)
+        exit_resolver는 새 봉의 1분봉으로 만들어서 resume 전에 지정해도 됨 (사용 여부는 저장 당시와 같아야 함)
+        """
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+        backtest = cls(exit_resolver=exit_resolver, profiler=profiler)
+        if state.get('format') != CHECKPOINT_FORMAT:
+            raise ValueError(f"체크포인트 형식이 다릅니다: {state.get('format')} (현재 {CHECKPOINT_FORMAT})")
+        config = dict(state['config'])
+        intrabar_exits = config.pop('intrabar_exits')
+        if config != get_run_config():
+            raise ValueError("체크포인트 저장 이후 설정이 바뀌었습니다")
+        if state['code_version'] != run_store.code_version(SOURCE_FILES):
+            raise ValueError("체크포인트 저장 이후 백테스트 코드가 바뀌었습니다")
+        
+        backtest.capital = state['capital']
+        backtest.position = state['position']
+        backtest.total_funding_cost = state['total_funding_cost']
+        backtest.trades = state['trades']
+        backtest.events = state['events']
+        backtest._resume_from = {key: state[key] for key in ('bars', 'next_bar', 'next_bar_time')}
+        backtest._resume_from['intrabar_exits'] = intrabar_exits
+        return backtest
+    
+    @property
+    def resume_time(self) -> pd.Timestamp:
+        """이어서 실행할 첫 봉의 시각 (이 시각부터의 1분봉만 새로 읽으면 됨)"""
+        if self._resume_from is None:
+            raise ValueError("체크포인트에서 복원한 백테스터가 아닙니다")
+        return self._resume_from['next_bar_time']
+    
+    def resume(self, new_bars: pd.DataFrame, verbose: bool = True, checkpoint: bool = True) -> Dict:
+        """
+        체크포인트 이후 봉만 실행 (결과는 전체 데이터로 처음부터 다시 돌린 것과 같음)
+        new_bars: resume_time 이후 봉 (resume_time 봉 포함, 저장 당시 채워지는 중이던 봉이라 다시 읽어야 함)
+        """
+        if self._resume_from is None:
+            raise ValueError("체크포인트에서 복원한 백테스터가 아닙니다")
+        resume_from = self._resume_from
+        if (self.exit_resolver is not None) != resume_from['intrabar_exits']:
+            raise ValueError("봉 내부 체결 판별(exit_resolver) 사용 여부가 체크포인트와 다릅니다")
+        new_bars = new_bars.loc[new_bars.index >= resume_from['next_bar_time'], OHLCV_COLUMNS]
+        if len(new_bars) == 0 or new_bars.index[0] != resume_from['next_bar_time']:
+            raise ValueError(f"새 봉이 체크포인트 시각({resume_from['next_bar_time']})부터 시작하지 않습니다")
+        df = pd.concat([resume_from['bars'], new_bars])
+        return self.run_backtest(df, verbose=verbose, checkpoint=checkpoint, start_bar=resume_from['next_bar'])
+    
+    def _generate_results(self) -> Dict:
+        """결과 생성 (거래 장부/자산 곡선을 한 번씩만 훑어서 PerformanceMetrics에 누적)"""
+        metrics = PerformanceMetrics(INITIAL_CAPITAL, bars_per_year(RESAMPLE_TIMEFRAME))
+        trades = self.trades.to_frame()
+        for net_pnl, exit_reason, trend_strength, funding_cost in zip(
+                trades['net_pnl'].to_numpy(), trades['exit_reason'].astype(str),
+                trades['trend_strength'].astype(str), trades['funding_cost'].to_numpy()):
+            metrics.update_trade(float(net_pnl), exit_reason, trend_strength, float(funding_cost))
+        metrics.update_bars(self.equity_curve, self.exposure_curve)
+        return metrics.summary(final_capital=self.capital)
     
     def save_results(self, output_dir: Path, results: Dict):
-        """결과를 CSV 파일로 저장 (체계적이고 구체적인 로그)"""
+        """결과 저장 (run_store 압축 형식 + summary.txt, EXPORT_CSV=True면 CSV도 저장)"""
+        with self.profiler.span('save_results'):
+            self._save_results(output_dir, results)
+        
+        # 프로파일 (PROFILE=True로 Profiler를 넘긴 경우)
+        if self.profiler.enabled:
+            self.profiler.dump(output_dir)
+            print(f"  [저장] 프로파일: profile.json" + (" + profile.prof" if PROFILE_CPROFILE else ""))
+    
+    def _save_results(self, output_dir: Path, results: Dict):
         output_dir.mkdir(parents=True, exist_ok=True)
         
-        # 1. 거래 내역 (trades.csv)
-        if len(self.trades) > 0:
-            trades_df = pd.DataFrame(self.trades)
-            trades_df.to_csv(output_dir / 'trades.csv', index=False, encoding='utf-8-sig')
-            print(f"  [저장] 거래 내역: trades.csv ({len(trades_df)}건)")
-        
-        # 2. 이벤트 로그 (events.csv) - 진입/청산 모든 이벤트
-        if len(self.events) > 0:
-            events_df = pd.DataFrame(self.events)
-            events_df.to_csv(output_dir / 'events.csv', index=False, encoding='utf-8-sig')
-            print(f"  [저장] 이벤트 로그: events.csv ({len(events_df)}건)")
-        
-        # 3. 자산 곡선 (equity_curve.csv)
-        if len(self.equity_curve) > 0:
-            equity_df = pd.DataFrame({
-                'bar_index': range(len(self.equity_curve)),
-                'equity': self.equity_curve
-            })
-            equity_df.to_csv(output_dir / 'equity_curve.csv', index=False, encoding='utf-8-sig')
-            print(f"  [저장] 자산 곡선: equity_curve.csv ({len(self.equity_curve)}개)")
+        # 1. 거래 내역/이벤트/자산 곡선: 압축 바이너리 (입력이 같은 실행은 objects/<key>.npz 공유)
+        if self.run_key is None:
+            raise ValueError("run_backtest 실행 전에는 결과를 저장할 수 없습니다")
+        created = run_store.save_run(output_dir, self.run_key, results, self.trades.to_frame(),
+                                     self.events.to_frame(), np.asarray(self.equity_curve), meta=self.run_meta)
+        print(f"  [저장] 거래 {len(self.trades)}건, 이벤트 {len(self.events)}건, 자산 곡선 {len(self.equity_curve)}개 "
+              f"-> {run_store.OBJECTS_DIR}/{self.run_key}.npz" + ("" if created else " (동일 입력 결과 재사용)"))
+        
+        # 2. 실행 카탈로그 등록 (backtest_results/catalog.sqlite)
+        run_catalog.record_run(output_dir, self.run_key, results, self.run_meta)
+        
+        # 3. CSV (EXPORT_CSV=True일 때만, 이후에도 run_store.py export로 생성 가능)
+        if EXPORT_CSV:
+            run_store.export_csv(output_dir)
         
         # 4. 성과 요약 (summary.txt)
         summary_path = output_dir / 'summary.txt'
@@ -701,44 +1068,76 @@ class BinanceETHFuturesBacktest:
             f.write(f"익절 거래: {results.get('take_profit_trades', 0)}건 ({results.get('take_profit_rate', 0):.1f}%)\n\n")
             f.write(f"강한 추세 거래: {results['strong_trend_trades']}건, 수익: {results['strong_trend_pnl']:.2f} USDT\n")
             f.write(f"약한 추세 거래: {results['weak_trend_trades']}건, 수익: {results['weak_trend_pnl']:.2f} USDT\n")
-            f.write(f"총 펀딩비: {results['total_funding_cost']:.4f} USDT\n")
+            f.write(f"총 펀딩비: {results['total_funding_cost']:.4f} USDT\n\n")
+            f.write(f"샤프 비율: {results['sharpe_ratio']:.2f}, 소르티노 비율: {results['sortino_ratio']:.2f} (연율화)\n")
+            f.write(f"변동성: {results['volatility_pct']:.2f}% (연율화)\n")
+            f.write(f"시장 노출: {results['exposure_pct']:.1f}% (평균 레버리지 {results['avg_leverage']:.2f}배)\n")
         print(f"  [저장] 성과 요약: summary.txt")
 
 
 # ================================
 # 데이터 로드 함수
 # ================================
-def load_data(csv_path: str, months: int = 0) -> pd.DataFrame:
-    """데이터 로드 및 필터링 (months=0이면 전체 데이터) + 15분봉으로 리샘플링"""
+def load_data(csv_path: str, months: int = 0, keep_minutes: bool = False, profiler=None,
+              timeframe: Optional[str] = None):
+    """
+    데이터 로드 및 필터링 (months=0이면 전체 데이터) + timeframe 주기로 리샘플링
+    timeframe: 리샘플링 주기 (None이면 RESAMPLE_TIMEFRAME, 전역 상수를 바꾸지 않고 다른 주기 로드)
+    keep_minutes=True면 (리샘플링 봉, 1분봉 high/low) 튜플 반환 (IntrabarExitResolver용)
+    profiler: 넘기면 CSV 읽기(load_data/read)와 리샘플링(load_data/resample) 시간 기록
+
+    data_pipeline 스트리밍 로더 사용: 1분봉 전체를 메모리에 올리지 않고 블록 단위로 읽으면서 리샘플링
+    (keep_minutes=True일 때만 1분봉 high/low를 보관)
+    """
     print(f"[데이터 로드] {csv_path}")
-    df = pd.read_csv(csv_path)
+    timeframe = timeframe or RESAMPLE_TIMEFRAME
     
-    # 타임스탬프 변환
-    df['timestamp'] = pd.to_datetime(df['timestamp'])
-    df.set_index('timestamp', inplace=True)
-    df.sort_index(inplace=True)
-    
-    # 최근 N개월 데이터만 사용 (months > 0일 때만)
+    # 최근 N개월 데이터만 사용 (months > 0일 때만): 시작 시각 이전 구간은 읽지 않음
+    start_date = None
     if months > 0:
-        end_date = df.index.max()
+        end_date = last_timestamp(csv_path)
         start_date = end_date - timedelta(days=months * 30)
-        df = df[df.index >= start_date]
-        print(f"[데이터 필터링] {start_date.date()} ~ {end_date.date()} ({len(df):,}개 1분봉)")
+    
+    prof = profiler or NULL_PROFILER
+    minute_count = 0
+    read_seconds = 0.0
+    kept = []
+    
+    def tap(chunks):
+        nonlocal minute_count, read_seconds
+        chunks = iter(chunks)
+        while True:
+            started = time.perf_counter()
+            chunk = next(chunks, None)
+            read_seconds += time.perf_counter() - started
+            if chunk is None:
+                return
+            minute_count += len(chunk)
+            if keep_minutes:
+                kept.append(chunk[['high', 'low']])
+            yield chunk
+    
+    # timeframe 주기로 리샘플링 (노이즈 감소)
+    print(f"[리샘플링] 1분봉 -> {timeframe} 변환 중...")
+    started = time.perf_counter()
+    bars = list(resample_stream(tap(stream_minutes(csv_path, start=start_date)), timeframe))
+    if not bars:
+        raise ValueError(f"데이터가 비어 있습니다: {csv_path}")
+    df_resampled = pd.concat(bars)
+    elapsed = time.perf_counter() - started
+    prof.add('load_data/read', read_seconds)
+    prof.add('load_data/resample', elapsed - read_seconds)
+    prof.count('minutes_loaded', minute_count)
+    
+    if months > 0:
+        print(f"[데이터 필터링] {start_date.date()} ~ {end_date.date()} ({minute_count:,}개 1분봉)")
     else:
         # 전체 데이터 사용
-        print(f"[전체 데이터 사용] {df.index[0].date()} ~ {df.index[-1].date()} ({len(df):,}개 1분봉)")
-    
-    # 15분봉으로 리샘플링 (노이즈 감소)
-    print(f"[리샘플링] 1분봉 -> 15분봉 변환 중...")
-    df_resampled = df.resample('15min').agg({
-        'open': 'first',
-        'high': 'max',
-        'low': 'min',
-        'close': 'last',
-        'volume': 'sum'
-    }).dropna()
-    print(f"[리샘플링 완료] {len(df_resampled):,}개 15분봉")
+        print(f"[전체 데이터 사용] {df_resampled.index[0].date()} ~ {df_resampled.index[-1].date()} ({minute_count:,}개 1분봉)")
+    print(f"[리샘플링 완료] {len(df_resampled):,}개 {timeframe} 봉")
     
+    if keep_minutes:
+        return df_resampled, pd.concat(kept)
     return df_resampled
 
 
@@ -770,15 +1169,32 @@ def main():
         print(f"{'='*80}")
         
         # 데이터 로드
-        df = load_data(str(csv_path), months=months)
+        profiler = Profiler(cprofile=PROFILE_CPROFILE) if PROFILE else None
+        if AGG_TRADES_DIR is not None:
+            # 신호는 CSV 봉, 진입/청산 가격은 aggTrades 체결 재생
+            df = load_data(str(csv_path), months=months, profiler=profiler)
+            exit_resolver = AggTradeExecutor(AggTradeStore(Path(__file__).parent / AGG_TRADES_DIR), RESAMPLE_TIMEFRAME)
+        elif USE_INTRABAR_EXITS:
+            df, df_minutes = load_data(str(csv_path), months=months, keep_minutes=True, profiler=profiler)
+            exit_resolver = IntrabarExitResolver(df_minutes, RESAMPLE_TIMEFRAME)
+            del df_minutes
+        else:
+            df = load_data(str(csv_path), months=months, profiler=profiler)
+            exit_resolver = None
         
         if len(df) == 0:
             print(f"경고: {period_name} 데이터가 없습니다. 건너뜁니다.")
             continue
+        if USE_FEATURE_STORE:
+            from feature_store import with_indicators  # feature_store가 이 모듈을 import하므로 실행 시점에 로드
+            df = with_indicators(df, verbose=True)
         
         # 백테스트 실행
-        backtest = BinanceETHFuturesBacktest()
+        backtest = BinanceETHFuturesBacktest(exit_resolver=exit_resolver, profiler=profiler,
+                                             cache=RunCache() if USE_RUN_CACHE else None)
         results = backtest.run_backtest(df)
+        if profiler is not None:
+            profiler.print_summary()
         
         # 결과 저장
         output_dir = Path(__file__).parent / OUTPUT_DIR / f"{timestamp}_{period_name.replace(' ', '_').replace('(', '').replace(')', '')}"
@@ -0,0 +1,282 @@
+"""
+스트리밍 데이터 파이프라인 (1분봉 CSV -> 리샘플링 봉, 메모리 일정)
+
+- stream_minutes: 1분봉 CSV를 블록 단위로 읽어서 DataFrame 청크로 반환
+  날짜 필터는 파일 오프셋 이진 탐색으로 내려보내서(pushdown) 시작 시각 이전 구간은 파싱하지 않음
+  종료 시각 이후 구간은 읽지 않음
+- resample_stream: 1분봉 청크를 받아서 임의 주기(하루를 나누어떨어지게 하는 주기)로 리샘플링
+  청크 경계에 걸린 미완성 봉은 다음 청크로 넘겨서(carry) 이어 붙임
+- resample_multi / load_bars: 여러 주기(5분~4시간)를 1분봉 한 번 읽기로 생성
+  가장 짧은 주기만 1분봉에서 만들고, 긴 주기는 나누어떨어지는 가장 긴 하위 주기 봉에서 구간 축약(reduceat)
+  load_bars는 결과를 주기 묶음 하나로 캐시 (CSV 옆 .bar_cache/, CSV 크기/수정 시각이 바뀌면 무효)
+- CSV는 timestamp 오름차순 정렬이어야 함 (다운로드 스크립트 출력 형식)
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+CHUNK_ROWS = 500_000  # 한 번에 읽을 1분봉 행 수 (청크당 메모리 ≈ 행 수 x 6컬럼 x 8바이트)
+SEEK_BLOCK = 1 << 16  # 이진 탐색을 멈추고 순차 읽기로 넘어가는 구간 크기 (바이트)
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+MULTI_TIMEFRAMES = ('5min', '15min', '30min', '1h', '4h')  # load_bars 기본 주기 묶음
+BAR_CACHE_DIR = '.bar_cache'
+BAR_CACHE_FORMAT = 1
+
+
+def _read_header(f) -> List[str]:
+    f.seek(0)
+    return f.readline().decode('utf-8-sig').strip().split(',')
+
+
+def _line_timestamp(line: bytes, ts_col: int) -> pd.Timestamp:
+    return pd.Timestamp(line.decode('utf-8').split(',')[ts_col])
+
+
+def last_timestamp(csv_path: str) -> pd.Timestamp:
+    """파일 끝 부분만 읽어서 마지막 timestamp 조회"""
+    with open(csv_path, 'rb') as f:
+        ts_col = _read_header(f).index('timestamp')
+        size = f.seek(0, os.SEEK_END)
+        block = min(size, 4096)
+        while True:
+            f.seek(size - block)
+            lines = [l for l in f.read(block).splitlines() if l.strip()]
+            if len(lines) >= 2 or block == size:
+                return _line_timestamp(lines[-1], ts_col)
+            block = min(size, block * 2)
+
+
+def _seek_start(f, start: pd.Timestamp, ts_col: int, data_offset: int) -> int:
+    """
+    start 이상인 첫 줄 근처의 줄 시작 오프셋 (파일 오프셋 이진 탐색)
+    반환 오프셋 이후 첫 줄부터 읽으면 start 이상인 줄을 놓치지 않음
+    """
+    size = f.seek(0, os.SEEK_END)
+    lo, hi = data_offset, size
+    while hi - lo > SEEK_BLOCK:
+        mid = (lo + hi) // 2
+        f.seek(mid)
+        f.readline()  # 중간에 걸린 줄 버림
+        line = f.readline()
+        if not line.strip() or _line_timestamp(line, ts_col) >= start:
+            hi = mid
+        else:
+            lo = mid
+    if lo == data_offset:
+        return lo
+    # lo가 걸친 줄은 start보다 이전이므로 다음 줄 시작으로 맞춤
+    f.seek(lo)
+    f.readline()
+    return f.tell()
+
+
+def stream_minutes(csv_path: str, start: Optional[pd.Timestamp] = None, end: Optional[pd.Timestamp] = None,
+                   chunk_rows: int = CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """
+    1분봉 청크 생성기 (DatetimeIndex 'timestamp' + OHLCV 컬럼)
+    start 이상, end 미만 구간만 반환
+    """
+    with open(csv_path, 'rb') as f:
+        columns = _read_header(f)
+        ts_col = columns.index('timestamp')
+        data_offset = f.tell()
+        offset = _seek_start(f, start, ts_col, data_offset) if start is not None else data_offset
+        f.seek(offset)
+
+        reader = pd.read_csv(f, header=None, names=columns, usecols=['timestamp'] + OHLCV_COLUMNS,
+                             chunksize=chunk_rows, encoding='utf-8')
+        for chunk in reader:
+            chunk['timestamp'] = pd.to_datetime(chunk['timestamp'])
+            chunk = chunk.set_index('timestamp')
+            if start is not None:
+                chunk = chunk[chunk.index >= start]
+            if end is not None and len(chunk) > 0 and chunk.index[-1] >= end:
+                chunk = chunk[chunk.index < end]
+                if len(chunk) > 0:
+                    yield chunk
+                return
+            if len(chunk) > 0:
+                yield chunk
+
+
+def _aggregate(ts: np.ndarray, o, h, l, c, v, bar_ns: int):
+    """정렬된 1분봉 배열 -> (봉 시작 ns, open, high, low, close, volume) 배열"""
+    bucket = ts - ts % bar_ns
+    starts = np.flatnonzero(np.diff(bucket)) + 1
+    first = np.concatenate(([0], starts))
+    last = np.concatenate((starts - 1, [len(ts) - 1]))
+    return (bucket[first], o[first], np.maximum.reduceat(h, first), np.minimum.reduceat(l, first),
+            c[last], np.add.reduceat(v, first))
+
+
+def _to_frame(parts) -> pd.DataFrame:
+    keys, o, h, l, c, v = parts
+    index = pd.DatetimeIndex(keys.view('datetime64[ns]'), name='timestamp')
+    return pd.DataFrame({'open': o, 'high': h, 'low': l, 'close': c, 'volume': v}, index=index)
+
+
+class _Resampler:
+    """청크 단위 리샘플링 상태 (마지막 미완성 봉을 다음 청크로 넘김)"""
+
+    def __init__(self, timeframe: str):
+        self.bar_ns = pd.Timedelta(timeframe).value
+        self.carry = None  # 아직 닫히지 않은 마지막 봉 (key, o, h, l, c, v)
+
+    def push(self, chunk: pd.DataFrame) -> List[tuple]:
+        """1분봉 청크 추가. Returns: 닫힌 봉 배열 묶음 목록 (key, o, h, l, c, v)"""
+        ts = chunk.index.values.astype('datetime64[ns]').view(np.int64)
+        parts = _aggregate(ts, *(chunk[col].to_numpy(dtype=np.float64) for col in OHLCV_COLUMNS), self.bar_ns)
+        keys, o, h, l, c, v = parts
+
+        closed = []
+        carry = self.carry
+        if carry is not None:
+            if keys[0] == carry[0]:
+                # 청크 경계에 걸린 봉: 이전 청크의 앞부분과 합침
+                o[0] = carry[1]
+                h[0] = max(h[0], carry[2])
+                l[0] = min(l[0], carry[3])
+                v[0] = carry[5] + v[0]
+            else:
+                closed.append(tuple(np.array([x]) for x in carry))
+
+        self.carry = tuple(x[-1] for x in parts)
+        if len(keys) > 1:
+            closed.append(tuple(x[:-1] for x in parts))
+        return closed
+
+    def flush(self) -> List[tuple]:
+        if self.carry is None:
+            return []
+        closed = [tuple(np.array([x]) for x in self.carry)]
+        self.carry = None
+        return closed
+
+
+def resample_stream(minute_chunks: Iterator[pd.DataFrame], timeframe: str = '15min') -> Iterator[pd.DataFrame]:
+    """
+    1분봉 청크 -> 리샘플링 봉 청크 (df.resample(timeframe).agg(...).dropna()와 같은 봉 구간/open/high/low/close,
+    volume은 np.add.reduceat 합산 순서 차이로 1e-12 수준 부동소수점 오차 가능)
+    마지막 봉은 다음 청크와 합쳐질 수 있으므로 한 청크 늦게 내보냄
+    """
+    resampler = _Resampler(timeframe)
+    for chunk in minute_chunks:
+        chunk = chunk.dropna(subset=OHLCV_COLUMNS)
+        if len(chunk) == 0:
+            continue
+        for parts in resampler.push(chunk):
+            yield _to_frame(parts)
+    for parts in resampler.flush():
+        yield _to_frame(parts)
+
+
+def stream_resampled(csv_path: str, timeframe: str = '15min', start: Optional[pd.Timestamp] = None,
+                     end: Optional[pd.Timestamp] = None, chunk_rows: int = CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """CSV -> 리샘플링 봉 청크 (stream_minutes + resample_stream)"""
+    return resample_stream(stream_minutes(csv_path, start, end, chunk_rows), timeframe)
+
+
+# ================================
+# 다중 주기
+# ================================
+def _frame_parts(df: pd.DataFrame):
+    ts = df.index.values.astype('datetime64[ns]').view(np.int64)
+    return (ts,) + tuple(df[col].to_numpy(dtype=np.float64) for col in OHLCV_COLUMNS)
+
+
+def build_plan(timeframes: Iterable[str]) -> Dict[str, Optional[str]]:
+    """
+    주기별 원천 주기 (짧은 주기부터 순서대로, None = 1분봉에서 직접 생성)
+    긴 주기는 나누어떨어지는 가장 긴 하위 주기에서 만듦 (예: 4h <- 1h <- 30min <- 15min <- 5min)
+    """
+    ordered = sorted(set(timeframes), key=lambda tf: pd.Timedelta(tf).value)
+    plan: Dict[str, Optional[str]] = {}
+    for tf in ordered:
+        bar_ns = pd.Timedelta(tf).value
+        lower = [src for src in plan if bar_ns % pd.Timedelta(src).value == 0]
+        plan[tf] = lower[-1] if lower else None
+    return plan
+
+
+def resample_multi(minute_chunks: Iterator[pd.DataFrame],
+                   timeframes: Iterable[str] = MULTI_TIMEFRAMES) -> Dict[str, pd.DataFrame]:
+    """
+    1분봉 청크를 한 번만 읽어서 여러 주기 봉 생성 ({주기: 봉 DataFrame})
+    open/high/low/close는 주기별 resample과 같고, 하위 봉에서 합친 volume은 덧셈 순서 차이로 1e-12 수준 오차 가능
+    (1분봉에서 직접 만드는 주기는 resample_stream과 같은 계산이지만, resample 대비 volume은 역시 합산 순서 차이로
+    부동소수점 오차 수준까지만 같음)
+    """
+    plan = build_plan(timeframes)
+    # 하위 주기로 만들 수 없는 주기만 1분봉에서 직접 (보통 최소 주기 하나)
+    resamplers = {tf: _Resampler(tf) for tf, src in plan.items() if src is None}
+    closed = {tf: [] for tf in resamplers}
+    for chunk in minute_chunks:
+        chunk = chunk.dropna(subset=OHLCV_COLUMNS)
+        if len(chunk) == 0:
+            continue
+        for tf, resampler in resamplers.items():
+            closed[tf].extend(resampler.push(chunk))
+    for tf, resampler in resamplers.items():
+        closed[tf].extend(resampler.flush())
+
+    bars: Dict[str, tuple] = {}
+    for tf, src in plan.items():
+        if src is None:
+            parts = closed.pop(tf)
+            bars[tf] = tuple(np.concatenate(cols) for cols in zip(*parts)) if parts else \
+                (np.empty(0, dtype=np.int64),) + tuple(np.empty(0) for _ in OHLCV_COLUMNS)
+        elif len(bars[src][0]) == 0:
+            bars[tf] = bars[src]
+        else:
+            bars[tf] = _aggregate(*bars[src], pd.Timedelta(tf).value)
+    return {tf: _to_frame(parts) for tf, parts in bars.items()}
+
+
+def _cache_key(csv_path: str, start: Optional[pd.Timestamp], end: Optional[pd.Timestamp]):
+    """
+    (캐시 파일 경로, 원본 식별자)
+    파일은 CSV + 구간마다 하나 (CSV가 갱신되면 같은 파일을 덮어씀), 식별자(크기/수정 시각)가 다르면 무효
+    """
+    csv_path = Path(csv_path).resolve()
+    stat = csv_path.stat()
+    name = hashlib.sha256(json.dumps([str(csv_path), str(start), str(end)]).encode()).hexdigest()[:16]
+    source = json.dumps({'size': stat.st_size, 'mtime': stat.st_mtime_ns, 'format': BAR_CACHE_FORMAT})
+    return csv_path.parent / BAR_CACHE_DIR / f"{csv_path.stem}.{name}.npz", source
+
+
+def load_bars(csv_path: str, timeframes: Iterable[str] = MULTI_TIMEFRAMES, start: Optional[pd.Timestamp] = None,
+              end: Optional[pd.Timestamp] = None, cache: bool = True,
+              chunk_rows: int = CHUNK_ROWS) -> Dict[str, pd.DataFrame]:
+    """
+    CSV -> {주기: 봉 DataFrame} (1분봉 한 번 읽기)
+    cache=True면 만든 주기 묶음 전체를 한 파일로 저장하고, 요청 주기가 모두 캐시에 있으면 CSV를 읽지 않음
+    캐시에 없는 주기가 있으면 캐시된 주기와 합쳐서 다시 만들고 캐시 갱신
+    """
+    timeframes = list(dict.fromkeys(timeframes))
+    path, source = _cache_key(csv_path, start, end) if cache else (None, None)
+    cached: Dict[str, pd.DataFrame] = {}
+    if path is not None and path.exists():
+        with np.load(path) as data:
+            valid = str(data['source']) == source
+            for tf in json.loads(str(data['timeframes'])) if valid else []:
+                cached[tf] = _to_frame(tuple(data[f"{tf}/{col}"] for col in ['timestamp'] + OHLCV_COLUMNS))
+        if all(tf in cached for tf in timeframes):
+            return {tf: cached[tf] for tf in timeframes}
+
+    built = resample_multi(stream_minutes(csv_path, start, end, chunk_rows), list(cached) + timeframes)
+    if path is not None:
+        arrays = {'source': np.array(source), 'timeframes': np.array(json.dumps(list(built)))}
+        for tf, df in built.items():
+            for col, values in zip(['timestamp'] + OHLCV_COLUMNS, _frame_parts(df)):
+                arrays[f"{tf}/{col}"] = values
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.stem}.{os.getpid()}.tmp.npz")
+        np.savez(tmp_path, **arrays)
+        os.replace(tmp_path, path)
+    return {tf: built[tf] for tf in timeframes}
@@ -0,0 +1,400 @@
+"""
+분산 스윕 (여러 머신에서 파라미터 세트 나눠 실행, 공유 디렉터리 작업 브로커)
+
+- 외부 서비스 없이 모든 노드가 마운트한 공유 디렉터리(NFS 등) 하나를 브로커로 사용
+    <브로커>/sweep.json        스윕 정보 (CSV 이름, 기간, 주기, 데이터/1분봉 해시, 코드 버전, 작업 수)
+    <브로커>/pending/<작업>.json 대기 작업 (작업 1개 = 파라미터 세트 JOB_SIZE개)
+    <브로커>/claimed/<작업>.json 실행 중 작업 (파일 수정 시각 = 마지막 하트비트)
+    <브로커>/done/<작업>.json    결과 (세트별 _generate_results 값만, 압축 JSON. 예외가 난 세트는 error)
+    <브로커>/failed/<작업>.json  MAX_ATTEMPTS번 재발행해도 끝나지 않은 작업 (워커가 계속 비정상 종료)
+- 가져가기(claim): pending -> claimed 이름 바꾸기(os.rename, 원자적)로 한 워커만 성공
+- 실패 감지: 워커는 실행 중 HEARTBEAT_SECONDS마다 claimed 파일 수정 시각 갱신,
+  LEASE_SECONDS 동안 갱신이 없으면 코디네이터(또는 쉬고 있는 워커)가 pending으로 되돌려 재발행
+  늦게 끝난 워커의 결과도 같은 값이므로 done에 덮어써도 무방 (결과는 입력에만 의존)
+  재발행 횟수는 작업 파일(attempts)에 기록, MAX_ATTEMPTS에 도달하면 failed로 옮겨서 다른 워커를 계속 죽이지 않음
+  워커는 done을 쓰기 직전에 작업 파일이 아직 자기 것인지 다시 확인. 그래도 경합으로 done과 failed에 모두 있으면
+  done이 우선 (완료 수는 작업 이름 기준으로 한 번만 셈, failures에서 제외)
+- 세트 실행 중 예외(잘못된 파라미터 등)는 워커를 멈추지 않고 해당 세트의 error로 done에 기록
+- 워커는 자기 노드의 CSV/.bar_cache/.feature_store로 데이터를 만들고, 데이터 해시/코드 버전이
+  sweep.json과 다르면 실행하지 않음 (모든 노드가 같은 입력으로 같은 결과를 냄)
+- 병합: 완료 순서와 무관하게 세트 번호 순으로 정렬 (결정적). 실패한 세트는 failures로 따로 보고
+- 발행 시 bt.USE_INTRABAR_EXITS면 워커도 1분봉으로 봉 내부 체결 판별 (sweep.py와 같음).
+  sweep.json에 1분봉 해시(minutes_hash)를 기록하고 노드의 1분봉이 다르면 실행하지 않음
+- bt.USE_RUN_CACHE면 노드별 run_cache로 이미 돌려본 세트는 다시 시뮬레이션하지 않음
+
+사용법:
+    python distributed_sweep.py publish <브로커> [개월] [--size=N]   # SEARCH_SPACE에서 N개 세트 발행
+    python distributed_sweep.py worker <브로커> [--procs=N] [--csv=경로]  # 노드마다 실행 (N개 프로세스)
+    python distributed_sweep.py collect <브로커>                      # 완료 대기 + 재발행 + results.csv (+ failed.csv)
+    python distributed_sweep.py status <브로커>
+"""
+
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from multiprocessing import Process
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+import binance_eth_futures_backtest as bt
+import run_store
+from feature_store import data_hash, with_indicators
+from intrabar import IntrabarExitResolver
+from run_cache import RunCache
+from successive_halving import SEARCH_SPACE, sample_candidates, score
+
+# ================================
+# 설정
+# ================================
+JOB_SIZE = 16            # 작업 1개에 넣는 파라미터 세트 수 (파일 입출력 비용 분산)
+LEASE_SECONDS = 120      # 하트비트가 이 시간 동안 없으면 재발행
+HEARTBEAT_SECONDS = 20
+POLL_SECONDS = 1.0
+DEFAULT_SIZE = 2000      # publish 기본 세트 수
+MAX_ATTEMPTS = 3         # 이만큼 재발행된 작업은 failed로 이동
+QUEUES = ('pending', 'claimed', 'done', 'failed')
+
+
+# ================================
+# 브로커 디렉터리
+# ================================
+def _write_json(path: Path, data):
+    """임시 파일에 쓴 뒤 교체 (다른 노드가 쓰다 만 파일을 읽지 않도록)"""
+    tmp_path = path.with_name(f".{path.name}.{socket.gethostname()}.{os.getpid()}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, separators=(',', ':'), default=lambda v: v.item() if hasattr(v, 'item') else str(v))
+    os.replace(tmp_path, path)
+
+
+def _read_json(path: Path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _jobs(broker: Path, queue: str) -> List[Path]:
+    return sorted((broker / queue).glob('*.json'))
+
+
+def _load_frame(spec: Dict, csv_path: Optional[Path] = None):
+    """
+    이 노드의 데이터로 스윕 입력 생성 -> (봉, 봉 내부 체결 판별기 또는 None)
+    데이터 해시/1분봉 해시/코드 버전이 다르면 ValueError
+    """
+    if spec['code_version'] != run_store.code_version(bt.SOURCE_FILES):
+        raise ValueError("이 노드의 백테스트 코드가 스윕 발행 시점과 다릅니다")
+    csv_path = csv_path or Path(__file__).parent / spec['csv']
+    resolver = None
+    if spec.get('minutes_hash'):
+        bars, minutes = bt.load_data(str(csv_path), months=spec['months'], keep_minutes=True,
+                                     timeframe=spec['timeframe'])
+        resolver = IntrabarExitResolver(minutes, spec['timeframe'])
+    else:
+        bars = bt.load_data(str(csv_path), months=spec['months'], timeframe=spec['timeframe'])
+    df = with_indicators(bars, spec['timeframe'])
+    if data_hash(df) != spec['data_hash']:
+        raise ValueError(f"이 노드의 데이터가 스윕과 다릅니다 ({csv_path}): CSV/기간을 맞춰주세요")
+    if resolver is not None and resolver.fingerprint() != spec['minutes_hash']:
+        raise ValueError(f"이 노드의 1분봉이 스윕과 다릅니다 ({csv_path}): CSV/기간을 맞춰주세요")
+    return df, resolver
+
+
+def publish(broker: Path, tasks: List[Dict], csv_path: Path, months: int = 0, job_size: int = JOB_SIZE) -> Dict:
+    """
+    스윕 발행 (브로커 디렉터리가 비어 있어야 함)
+    tasks: [{'params': {...}, 'start': int|None, 'end': int|None}, ...] (세트 번호는 순서대로 부여)
+    """
+    broker = Path(broker)
+    if (broker / 'sweep.json').exists():
+        raise ValueError(f"이미 발행된 스윕이 있습니다: {broker}")
+    resolver = None
+    if bt.USE_INTRABAR_EXITS:
+        bars, minutes = bt.load_data(str(csv_path), months=months, keep_minutes=True)
+        resolver = IntrabarExitResolver(minutes, bt.RESAMPLE_TIMEFRAME)
+    else:
+        bars = bt.load_data(str(csv_path), months=months)
+    df = with_indicators(bars)
+    for queue in QUEUES:
+        (broker / queue).mkdir(parents=True, exist_ok=True)
+
+    jobs = [tasks[i:i + job_size] for i in range(0, len(tasks), job_size)]
+    spec = {
+        'csv': Path(csv_path).name,
+        'months': months,
+        'timeframe': bt.RESAMPLE_TIMEFRAME,
+        'data_hash': data_hash(df),
+        'minutes_hash': resolver.fingerprint() if resolver is not None else None,
+        'code_version': run_store.code_version(bt.SOURCE_FILES),
+        'defaults': bt.get_strategy_params(),
+        'n_tasks': len(tasks),
+        'n_jobs': len(jobs),
+        'created_at': pd.Timestamp.now().isoformat(timespec='seconds'),
+    }
+    width = len(str(max(len(jobs) - 1, 0)))
+    for j, job in enumerate(jobs):
+        offset = j * job_size
+        _write_json(broker / 'pending' / f"{j:0{width}d}.json",
+                    {'job': j, 'tasks': [{'index': offset + k, **task} for k, task in enumerate(job)]})
+    _write_json(broker / 'sweep.json', spec)
+    return spec
+
+
+def reissue_expired(broker: Path, lease_seconds: float = LEASE_SECONDS, max_attempts: int = MAX_ATTEMPTS) -> int:
+    """
+    하트비트가 끊긴 작업을 pending으로 되돌림 (이미 결과가 있으면 claimed만 정리) -> 재발행 수
+    재발행 횟수(attempts)가 max_attempts에 도달한 작업은 failed로 이동
+    """
+    reissued = 0
+    now = time.time()
+    for path in _jobs(broker, 'claimed'):
+        try:
+            if (broker / 'done' / path.name).exists():
+                path.unlink()
+            elif now - path.stat().st_mtime > lease_seconds:
+                # 먼저 이 노드 전용 이름으로 옮겨서 다른 노드와 동시에 처리하지 않음 (*.json이 아니라 목록에 안 잡힘)
+                private = path.with_name(f".{path.name}.reissue.{socket.gethostname()}.{os.getpid()}")
+                os.rename(path, private)
+                job = _read_json(private)
+                job['attempts'] = job.get('attempts', 0) + 1
+                queue = 'failed' if job['attempts'] >= max_attempts else 'pending'
+                _write_json(broker / queue / path.name, job)
+                private.unlink()
+                reissued += queue == 'pending'
+        except FileNotFoundError:
+            pass  # 그 사이 워커가 끝냈거나 다른 노드가 먼저 처리
+    return reissued
+
+
+def status(broker: Path) -> Dict[str, int]:
+    return {queue: len(_jobs(broker, queue)) for queue in QUEUES}
+
+
+def _finished(broker: Path) -> int:
+    """끝난 작업 수 (완료 ∪ 실패, 같은 작업이 둘 다에 있어도 한 번)"""
+    return len({path.name for queue in ('done', 'failed') for path in _jobs(broker, queue)})
+
+
+# ================================
+# 워커
+# ================================
+class _Heartbeat:
+    """실행 중 작업 파일 수정 시각을 주기적으로 갱신 (작업을 재발행당하면 lost=True)"""
+
+    def __init__(self, path: Path, interval: float = HEARTBEAT_SECONDS):
+        self.path = path
+        self.interval = interval
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _beat(self):
+        try:
+            os.utime(self.path)
+        except FileNotFoundError:
+            self.lost = True
+
+    def _run(self):
+        while not self._stop.wait(self.interval) and not self.lost:
+            self._beat()
+
+    def alive(self) -> bool:
+        """작업 파일이 아직 이 워커 것인지 지금 확인 (재발행/failed로 옮겨졌으면 False)"""
+        if not self.lost:
+            self._beat()
+        return not self.lost
+
+    def __enter__(self):
+        self._beat()  # 이름 바꾸기는 수정 시각을 유지하므로 가져오자마자 갱신
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def _claim(broker: Path) -> Optional[Path]:
+    for path in _jobs(broker, 'pending'):
+        target = broker / 'claimed' / path.name
+        try:
+            os.rename(path, target)
+            return target
+        except FileNotFoundError:
+            continue  # 다른 워커가 먼저 가져감
+    return None
+
+
+def _run_task(df: pd.DataFrame, task: Dict, defaults: Dict[str, float],
+              cache: Optional[RunCache] = None, resolver: Optional[IntrabarExitResolver] = None) -> Dict:
+    bt.set_strategy_params({**defaults, **task['params']})
+    backtest = bt.BinanceETHFuturesBacktest(exit_resolver=resolver, cache=cache)
+    results = backtest.run_backtest(df.iloc[task.get('start'):task.get('end')], verbose=False)
+    return {'index': task['index'], 'params': task['params'], 'results': results}
+
+
+def _run_task_safe(df: pd.DataFrame, task: Dict, defaults: Dict[str, float],
+                   cache: Optional[RunCache] = None, resolver: Optional[IntrabarExitResolver] = None) -> Dict:
+    """세트 1개 실행, 예외가 나면 워커를 멈추지 않고 error로 기록"""
+    try:
+        return _run_task(df, task, defaults, cache, resolver)
+    except Exception as e:
+        return {'index': task['index'], 'params': task['params'], 'error': f"{type(e).__name__}: {e}"}
+
+
+def run_worker(broker: Path, csv_path: Optional[Path] = None, lease_seconds: float = LEASE_SECONDS) -> int:
+    """
+    작업이 모두 끝날 때까지 가져가서 실행 -> 이 워커가 완료한 작업 수
+    대기 작업이 없으면 하트비트가 끊긴 작업을 재발행하고 기다림 (코디네이터가 없어도 진행)
+    """
+    broker = Path(broker)
+    spec = _read_json(broker / 'sweep.json')
+    worker_id = f"{socket.gethostname()}-{os.getpid()}"
+    df, resolver = _load_frame(spec, csv_path)
+    defaults = spec['defaults']
+    cache = RunCache() if bt.USE_RUN_CACHE else None
+
+    # 백테스터는 연율화/저장 키에 RESAMPLE_TIMEFRAME을 쓰므로 스윕 주기로 바꾸고 끝나면 복원
+    original = bt.RESAMPLE_TIMEFRAME
+    bt.RESAMPLE_TIMEFRAME = spec['timeframe']
+    completed = 0
+    try:
+        while True:
+            path = _claim(broker)
+            if path is None:
+                if _finished(broker) >= spec['n_jobs']:
+                    return completed
+                reissue_expired(broker, lease_seconds)
+                time.sleep(POLL_SECONDS)
+                continue
+
+            done_path = broker / 'done' / path.name
+            with _Heartbeat(path) as heartbeat:
+                if not heartbeat.lost and not done_path.exists():
+                    job = _read_json(path)
+                    results = [_run_task_safe(df, task, defaults, cache, resolver) for task in job['tasks']]
+                    # 실행 중 재발행됐으면 결과를 버림 (failed로 옮겨진 작업을 done에 다시 쓰지 않음)
+                    if heartbeat.alive():
+                        _write_json(done_path, {'job': job['job'], 'worker': worker_id, 'results': results})
+                        completed += 1
+            path.unlink(missing_ok=True)
+    finally:
+        bt.RESAMPLE_TIMEFRAME = original
+
+
+def _worker_process(broker: str, csv_path: Optional[str]):
+    completed = run_worker(Path(broker), Path(csv_path) if csv_path else None)
+    print(f"[워커 {socket.gethostname()}-{os.getpid()}] 완료 작업 {completed}개")
+
+
+# ================================
+# 코디네이터
+# ================================
+def merge(broker: Path) -> pd.DataFrame:
+    """완료된 결과를 세트 번호 순으로 병합 (파라미터 + 성과 지표 + 점수, 실패한 세트는 제외 -> failures)"""
+    rows = []
+    for path in _jobs(broker, 'done'):
+        for item in _read_json(path)['results']:
+            if 'error' in item:
+                continue
+            rows.append({'index': item['index'], **item['params'], **item['results'],
+                         'score': score(item['results'])})
+    if not rows:
+        return pd.DataFrame()
+    return pd.DataFrame(rows).sort_values('index').reset_index(drop=True)
+
+
+def failures(broker: Path) -> pd.DataFrame:
+    """실패한 세트 (세트 번호, 작업, 파라미터, 오류): 실행 중 예외 + 재발행 한도를 넘은 작업의 세트"""
+    rows = []
+    for path in _jobs(broker, 'done'):
+        job = _read_json(path)
+        rows.extend({'index': item['index'], 'job': job['job'], 'error': item['error'], **item['params']}
+                    for item in job['results'] if 'error' in item)
+    for path in _jobs(broker, 'failed'):
+        if (broker / 'done' / path.name).exists():
+            continue  # 경합으로 늦게 끝난 워커가 결과를 씀 (done 우선)
+        job = _read_json(path)
+        error = f"재발행 {job.get('attempts', 0)}회 후에도 완료되지 않음 (워커 비정상 종료)"
+        rows.extend({'index': task['index'], 'job': job['job'], 'error': error, **task['params']}
+                    for task in job['tasks'])
+    if not rows:
+        return pd.DataFrame(columns=['index', 'job', 'error'])
+    return pd.DataFrame(rows).sort_values('index').reset_index(drop=True)
+
+
+def collect(broker: Path, lease_seconds: float = LEASE_SECONDS, timeout: Optional[float] = None,
+            verbose: bool = True) -> pd.DataFrame:
+    """모든 작업이 끝날 때까지 대기 (끊긴 작업 재발행) 후 병합 (실패한 세트는 failures로 확인)"""
+    log = print if verbose else bt._silent
+    broker = Path(broker)
+    spec = _read_json(broker / 'sweep.json')
+    started = time.time()
+    while True:
+        reissued = reissue_expired(broker, lease_seconds)
+        if reissued:
+            log(f"\n[분산 스윕] 하트비트 끊긴 작업 {reissued}개 재발행")
+        counts = status(broker)
+        log(f"  진행: 완료 {counts['done']}/{spec['n_jobs']} (실행 중 {counts['claimed']}, "
+            f"대기 {counts['pending']}, 실패 {counts['failed']})", end="\r")
+        if _finished(broker) >= spec['n_jobs']:
+            break
+        if timeout is not None and time.time() - started > timeout:
+            raise TimeoutError(f"{timeout}초 안에 끝나지 않았습니다: {counts}")
+        time.sleep(POLL_SECONDS)
+    log("")
+    return merge(broker)
+
+
+def main():
+    args = sys.argv[1:]
+    if len(args) < 2 or args[0] not in ('publish', 'worker', 'collect', 'status'):
+        print(__doc__)
+        return
+    command, broker = args[0], Path(args[1])
+    options = dict(a[2:].split('=', 1) for a in args[2:] if a.startswith('--') and '=' in a)
+    positional = [a for a in args[2:] if not a.startswith('--')]
+
+    if command == 'publish':
+        months = int(positional[0]) if positional else bt.TEST_MONTHS
+        size = int(options.get('size', DEFAULT_SIZE))
+        tasks = [{'params': params} for params in sample_candidates(SEARCH_SPACE, size)]
+        spec = publish(broker, tasks, Path(__file__).parent / bt.CSV_FILE, months)
+        print(f"[분산 스윕] 발행: 세트 {spec['n_tasks']:,}개 / 작업 {spec['n_jobs']:,}개 -> {broker}")
+        print(f"  데이터 해시 {spec['data_hash']}, 코드 버전 {spec['code_version']}")
+
+    elif command == 'worker':
+        procs = int(options.get('procs', os.cpu_count() or 1))
+        workers = [Process(target=_worker_process, args=(str(broker), options.get('csv')))
+                   for _ in range(procs)]
+        for p in workers:
+            p.start()
+        for p in workers:
+            p.join()
+
+    elif command == 'collect':
+        started = time.time()
+        merged = collect(broker)
+        if merged.empty:
+            print(f"[분산 스윕] 성공한 세트가 없습니다 (실패 {len(failures(broker)):,}개)")
+            return
+        merged.to_csv(broker / 'results.csv', index=False, encoding='utf-8-sig')
+        print(f"[분산 스윕] 완료 ({time.time() - started:.1f}초), 세트 {len(merged):,}개")
+        print(f"  [저장] 결과: {broker / 'results.csv'}")
+        failed = failures(broker)
+        if len(failed):
+            failed.to_csv(broker / 'failed.csv', index=False, encoding='utf-8-sig')
+            print(f"  실패 세트 {len(failed):,}개")
+            print(f"  [저장] 실패 목록: {broker / 'failed.csv'}")
+        columns = ['index', 'score', 'total_trades', 'total_return_pct', 'max_drawdown', 'sharpe_ratio']
+        print(merged.sort_values(['score', 'index'], ascending=[False, True])[columns].head(10).to_string(index=False))
+
+    else:
+        print(status(broker))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+자산 곡선 재구성 (이벤트 장부 + 종가 배열 -> 봉별 자산/낙폭/노출)
+
+- 백테스트 루프는 봉마다 자산을 기록하지 않고, 실행이 끝난 뒤 이벤트 장부(ENTRY/PARTIAL_EXIT/EXIT)로 한 번에 재구성
+  자본은 진입(수수료)/청산(순손익) 이벤트에서만 바뀌므로 이벤트 사이 구간은 searchsorted로 채움
+- 봉 t의 자산 = t 이하 마지막 이벤트의 capital_after + 남은 수량의 미실현 손익(봉 t 종가)
+  루프에서 봉마다 계산하던 값과 비트 단위로 같음 (같은 연산 순서)
+- 노출(exposure) = 남은 수량 x 종가 (롱 +, 숏 -, USDT)
+- resample_equity: 시간('1h')/일('1D') 등 pandas 주기로 다시 묶기 (자산/노출 = 구간 마지막 값, 낙폭 = 구간 최저값)
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def rebuild_equity(events: pd.DataFrame, closes: np.ndarray, initial_capital: float,
+                   start: int = 1) -> Dict[str, np.ndarray]:
+    """
+    이벤트 장부 -> 봉 start..len(closes)-1의 자산/노출
+    events: Ledger.to_frame() (bar_index, event_type, side, price, quantity, capital_after 사용, bar_index 오름차순)
+    closes: 이벤트 bar_index와 같은 기준(run_backtest 유효 봉)의 종가
+    """
+    bars = np.arange(start, len(closes))
+    event_type = events['event_type'].astype(str).to_numpy()
+    is_entry = event_type == 'ENTRY'
+    price = events['price'].to_numpy(dtype=np.float64)
+    quantity = events['quantity'].to_numpy(dtype=np.float64)
+
+    # 이벤트별 직후 상태 (같은 포지션의 ENTRY 값을 청산 이벤트까지 이어서 씀)
+    entry_at = np.maximum.accumulate(np.where(is_entry, np.arange(len(events)), 0))
+    entry_price = price[entry_at]
+    is_long = events['side'].astype(str).to_numpy()[entry_at] == 'long'
+    is_open = is_entry | (event_type == 'PARTIAL_EXIT')
+    # 부분 익절 후 남은 수량 = 진입 수량 - 부분 청산 수량 (Position.remaining_quantity와 같은 계산)
+    remaining = np.where(is_entry, quantity, np.where(is_open, quantity[entry_at] - quantity, 0.0))
+
+    # 첫 이벤트 이전 상태(초기 자본, 포지션 없음)를 0번에 두고 봉마다 (마지막 이벤트 번호 + 1)로 조회
+    capital_after = np.concatenate(([initial_capital], events['capital_after'].to_numpy(dtype=np.float64)))
+    is_open = np.concatenate(([False], is_open))
+    is_long = np.concatenate(([True], is_long))
+    entry_price = np.concatenate(([0.0], entry_price))
+    remaining = np.concatenate(([0.0], remaining))
+    state = np.searchsorted(events['bar_index'].to_numpy(), bars, side='right')
+
+    close = closes[start:]
+    capital = capital_after[state]
+    qty = remaining[state]
+    open_now = is_open[state]
+    with np.errstate(invalid='ignore'):
+        unrealized = np.where(is_long[state], (close - entry_price[state]) * qty,
+                              (entry_price[state] - close) * qty)
+    return {
+        'equity': np.where(open_now, capital + unrealized, capital),
+        'exposure': np.where(open_now, np.where(is_long[state], qty, -qty) * close, 0.0),
+    }
+
+
+def drawdown(equity: np.ndarray) -> np.ndarray:
+    """봉별 낙폭 (최고점 대비 비율, 0 이하)"""
+    peak = np.maximum.accumulate(equity)
+    return (equity - peak) / peak
+
+
+def resample_equity(times: np.ndarray, equity: np.ndarray, exposure: np.ndarray,
+                    resolution: Optional[str] = None) -> pd.DataFrame:
+    """
+    자산/낙폭/노출 DataFrame (인덱스: 봉 시각)
+    resolution: None이면 봉 단위, '1h'/'1D' 등이면 해당 주기로 묶음 (낙폭은 봉 단위로 계산한 뒤 구간 최저값)
+    """
+    frame = pd.DataFrame({'equity': equity, 'drawdown': drawdown(equity),
+                          'exposure': exposure}, index=pd.DatetimeIndex(times, name='timestamp'))
+    if resolution is None:
+        return frame
+    grouped = frame.resample(resolution).agg({'equity': 'last', 'drawdown': 'min', 'exposure': 'last'})
+    return grouped.dropna(subset=['equity'])
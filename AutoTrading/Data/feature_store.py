@@ -0,0 +1,170 @@
+"""
+지표 피처 저장소 (계산한 지표 컬럼을 디스크에 보관하고 메모리 맵으로 재사용)
+
+- 지표 값은 봉 데이터와 지표 기간에만 의존 (임계값/배수 같은 전략 상수와 무관)
+- 키: 봉 데이터 해시 + 주기 + 지표 이름 + 기간
+  .feature_store/<데이터 해시>_<주기>_<계산 코드 해시>/<컬럼>_<기간>.npy (컬럼마다 파일 하나)
+- 없는 지표 그룹(bt.INDICATOR_GROUPS)만 계산해서 저장, 있는 컬럼은 np.load(mmap_mode='r')로 복사 없이 반환
+- 같은 데이터로 반복 실행하거나 임계값만 바꾸는 스윕은 지표 계산을 전혀 하지 않음
+- 지표 계산 코드(compute_indicator_group)가 바뀌면 코드 해시가 달라져 다시 계산
+- 전략 플러그인 지표(strategy_api.INDICATORS)도 같은 디렉터리에 저장 (파일 이름에 계산 함수 해시 포함)
+- 봉 데이터가 바뀌면(새 데이터 추가 포함) 새 디렉터리에 다시 계산 (이전 디렉터리는 --prune으로 정리)
+
+사용법:
+    from feature_store import with_indicators
+    df = with_indicators(bt.load_data(csv_path))  # run_backtest/스윕에 넣으면 지표 재계산 생략
+
+    python feature_store.py              # CSV_FILE 전체 기간 지표를 미리 채움
+    python feature_store.py --months=3   # 최근 N개월
+    python feature_store.py --prune      # 채운 뒤 이번 데이터가 아닌 저장소 디렉터리 삭제
+"""
+
+import hashlib
+import inspect
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+import binance_eth_futures_backtest as bt
+from data_pipeline import OHLCV_COLUMNS
+
+FEATURE_STORE_DIR = Path(__file__).parent / '.feature_store'
+
+# 추가 지표 그룹: 그룹 -> (만드는 컬럼, 계산 함수(df, 기간) -> {컬럼: 값})
+IndicatorGroups = Dict[str, Tuple[Tuple[str, ...], Callable[[pd.DataFrame, int], Dict[str, pd.Series]]]]
+
+
+def _code_version() -> str:
+    """지표 계산 코드 해시 (계산식이 바뀌면 저장된 값을 쓰지 않도록 키에 포함)"""
+    source = inspect.getsource(bt.compute_indicator_group) + inspect.getsource(bt._adx_columns)
+    return hashlib.sha256(source.encode()).hexdigest()[:8]
+
+
+def _function_version(func: Callable) -> str:
+    return hashlib.sha256(inspect.getsource(func).encode()).hexdigest()[:8]
+
+
+def group_columns(group: str, groups: Optional[IndicatorGroups] = None) -> Tuple[str, ...]:
+    """지표 그룹이 만드는 컬럼 (추가 그룹 우선, 없으면 bt.INDICATOR_GROUPS)"""
+    if groups and group in groups:
+        return groups[group][0]
+    return bt.INDICATOR_GROUPS[group][1]
+
+
+def data_hash(df: pd.DataFrame) -> str:
+    """봉 데이터 해시 (인덱스 + OHLCV 값)"""
+    digest = hashlib.sha256()
+    digest.update(np.ascontiguousarray(df.index.values.astype('datetime64[ns]').view(np.int64)).data)
+    for col in OHLCV_COLUMNS:
+        digest.update(np.ascontiguousarray(df[col].to_numpy(dtype=np.float64)).data)
+    return digest.hexdigest()[:16]
+
+
+def store_dir(df: pd.DataFrame, timeframe: Optional[str] = None, root: Path = FEATURE_STORE_DIR) -> Path:
+    """데이터 하나(봉 + 주기)의 저장 디렉터리"""
+    timeframe = timeframe or bt.RESAMPLE_TIMEFRAME
+    return Path(root) / f"{data_hash(df)}_{timeframe}_{_code_version()}"
+
+
+def load_indicators(df: pd.DataFrame, timeframe: Optional[str] = None, root: Path = FEATURE_STORE_DIR,
+                    periods: Optional[Dict[str, int]] = None, verbose: bool = False,
+                    groups: Optional[IndicatorGroups] = None) -> Dict[str, np.ndarray]:
+    """
+    지표 컬럼 -> 읽기 전용 메모리 맵 배열 (df와 같은 길이)
+    periods: 지표 그룹별 기간 (기본은 현재 전역 상수, bt.indicator_periods())
+    groups: bt.INDICATOR_GROUPS에 없는 추가 지표 그룹 (전략 플러그인용)
+    저장소에 없는 그룹만 계산해서 저장
+    """
+    log = print if verbose else bt._silent
+    periods = periods or bt.indicator_periods()
+    directory = store_dir(df, timeframe, root)
+
+    def path(group: str, col: str, period: int) -> Path:
+        if groups and group in groups:
+            return directory / f"{col}_{period}_{_function_version(groups[group][1])}.npy"
+        return directory / f"{col}_{period}.npy"
+
+    def compute(group: str, period: int) -> Dict[str, pd.Series]:
+        if groups and group in groups:
+            return groups[group][1](df, period)
+        return bt.compute_indicator_group(df, group, period)
+
+    missing = [group for group, period in periods.items()
+               if not all(path(group, col, period).exists() for col in group_columns(group, groups))]
+    if missing:
+        log(f"[피처 저장소] 지표 계산: {', '.join(missing)}")
+        directory.mkdir(parents=True, exist_ok=True)
+        for group in missing:
+            for col, values in compute(group, periods[group]).items():
+                target = path(group, col, periods[group])
+                tmp_path = target.with_name(f".{target.stem}.{os.getpid()}.tmp.npy")
+                np.save(tmp_path, np.asarray(values, dtype=np.float64))
+                os.replace(tmp_path, target)
+    else:
+        log(f"[피처 저장소] 지표 재사용: {directory.name}")
+
+    out = {}
+    for group, period in periods.items():
+        for col in group_columns(group, groups):
+            values = np.load(path(group, col, period), mmap_mode='r').view(np.ndarray)  # 일반 배열 뷰 (파일 매핑 그대로)
+            if len(values) != len(df):
+                raise ValueError(f"저장된 지표 길이가 데이터와 다릅니다: {path(group, col, period)}")
+            out[col] = values
+    return out
+
+
+def with_indicators(df: pd.DataFrame, timeframe: Optional[str] = None, root: Path = FEATURE_STORE_DIR,
+                    verbose: bool = False, periods: Optional[Dict[str, int]] = None,
+                    groups: Optional[IndicatorGroups] = None) -> pd.DataFrame:
+    """
+    OHLCV + 지표 컬럼 DataFrame (calculate_indicators와 같은 컬럼/값)
+    지표 컬럼은 저장소 파일의 메모리 맵을 그대로 감싼 것 (복사 없음, 읽기 전용)
+    periods/groups: 전략 플러그인 지표 (strategy_api.with_strategy_indicators)
+    """
+    if periods is None and all(col in df.columns for col in bt.INDICATOR_COLUMNS):
+        return df
+    columns = {col: df[col].to_numpy() for col in OHLCV_COLUMNS}
+    columns.update(load_indicators(df, timeframe, root, periods, verbose, groups))
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+
+def prune(keep: Path, root: Path = FEATURE_STORE_DIR) -> int:
+    """keep 외의 저장소 디렉터리 삭제 -> 삭제한 개수"""
+    removed = 0
+    for directory in Path(root).iterdir() if Path(root).exists() else []:
+        if directory.is_dir() and directory.resolve() != Path(keep).resolve():
+            shutil.rmtree(directory)
+            removed += 1
+    return removed
+
+
+def main():
+    args = sys.argv[1:]
+    months = bt.TEST_MONTHS
+    for arg in args:
+        if arg.startswith('--months='):
+            months = int(arg.split('=', 1)[1])
+    csv_path = Path(__file__).parent / bt.CSV_FILE
+    df = bt.load_data(str(csv_path), months=months)
+
+    started = time.perf_counter()
+    load_indicators(df, verbose=True)
+    print(f"[피처 저장소] 첫 조회 {time.perf_counter() - started:.3f}초")
+    started = time.perf_counter()
+    load_indicators(df)
+    print(f"[피처 저장소] 재조회 {time.perf_counter() - started:.3f}초")
+
+    directory = store_dir(df)
+    print(f"  저장 위치: {directory}")
+    if '--prune' in args:
+        print(f"  [정리] 이전 저장소 디렉터리 {prune(directory)}개 삭제")
+
+
+if __name__ == "__main__":
+    main()
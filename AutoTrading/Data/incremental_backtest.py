@@ -0,0 +1,105 @@
+"""
+증분 백테스트 (1분봉 CSV에 새 데이터가 추가될 때마다 매일 재평가)
+
+- 첫 실행: 전체 데이터로 백테스트 후 체크포인트 저장 (마지막 봉 직전 상태)
+- 이후 실행: 체크포인트 복원 -> 체크포인트 시각 이후 1분봉만 읽어서(이진 탐색 seek) 새 봉만 실행
+  결과(거래/이벤트/자산 곡선/저장 키)는 전체 데이터로 처음부터 다시 돌린 것과 같음
+- 설정 상수나 백테스트 코드가 바뀌었으면 체크포인트를 버리고 전체 재실행
+- 항상 전체 데이터 기준 (TEST_MONTHS처럼 최근 N개월만 쓰면 시작 시점이 매일 바뀌어 이어서 실행할 수 없음)
+
+사용법:
+    python incremental_backtest.py              # CSV_FILE, backtest_results/checkpoint.pkl
+    python incremental_backtest.py <csv> [체크포인트 경로]
+"""
+
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+import binance_eth_futures_backtest as bt
+from data_pipeline import resample_stream, stream_minutes
+from intrabar import IntrabarExitResolver
+
+CHECKPOINT_FILE = 'checkpoint.pkl'
+
+
+def _load_tail(csv_path: str, start: pd.Timestamp, keep_minutes: bool) -> Tuple[pd.DataFrame, Optional[pd.DataFrame]]:
+    """start 이후 1분봉만 읽어서 리샘플링 (keep_minutes=True면 봉 내부 체결 판별용 high/low도 반환)"""
+    kept = []
+
+    def tap(chunks):
+        for chunk in chunks:
+            if keep_minutes:
+                kept.append(chunk[['high', 'low']])
+            yield chunk
+
+    bars = list(resample_stream(tap(stream_minutes(csv_path, start=start)), bt.RESAMPLE_TIMEFRAME))
+    if not bars:
+        raise ValueError(f"{start} 이후 데이터가 없습니다: {csv_path}")
+    minutes = pd.concat(kept) if keep_minutes else None
+    return pd.concat(bars), minutes
+
+
+def _full_run(csv_path: str, verbose: bool) -> Tuple[bt.BinanceETHFuturesBacktest, Dict]:
+    if bt.USE_INTRABAR_EXITS:
+        df, minutes = bt.load_data(csv_path, keep_minutes=True)
+        exit_resolver = IntrabarExitResolver(minutes, bt.RESAMPLE_TIMEFRAME)
+        del minutes
+    else:
+        df = bt.load_data(csv_path)
+        exit_resolver = None
+    backtest = bt.BinanceETHFuturesBacktest(exit_resolver=exit_resolver)
+    results = backtest.run_backtest(df, verbose=verbose, checkpoint=True)
+    return backtest, results
+
+
+def run_incremental(csv_path: str, checkpoint_path: Path,
+                    verbose: bool = False) -> Tuple[bt.BinanceETHFuturesBacktest, Dict, bool]:
+    """
+    체크포인트가 있으면 새 봉만, 없거나 쓸 수 없으면 전체 실행. 실행 후 체크포인트 갱신
+    Returns: (백테스터, 결과, 이어서 실행했는지)
+    """
+    checkpoint_path = Path(checkpoint_path)
+    backtest = None
+    if checkpoint_path.exists():
+        try:
+            backtest = bt.BinanceETHFuturesBacktest.from_checkpoint(checkpoint_path)
+        except (ValueError, KeyError) as e:
+            print(f"[체크포인트 무시] {e} -> 전체 재실행")
+
+    if backtest is None:
+        backtest, results = _full_run(csv_path, verbose)
+        resumed = False
+    else:
+        new_bars, minutes = _load_tail(csv_path, backtest.resume_time, bt.USE_INTRABAR_EXITS)
+        if minutes is not None:
+            backtest.exit_resolver = IntrabarExitResolver(minutes, bt.RESAMPLE_TIMEFRAME)
+        results = backtest.resume(new_bars, verbose=verbose)
+        resumed = True
+
+    backtest.save_checkpoint(checkpoint_path)
+    return backtest, results, resumed
+
+
+def main():
+    csv_path = Path(sys.argv[1]) if len(sys.argv) > 1 else Path(__file__).parent / bt.CSV_FILE
+    output_root = Path(__file__).parent / bt.OUTPUT_DIR
+    checkpoint_path = Path(sys.argv[2]) if len(sys.argv) > 2 else output_root / CHECKPOINT_FILE
+
+    started = time.perf_counter()
+    backtest, results, resumed = run_incremental(str(csv_path), checkpoint_path)
+    elapsed = time.perf_counter() - started
+    print(f"[{'증분' if resumed else '전체'} 실행] {elapsed * 1000:.0f} ms, 데이터 끝: {backtest.run_meta['data_to']}")
+
+    output_dir = output_root / f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_incremental"
+    backtest.save_results(output_dir, results)
+    print(f"총 거래: {results['total_trades']}건, 최종 자본: {results['final_capital']:.2f} USDT, "
+          f"최대 낙폭: {results['max_drawdown']:.2f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+봉 내부(1분봉) 체결 순서 판별
+
+15분봉 하나에서 손절가와 익절가(부분 익절 포함)가 모두 닿으면 봉의 고가/저가만으로는
+어느 쪽이 먼저 체결됐는지 알 수 없음. 이때만 원본 1분봉을 순서대로 확인해서 실제 체결 순서를 결정.
+
+- 15분봉 -> 1분봉 구간 인덱스를 생성 시 한 번만 계산 (봉 시작 시각 -> [start, end) 오프셋)
+- 1분봉 하나 안에서도 둘 다 닿으면 기존과 같이 손절 우선 (보수적)
+"""
+
+import hashlib
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class IntrabarExitResolver:
+    """1분봉 기반 청산 순서 판별기"""
+
+    fills_from_trades = False  # 체결 가격은 트리거 가격 + SLIPPAGE_RATE (agg_trades.AggTradeExecutor는 True)
+
+    def __init__(self, minutes: pd.DataFrame, timeframe: str = '15min'):
+        """
+        Args:
+            minutes: 1분봉 (DatetimeIndex, 'high'/'low' 컬럼 필수, 시간순 정렬)
+            timeframe: 백테스트에 사용하는 리샘플링 주기 (load_data와 동일해야 함)
+        """
+        ts = minutes.index.values.astype('datetime64[ns]').view(np.int64)
+        self._high = minutes['high'].to_numpy(dtype=np.float64)
+        self._low = minutes['low'].to_numpy(dtype=np.float64)
+
+        # 1분봉이 속한 리샘플링 봉의 시작 시각 (resample 기본 origin과 동일: 자정 기준 정렬)
+        bar_ns = pd.Timedelta(timeframe).value
+        bucket = ts - ts % bar_ns
+        if len(bucket) > 0:
+            starts = np.flatnonzero(np.diff(bucket)) + 1
+            self._bar_keys = bucket[np.concatenate(([0], starts))]
+            self._offsets = np.concatenate(([0], starts, [len(bucket)]))
+        else:
+            self._bar_keys = np.empty(0, dtype=np.int64)
+            self._offsets = np.zeros(1, dtype=np.int64)
+
+        self.lookups = 0  # 1분봉을 실제로 확인한 횟수 (통계용)
+        self._fingerprint: Optional[str] = None
+
+    def fingerprint(self) -> str:
+        """판별에 쓰는 1분봉(봉 구간 + 고가/저가) 해시 (실행 캐시 키용, 처음 한 번만 계산)"""
+        if self._fingerprint is None:
+            digest = hashlib.sha256()
+            for values in (self._bar_keys, self._offsets, self._high, self._low):
+                digest.update(np.ascontiguousarray(values).data)
+            self._fingerprint = digest.hexdigest()[:16]
+        return self._fingerprint
+
+    def run_config(self) -> Dict:
+        """저장 키에 더할 설정 (없음: 종류/1분봉 해시는 _run_config가 fingerprint로 기록)"""
+        return {}
+
+    def _minute_slice(self, bar_time: pd.Timestamp) -> Optional[Tuple[int, int]]:
+        key = pd.Timestamp(bar_time).value
+        pos = int(np.searchsorted(self._bar_keys, key))
+        if pos >= len(self._bar_keys) or self._bar_keys[pos] != key:
+            return None
+        return int(self._offsets[pos]), int(self._offsets[pos + 1])
+
+    def resolve(self, bar_time: pd.Timestamp, position) -> Optional[Tuple[float, str, bool]]:
+        """
+        봉 안에서 가장 먼저 닿은 트리거 반환
+        Returns: (exit_price, exit_reason, is_partial) / 해당 봉의 1분봉이 없거나 아무것도 닿지 않으면 None
+        """
+        bounds = self._minute_slice(bar_time)
+        if bounds is None:
+            return None
+        start, end = bounds
+        self.lookups += 1
+        high = self._high[start:end]
+        low = self._low[start:end]
+
+        is_long = position.side == "long"
+        check_partial = not position.partial_taken and position.partial_take_profit is not None
+
+        # (가격, 사유, 부분 여부, 닿은 1분봉 마스크) - 같은 1분봉이면 이 순서(손절 > 부분 익절 > 익절)로 우선
+        if is_long:
+            candidates = [(position.stop_loss, "STOP_LOSS", False, low <= position.stop_loss)]
+            if check_partial:
+                candidates.append((position.partial_take_profit, "PARTIAL_TAKE_PROFIT", True,
+                                   high >= position.partial_take_profit))
+            candidates.append((position.take_profit, "TAKE_PROFIT", False, high >= position.take_profit))
+        else:
+            candidates = [(position.stop_loss, "STOP_LOSS", False, high >= position.stop_loss)]
+            if check_partial:
+                candidates.append((position.partial_take_profit, "PARTIAL_TAKE_PROFIT", True,
+                                   low <= position.partial_take_profit))
+            candidates.append((position.take_profit, "TAKE_PROFIT", False, low <= position.take_profit))
+
+        best = None
+        best_minute = end - start
+        for price, reason, is_partial, hit in candidates:
+            if not hit.any():
+                continue
+            minute = int(np.argmax(hit))
+            if minute < best_minute:
+                best = (price, reason, is_partial)
+                best_minute = minute
+        return best
@@ -0,0 +1,131 @@
+"""
+거래/이벤트 장부 (컬럼별 NumPy 배열)
+
+- 행마다 dict를 만드는 대신 필드별 고정 타입 배열에 기록 (미리 할당, 가득 차면 2배로 확장)
+  float64 / int64 / 시각(int64 ns) / 범주(int16 코드 + 범주 목록)
+- to_frame(): 배열을 복사하지 않고 DataFrame 생성 (범주 컬럼은 pd.Categorical)
+- spill_dir를 주면 spill_rows 행마다 디스크(<이름>.<필드>.bin)로 내보내고 버퍼를 비움 (긴 실행/대량 스윕용)
+"""
+
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+SPILL_ROWS = 1 << 16
+NAT = np.iinfo(np.int64).min  # datetime64의 NaT와 같은 값
+_STORAGE = {'f8': np.float64, 'i8': np.int64, 'M8': np.int64, 'cat': np.int16}
+_MISSING = {'f8': np.nan, 'i8': -1, 'M8': NAT, 'cat': -1}
+
+# 백테스트 장부 필드 (이름, 종류)
+TRADE_FIELDS: Tuple[Tuple[str, str], ...] = (
+    ('entry_time', 'M8'), ('exit_time', 'M8'), ('side', 'cat'),
+    ('entry_price', 'f8'), ('exit_price', 'f8'), ('quantity', 'f8'),
+    ('gross_pnl', 'f8'), ('entry_fee', 'f8'), ('exit_fee', 'f8'), ('funding_cost', 'f8'),
+    ('net_pnl', 'f8'), ('return_pct', 'f8'),
+    ('trend_strength', 'cat'), ('volume_ratio_entry', 'f8'), ('exit_reason', 'cat'),
+    ('holding_hours', 'f8'), ('capital_before', 'f8'), ('capital_after', 'f8'),
+)
+
+# 진입(ENTRY)과 청산(EXIT/PARTIAL_EXIT) 이벤트의 합집합 (해당 없는 필드는 결측)
+EVENT_FIELDS: Tuple[Tuple[str, str], ...] = (
+    ('timestamp', 'M8'), ('bar_index', 'i8'), ('event_type', 'cat'), ('side', 'cat'),
+    ('price', 'f8'), ('quantity', 'f8'),
+    ('trend_strength', 'cat'), ('volume_ratio', 'f8'), ('capital_used', 'f8'),
+    ('stop_loss', 'f8'), ('take_profit', 'f8'), ('fee', 'f8'), ('capital_after', 'f8'),
+    ('rsi', 'f8'), ('adx', 'f8'), ('ema_fast', 'f8'), ('ema_slow', 'f8'),
+    ('exit_reason', 'cat'), ('gross_pnl', 'f8'), ('net_pnl', 'f8'), ('funding_cost', 'f8'),
+)
+
+
+class Ledger:
+    """고정 필드 장부 (append 한 번 = 한 행)"""
+
+    def __init__(self, fields: Sequence[Tuple[str, str]], capacity: int = 256,
+                 spill_dir: Optional[Path] = None, name: str = 'ledger', spill_rows: int = SPILL_ROWS):
+        for field, kind in fields:
+            if kind not in _STORAGE:
+                raise ValueError(f"알 수 없는 필드 종류: {field}={kind}")
+        self.fields = tuple(fields)
+        self.name = name
+        self._kinds = dict(self.fields)
+        self._capacity = capacity
+        self._columns = {field: np.empty(capacity, dtype=_STORAGE[kind]) for field, kind in self.fields}
+        self._categories: Dict[str, Dict[str, int]] = {f: {} for f, kind in self.fields if kind == 'cat'}
+        self._size = 0
+        self._spilled = 0
+        self._spill_dir = Path(spill_dir) if spill_dir is not None else None
+        self._spill_rows = spill_rows
+        if self._spill_dir is not None:
+            self._spill_dir.mkdir(parents=True, exist_ok=True)
+            for field in self._columns:
+                self._spill_path(field).unlink(missing_ok=True)
+
+    def __len__(self) -> int:
+        return self._spilled + self._size
+
+    def append(self, **values):
+        unknown = values.keys() - self._kinds.keys()
+        if unknown:
+            raise KeyError(f"{self.name}: 알 수 없는 필드 {sorted(unknown)}")
+        if self._size == self._capacity:
+            self._make_room()
+
+        i = self._size
+        for field, kind in self.fields:
+            value = values.get(field)
+            if value is None:
+                value = _MISSING[kind]
+            elif kind == 'M8':
+                value = pd.Timestamp(value).value
+            elif kind == 'cat':
+                codes = self._categories[field]
+                value = codes.setdefault(str(value), len(codes))
+            self._columns[field][i] = value
+        self._size += 1
+
+    # ================================
+    # 버퍼 관리
+    # ================================
+    def _spill_path(self, field: str) -> Path:
+        return self._spill_dir / f"{self.name}.{field}.bin"
+
+    def _make_room(self):
+        if self._spill_dir is not None and self._size >= self._spill_rows:
+            self._spill()
+            return
+        self._capacity *= 2
+        for field in self._columns:
+            column = np.empty(self._capacity, dtype=self._columns[field].dtype)
+            column[:self._size] = self._columns[field][:self._size]
+            self._columns[field] = column
+
+    def _spill(self):
+        """버퍼 내용을 디스크 파일 끝에 덧붙이고 버퍼 비움"""
+        for field, column in self._columns.items():
+            with open(self._spill_path(field), 'ab') as f:
+                column[:self._size].tofile(f)
+        self._spilled += self._size
+        self._size = 0
+
+    def column(self, field: str) -> np.ndarray:
+        """저장된 원시 값 (시각은 int64 ns, 범주는 코드). 디스크로 내보낸 부분이 없으면 복사 없는 뷰"""
+        values = self._columns[field][:self._size]
+        if self._spilled == 0:
+            return values
+        spilled = np.fromfile(self._spill_path(field), dtype=values.dtype)
+        return np.concatenate((spilled, values))
+
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame 변환 (디스크로 내보낸 부분이 없으면 숫자/시각 컬럼은 복사 없음)"""
+        data = {}
+        for field, kind in self.fields:
+            values = self.column(field)
+            if kind == 'M8':
+                values = values.view('datetime64[ns]')
+            elif kind == 'cat':
+                values = pd.Categorical.from_codes(values, categories=list(self._categories[field]))
+            data[field] = values
+        return pd.DataFrame(data, copy=False)
+
@@ -0,0 +1,159 @@
+"""
+거래 내역 몬테카를로 강건성 분석
+
+- 임의의 백테스트 결과(trades.csv)를 입력으로 받음
+- 거래 순서 섞기(shuffle), 복원 추출(bootstrap), 일부 거래 누락(skip) 세 가지 방식으로 경로 생성
+- 모든 경로를 (경로 수 x 거래 수) 2D 배열로 한 번에 계산 (경로별 파이썬 루프 없음, 메모리 제한을 위해 배치 단위)
+- 최종 자본, 최대 낙폭, 파산 위험(risk of ruin) 분포 출력
+
+사용법: python monte_carlo.py backtest_results/<실행 폴더>[/trades.csv] [경로 수]
+"""
+
+import sys
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from binance_eth_futures_backtest import INITIAL_CAPITAL
+from run_store import load_run
+
+# ================================
+# 설정
+# ================================
+N_PATHS = 100_000
+BATCH_PATHS = 20_000     # 한 번에 계산할 경로 수 (배치당 메모리 ≈ BATCH_PATHS x 거래 수 x 8바이트 x 2)
+SKIP_PROB = 0.1          # skip 방식에서 각 거래를 놓칠 확률
+RUIN_LEVEL = 0.5         # 자본이 초기 자본의 50% 이하로 떨어지면 파산으로 간주
+SEED = 42
+PERCENTILES = (5, 25, 50, 75, 95)
+METHODS = ('shuffle', 'bootstrap', 'skip')
+
+
+def trade_returns(trades: pd.DataFrame, initial_capital: float = INITIAL_CAPITAL) -> np.ndarray:
+    """
+    거래별 자본 변화율 (직전 청산 후 자본 -> 이번 청산 후 자본)
+    진입 수수료/펀딩비까지 포함되므로 원래 순서로 복리 계산하면 실제 최종 자본과 일치
+    """
+    capital_after = trades['capital_after'].to_numpy(dtype=np.float64)
+    capital_prev = np.concatenate(([initial_capital], capital_after[:-1]))
+    return capital_after / capital_prev - 1.0
+
+
+def _generate_returns(rng: np.random.Generator, returns: np.ndarray, method: str, n: int) -> np.ndarray:
+    """(n, 거래 수) 수익률 행렬 생성"""
+    m = len(returns)
+    if method == 'shuffle':
+        return rng.permuted(np.broadcast_to(returns, (n, m)), axis=1)
+    if method == 'bootstrap':
+        return returns[rng.integers(0, m, size=(n, m))]
+    if method == 'skip':
+        return np.where(rng.random((n, m)) < SKIP_PROB, 0.0, returns)
+    raise ValueError(f"알 수 없는 방식: {method}")
+
+
+def _simulate_batch(path_returns: np.ndarray, initial_capital: float):
+    """배치 하나의 (최종 자본, 최대 낙폭 %, 파산 여부)"""
+    equity = np.add(path_returns, 1.0, out=path_returns)
+    np.cumprod(equity, axis=1, out=equity)
+    equity *= initial_capital
+
+    final = equity[:, -1].copy()
+    ruined = equity.min(axis=1) <= initial_capital * RUIN_LEVEL
+
+    # 초기 자본을 첫 고점으로 포함한 누적 최고점 대비 낙폭
+    peak = np.maximum.accumulate(equity, axis=1)
+    np.maximum(peak, initial_capital, out=peak)
+    max_dd = (1.0 - equity / peak).max(axis=1) * 100
+    return final, max_dd, ruined
+
+
+def simulate(returns: np.ndarray, initial_capital: float, method: str,
+             n_paths: int = N_PATHS, seed: int = SEED) -> Dict[str, np.ndarray]:
+    """한 방식의 몬테카를로 분포"""
+    rng = np.random.default_rng(seed)
+    final = np.empty(n_paths)
+    max_dd = np.empty(n_paths)
+    ruined = np.empty(n_paths, dtype=bool)
+
+    for start in range(0, n_paths, BATCH_PATHS):
+        n = min(BATCH_PATHS, n_paths - start)
+        batch = _generate_returns(rng, returns, method, n)
+        f, d, r = _simulate_batch(batch, initial_capital)
+        final[start:start + n] = f
+        max_dd[start:start + n] = d
+        ruined[start:start + n] = r
+
+    return {'final_capital': final, 'max_drawdown': max_dd, 'ruined': ruined}
+
+
+def summarize(dist: Dict[str, np.ndarray], initial_capital: float) -> Dict[str, float]:
+    """분포 요약 통계"""
+    summary = {
+        'final_capital_mean': float(dist['final_capital'].mean()),
+        'max_drawdown_mean': float(dist['max_drawdown'].mean()),
+        'prob_loss': float((dist['final_capital'] < initial_capital).mean() * 100),
+        'risk_of_ruin': float(dist['ruined'].mean() * 100),
+    }
+    for p in PERCENTILES:
+        summary[f'final_capital_p{p}'] = float(np.percentile(dist['final_capital'], p))
+    for p in PERCENTILES:
+        summary[f'max_drawdown_p{p}'] = float(np.percentile(dist['max_drawdown'], p))
+    return summary
+
+
+def run_monte_carlo(trades: pd.DataFrame, n_paths: int = N_PATHS,
+                    initial_capital: float = INITIAL_CAPITAL, seed: int = SEED) -> pd.DataFrame:
+    """
+    세 가지 방식 모두 실행
+    Returns: 방식별 요약 DataFrame (index=방식)
+    """
+    if len(trades) == 0:
+        raise ValueError("거래 내역이 비어 있습니다")
+    returns = trade_returns(trades, initial_capital)
+
+    rows = {}
+    for i, method in enumerate(METHODS):
+        dist = simulate(returns, initial_capital, method, n_paths, seed + i)
+        rows[method] = summarize(dist, initial_capital)
+    return pd.DataFrame.from_dict(rows, orient='index')
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("사용법: python monte_carlo.py <실행 폴더 | trades.csv> [경로 수]")
+        sys.exit(1)
+    trades_path = Path(sys.argv[1])
+    n_paths = int(sys.argv[2]) if len(sys.argv) > 2 else N_PATHS
+
+    if trades_path.is_dir():
+        # run_store 형식 실행 폴더
+        trades = load_run(trades_path)['trades']
+        output_dir = trades_path
+    else:
+        trades = pd.read_csv(trades_path)
+        output_dir = trades_path.parent
+    print(f"[몬테카를로] {trades_path} ({len(trades)}건, 경로 {n_paths:,}개 x {len(METHODS)}가지 방식)")
+    summary = run_monte_carlo(trades, n_paths)
+
+    print("="*60)
+    print("몬테카를로 분석 결과")
+    print("="*60)
+    for method, row in summary.iterrows():
+        print(f"\n[{method}]")
+        print(f"  최종 자본 평균: {row['final_capital_mean']:.2f} USDT")
+        print("  최종 자본 분위수: " + ", ".join(
+            f"p{p}={row[f'final_capital_p{p}']:.2f}" for p in PERCENTILES))
+        print("  최대 낙폭 분위수: " + ", ".join(
+            f"p{p}={row[f'max_drawdown_p{p}']:.2f}%" for p in PERCENTILES))
+        print(f"  손실 확률: {row['prob_loss']:.2f}%")
+        print(f"  파산 위험 (자본 {RUIN_LEVEL*100:.0f}% 이하): {row['risk_of_ruin']:.2f}%")
+
+    output_path = output_dir / 'monte_carlo.csv'
+    summary.to_csv(output_path, index_label='method', encoding='utf-8-sig')
+    print(f"\n  [저장] 몬테카를로 요약: {output_path.name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+"""
+멀티 심볼 포트폴리오 백테스트 (USDT-M 무기한 선물, 증거금 공유)
+
+- N개 심볼의 리샘플링 봉을 하나의 시간축에 정렬해서 (시간 x 심볼) 2D 배열로 보관
+- 진입 신호/추세 강도는 심볼별로 한 번에 벡터 계산 (generate_signals), 루프는 시간축 1번만 돌고
+  각 시점의 청산/진입/평가손익은 심볼 축 배열 연산으로 처리
+- 포지션 크기는 기존 calculate_position_size 비율(STRONG/WEAK) 사용,
+  열린 포지션 증거금 합계가 자본 x MAX_POSITION_RATIO를 넘지 않도록 포트폴리오 단위로 제한
+- 진입/청산/수수료/슬리피지/펀딩비 규칙은 BinanceETHFuturesBacktest와 동일
+"""
+
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+import binance_eth_futures_backtest as bt
+from binance_eth_futures_backtest import TREND_NAMES, TREND_NONE, BinanceETHFuturesBacktest, load_data
+from ledger import EVENT_FIELDS, TRADE_FIELDS
+
+# ================================
+# 설정
+# ================================
+PORTFOLIO_SYMBOLS = ['ETH', 'BTC', 'SOL', 'BNB', 'XRP']
+CSV_PATTERN = "{symbol}_USDT_1m_3Y.csv"
+
+REQUIRED_COLS = ['ema_fast', 'ema_slow', 'rsi', 'atr', 'volume_ratio']
+
+
+class PortfolioBacktest(BinanceETHFuturesBacktest):
+    """공유 자본 멀티 심볼 백테스트 (결과 생성/저장은 BinanceETHFuturesBacktest 재사용)"""
+
+    trade_fields = (('symbol', 'cat'),) + TRADE_FIELDS
+    event_fields = (('symbol', 'cat'),) + EVENT_FIELDS
+
+    def align(self, frames: Dict[str, pd.DataFrame]) -> Dict:
+        """
+        심볼별 리샘플링 봉 -> 공통 시간축 (T x N) 배열
+        신호는 심볼 자신의 유효 봉 기준으로 계산한 뒤 한 봉 뒤로 밀어서(다음 봉 시가 진입) 정렬
+        """
+        symbols = list(frames.keys())
+        per_symbol = {}
+        for symbol in symbols:
+            df = self.calculate_indicators(frames[symbol]).dropna(subset=REQUIRED_COLS)
+            sig = self.generate_signals(df)
+            per_symbol[symbol] = pd.DataFrame({
+                'open': df['open'], 'high': df['high'], 'low': df['low'], 'close': df['close'],
+                'atr': df['atr'],
+                'enter_long': sig['long'].shift(1, fill_value=False),
+                'enter_short': sig['short'].shift(1, fill_value=False),
+                'trend': sig['trend'],
+                'volume_ratio': sig['volume_ratio'],
+            })
+
+        index = per_symbol[symbols[0]].index
+        for symbol in symbols[1:]:
+            index = index.union(per_symbol[symbol].index)
+
+        arrays = {}
+        for name in ['open', 'high', 'low', 'close', 'atr', 'volume_ratio']:
+            arrays[name] = np.column_stack([
+                per_symbol[s][name].reindex(index).to_numpy(dtype=np.float64) for s in symbols])
+        for name in ['enter_long', 'enter_short']:
+            arrays[name] = np.column_stack([
+                per_symbol[s][name].reindex(index, fill_value=False).to_numpy(dtype=bool) for s in symbols])
+        arrays['trend'] = np.column_stack([
+            per_symbol[s]['trend'].reindex(index, fill_value=TREND_NONE).to_numpy(dtype=np.int8)
+            for s in symbols])
+        arrays['valid'] = np.isfinite(arrays['close'])
+        return {'index': index, 'symbols': symbols, **arrays}
+
+    def run_portfolio(self, frames: Dict[str, pd.DataFrame], verbose: bool = True) -> Dict:
+        """포트폴리오 백테스트 실행 (frames: 심볼 -> load_data() 결과)"""
+        log = print if verbose else bt._silent
+        symbols_sorted = sorted(frames)
+        self._record_run_inputs([frames[sym] for sym in symbols_sorted], {'symbols': symbols_sorted},
+                                (Path(__file__).resolve(),))
+        data = self.align(frames)
+        index, symbols = data['index'], data['symbols']
+        T, N = data['close'].shape
+        log(f"[포트폴리오] {N}개 심볼 x {T:,}개 봉 ({index[0]} ~ {index[-1]})")
+
+        times = index.values.astype('datetime64[ns]')
+        opens, highs, lows, closes = data['open'], data['high'], data['low'], data['close']
+        valid = data['valid']
+        enter_any = data['enter_long'] | data['enter_short']
+        signal_steps = enter_any.any(axis=1)
+
+        self._reset_book(N)
+        side, entry_price, remaining = self.side, self.entry_price, self.remaining
+        stop_loss, take_profit, partial_tp = self.stop_loss, self.take_profit, self.partial_tp
+        partial_taken = self.partial_taken
+        last_close = np.full(N, np.nan)
+
+        equity_curve = np.empty(T)
+        exposure_curve = np.zeros(T)
+        for t in range(T):
+            bar_valid = valid[t]
+            last_close = np.where(bar_valid, closes[t], last_close)
+            is_open = side != 0
+
+            if not is_open.any() and not signal_steps[t]:
+                equity_curve[t] = self.capital
+                continue
+
+            # 1) 청산 확인 (봉 시작 시점에 열려 있던 포지션만, 손절 > 부분 익절 > 익절 우선순위)
+            check = is_open & bar_valid
+            if check.any():
+                h, l = highs[t], lows[t]
+                is_long = side == 1
+                stop_hit = check & np.where(is_long, l <= stop_loss, h >= stop_loss)
+                partial_hit = check & ~stop_hit & ~partial_taken \
+                    & np.where(is_long, h >= partial_tp, l <= partial_tp)
+                tp_hit = check & ~stop_hit & ~partial_hit & np.where(is_long, h >= take_profit, l <= take_profit)
+
+                for j in np.flatnonzero(stop_hit | partial_hit | tp_hit):
+                    if stop_hit[j]:
+                        self._close(j, symbols[j], times[t], stop_loss[j], "STOP_LOSS", False)
+                    elif partial_hit[j]:
+                        self._close(j, symbols[j], times[t], partial_tp[j], "PARTIAL_TAKE_PROFIT", True)
+                    else:
+                        self._close(j, symbols[j], times[t], take_profit[j], "TAKE_PROFIT", False)
+
+            # 2) 진입 (봉 시작 시점에 포지션이 없던 심볼만)
+            candidates = ~is_open & bar_valid & enter_any[t]
+            if candidates.any():
+                trend_now = data['trend'][t]
+                # 강한 추세 우선, 같은 강도면 거래량 비율 높은 순
+                order = sorted(np.flatnonzero(candidates),
+                               key=lambda j: (-int(trend_now[j]), -data['volume_ratio'][t, j]))
+                for j in order:
+                    direction = "long" if data['enter_long'][t, j] else "short"
+                    self._open(j, symbols[j], times[t], direction, opens[t, j], data['atr'][t, j],
+                               int(trend_now[j]), data['volume_ratio'][t, j])
+
+            # 3) 자산 평가 (미실현 손익 포함)
+            open_now = side != 0
+            if open_now.any():
+                unrealized = np.where(side == 1, last_close - entry_price, entry_price - last_close) * remaining
+                equity_curve[t] = self.capital + unrealized[open_now].sum()
+                exposure_curve[t] = (np.where(side == 1, remaining, -remaining) * last_close)[open_now].sum()
+            else:
+                equity_curve[t] = self.capital
+
+        # 심볼이 섞인 이벤트 장부로는 봉별 재구성을 할 수 없어서 루프에서 기록한 곡선을 그대로 사용
+        self.equity_curve = equity_curve
+        self.exposure_curve = exposure_curve
+        self.bar_times = times
+        log(f"[포트폴리오] 완료 (총 거래: {len(self.trades)}건)")
+        return self._generate_results()
+
+    def _reset_book(self, n: int):
+        """심볼별 포지션 상태 배열 (side: +1 롱 / -1 숏 / 0 없음)"""
+        self.side = np.zeros(n, dtype=np.int8)
+        self.entry_price = np.zeros(n)
+        self.quantity = np.zeros(n)
+        self.remaining = np.zeros(n)
+        self.stop_loss = np.zeros(n)
+        self.take_profit = np.zeros(n)
+        self.partial_tp = np.zeros(n)
+        self.partial_taken = np.zeros(n, dtype=bool)
+        self.capital_used = np.zeros(n)
+        self.entry_time = np.zeros(n, dtype='datetime64[ns]')
+        self.trend_at_entry = np.zeros(n, dtype=np.int8)
+        self.vr_at_entry = np.zeros(n)
+
+    def _open(self, j, symbol, time, direction, price, atr, trend, volume_ratio):
+        """심볼 j 진입 (포트폴리오 증거금 한도 적용)"""
+        if trend == TREND_NONE:
+            return
+        if not np.isfinite(atr) or atr <= 0:
+            return
+
+        qty, used = self.calculate_position_size(price, TREND_NAMES[trend])
+        budget = self.capital * bt.MAX_POSITION_RATIO - self.capital_used[self.side != 0].sum()
+        if budget <= 0 or qty <= 0:
+            return
+        if used > budget:
+            qty *= budget / used
+            used = budget
+
+        fill_price = self.apply_slippage(price, direction)
+        fee = self.calculate_fee(fill_price, qty)
+        sign = 1 if direction == "long" else -1
+
+        self.side[j] = sign
+        self.entry_price[j] = fill_price
+        self.quantity[j] = qty
+        self.remaining[j] = qty
+        self.stop_loss[j] = fill_price - sign * atr * bt.STOP_LOSS_ATR_MULT
+        self.take_profit[j] = fill_price + sign * atr * bt.TAKE_PROFIT_ATR_MULT
+        self.partial_tp[j] = fill_price + sign * atr * bt.PARTIAL_TAKE_PROFIT_ATR_MULT
+        self.partial_taken[j] = False
+        self.capital_used[j] = used
+        self.entry_time[j] = time
+        self.trend_at_entry[j] = trend
+        self.vr_at_entry[j] = volume_ratio
+
+        self.capital -= fee
+        self.events.append(
+            timestamp=pd.Timestamp(time),
+            symbol=symbol,
+            event_type='ENTRY',
+            side=direction,
+            price=fill_price,
+            quantity=qty,
+            trend_strength=TREND_NAMES[trend],
+            volume_ratio=volume_ratio,
+            capital_used=used,
+            stop_loss=self.stop_loss[j],
+            take_profit=self.take_profit[j],
+            fee=fee,
+            capital_after=self.capital,
+        )
+
+    def _close(self, j, symbol, time, exit_price, exit_reason, is_partial):
+        """심볼 j 청산 (exit_position과 같은 손익/수수료/펀딩비 계산)"""
+        pos_side = "long" if self.side[j] == 1 else "short"
+        entry_price = self.entry_price
+        fill_price = self.apply_slippage(exit_price, "sell" if pos_side == "long" else "buy")
+
+        if is_partial:
+            exit_quantity = self.quantity[j] * bt.PARTIAL_TAKE_PROFIT_RATIO
+            self.remaining[j] = self.quantity[j] - exit_quantity
+            self.partial_taken[j] = True
+            used = self.capital_used[j] * bt.PARTIAL_TAKE_PROFIT_RATIO
+        else:
+            exit_quantity = self.remaining[j]
+            used = self.capital_used[j]
+
+        if pos_side == "long":
+            gross_pnl = (fill_price - entry_price[j]) * exit_quantity
+        else:
+            gross_pnl = (entry_price[j] - fill_price) * exit_quantity
+        exit_fee = self.calculate_fee(fill_price, exit_quantity)
+
+        holding_hours = (time - self.entry_time[j]) / np.timedelta64(1, 'h')
+        funding_cost = used * bt.FUNDING_RATE * int(holding_hours / 8)
+        if pos_side == "short":
+            funding_cost = -funding_cost
+
+        net_pnl = gross_pnl - exit_fee - funding_cost
+        self.capital += net_pnl
+        self.total_funding_cost += funding_cost
+
+        self.trades.append(
+            symbol=symbol,
+            entry_time=pd.Timestamp(self.entry_time[j]),
+            exit_time=pd.Timestamp(time),
+            side=pos_side,
+            entry_price=entry_price[j],
+            exit_price=fill_price,
+            quantity=exit_quantity,
+            gross_pnl=gross_pnl,
+            entry_fee=used * bt.FEE_RATE,
+            exit_fee=exit_fee,
+            funding_cost=funding_cost,
+            net_pnl=net_pnl,
+            return_pct=(net_pnl / used) * 100 if used > 0 else 0,
+            trend_strength=TREND_NAMES.get(int(self.trend_at_entry[j]), "NONE"),
+            volume_ratio_entry=self.vr_at_entry[j],
+            exit_reason=exit_reason,
+            holding_hours=holding_hours,
+            capital_before=self.capital - net_pnl,
+            capital_after=self.capital,
+        )
+        self.events.append(
+            timestamp=pd.Timestamp(time),
+            symbol=symbol,
+            event_type='PARTIAL_EXIT' if is_partial else 'EXIT',
+            side=pos_side,
+            price=fill_price,
+            quantity=exit_quantity,
+            exit_reason=exit_reason,
+            gross_pnl=gross_pnl,
+            net_pnl=net_pnl,
+            funding_cost=funding_cost,
+            capital_after=self.capital,
+        )
+
+        # 부분 익절 후에도 capital_used는 유지 (exit_position과 동일: 남은 물량 청산 시 펀딩비 기준)
+        if not is_partial:
+            self.side[j] = 0
+            self.remaining[j] = 0.0
+            self.capital_used[j] = 0.0
+
+
+def load_universe(symbols: List[str], months: int = 0) -> Dict[str, pd.DataFrame]:
+    """심볼별 1분봉 CSV 로드 + 리샘플링 (없는 파일은 건너뜀)"""
+    frames = {}
+    for symbol in symbols:
+        csv_path = Path(__file__).parent / CSV_PATTERN.format(symbol=symbol)
+        if not csv_path.exists():
+            print(f"경고: {csv_path.name} 파일이 없습니다. {symbol} 제외")
+            continue
+        frames[symbol] = load_data(str(csv_path), months=months)
+    return frames
+
+
+def main():
+    frames = load_universe(PORTFOLIO_SYMBOLS, months=bt.TEST_MONTHS)
+    if not frames:
+        print("오류: 로드된 심볼이 없습니다.")
+        return
+
+    backtest = PortfolioBacktest()
+    results = backtest.run_portfolio(frames)
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_dir = Path(__file__).parent / bt.OUTPUT_DIR / f"{timestamp}_portfolio"
+    print(f"\n[포트폴리오 결과 저장 중...]")
+    backtest.save_results(output_dir, results)
+
+    print(f"\n총 거래 수: {results['total_trades']}건")
+    print(f"최종 자본: {results['final_capital']:.2f} USDT")
+    print(f"총 수익률: {results['total_return_pct']:.2f}%")
+    print(f"최대 낙폭: {results['max_drawdown']:.2f}%")
+    if results['total_trades'] > 0:
+        trades_df = backtest.trades.to_frame()
+        print("\n심볼별 순손익:")
+        print(trades_df.groupby('symbol')['net_pnl'].agg(['count', 'sum']).to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+백테스트 단계별 프로파일링 (선택 사항)
+
+- Profiler.span(name): 구간 누적 시간/호출 수 ('/'로 계층 구분, 예: 'backtest/exit_check')
+- Profiler.count(name): 이벤트 수 (진입/청산/부분 익절/거부된 신호 등) -> 벽시계 초당 횟수도 함께 기록
+- dump(): 기계 판독용 JSON, cprofile=True면 cProfile 통계(.prof)도 저장
+  .prof는 snakeviz / flameprof / gprof2dot 등으로 플레임그래프 변환 가능
+- 프로파일링을 끄면 NULL_PROFILER (아무것도 하지 않음)를 사용하므로 백테스트 코드는 분기 없이 호출
+"""
+
+import cProfile
+import json
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Dict, Optional
+
+
+class Profiler:
+    """구간 시간 + 이벤트 카운터"""
+
+    enabled = True
+
+    def __init__(self, cprofile: bool = False):
+        self.spans: Dict[str, Dict[str, float]] = {}
+        self.counters: Dict[str, int] = {}
+        self._cprofile = cProfile.Profile() if cprofile else None
+        self._started = time.perf_counter()
+        if self._cprofile is not None:
+            self._cprofile.enable()
+
+    def add(self, name: str, seconds: float, calls: int = 1):
+        """구간 시간 직접 누적 (생성기처럼 with 문으로 감싸기 어려운 구간용)"""
+        span = self.spans.setdefault(name, {'seconds': 0.0, 'calls': 0})
+        span['seconds'] += seconds
+        span['calls'] += calls
+
+    @contextmanager
+    def span(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def count(self, name: str, n: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def stop(self):
+        """cProfile 수집 종료 (dump 전에 자동 호출)"""
+        if self._cprofile is not None:
+            self._cprofile.disable()
+
+    def report(self) -> Dict:
+        wall = time.perf_counter() - self._started
+        return {
+            'wall_seconds': wall,
+            'spans': {
+                name: {
+                    'seconds': span['seconds'],
+                    'calls': span['calls'],
+                    'share_pct': span['seconds'] / wall * 100 if wall > 0 else 0.0,
+                }
+                for name, span in sorted(self.spans.items())
+            },
+            'counters': {
+                name: {'count': count, 'per_second': count / wall if wall > 0 else 0.0}
+                for name, count in sorted(self.counters.items())
+            },
+        }
+
+    def dump(self, output_dir: Path, name: str = 'profile') -> Dict:
+        """output_dir/<name>.json (+ <name>.prof) 저장"""
+        self.stop()
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        report = self.report()
+        with open(output_dir / f'{name}.json', 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        if self._cprofile is not None:
+            self._cprofile.dump_stats(str(output_dir / f'{name}.prof'))
+        return report
+
+    def print_summary(self, top: Optional[int] = None):
+        report = self.report()
+        print(f"\n[프로파일] 전체 {report['wall_seconds']:.2f}초")
+        spans = sorted(report['spans'].items(), key=lambda item: -item[1]['seconds'])
+        for name, span in spans[:top]:
+            print(f"  {name:<28} {span['seconds']:>9.3f}s {span['share_pct']:>6.1f}%  ({span['calls']:,}회)")
+        for name, counter in report['counters'].items():
+            print(f"  {name:<28} {counter['count']:>9,}회  ({counter['per_second']:.1f}/초)")
+
+
+class NullProfiler:
+    """프로파일링 끔: 모든 호출이 아무것도 하지 않음"""
+
+    enabled = False
+    _null = nullcontext()
+
+    def add(self, name: str, seconds: float, calls: int = 1):
+        pass
+
+    def span(self, name: str):
+        return self._null
+
+    def count(self, name: str, n: int = 1):
+        pass
+
+
+NULL_PROFILER = NullProfiler()
@@ -0,0 +1,144 @@
+"""
+백테스트 실행 캐시 (같은 입력의 run_backtest 결과를 디스크에 보관하고 재사용)
+
+- 키 = run_store.run_key (봉 데이터 + 전략/엔진 상수 + 백테스트 코드 해시)
+  봉 내부 체결 판별(exit_resolver)을 쓰면 판별기 종류와 1분봉/aggTrades 해시도 run_key에 포함
+- 값 = 결과 dict + 실행 후 상태 (자본, 남은 포지션, 펀딩비, 거래/이벤트 장부, 자산/노출 곡선, 봉 시각)
+  적중하면 시뮬레이션 없이 상태를 복원하므로 save_results/equity_frame도 그대로 사용 가능
+- 용량 관리: 최근 사용 순(LRU). 적중하면 파일 수정 시각을 갱신하고,
+  전체 크기가 max_bytes를 넘으면 오래 안 쓴 파일부터 max_bytes의 EVICT_TO 비율까지 삭제
+- 여러 프로세스(스윕 워커)가 같은 디렉터리를 써도 됨 (임시 파일 후 교체, 삭제 경합은 무시)
+  크기는 프로세스마다 따로 세므로 잠깐 max_bytes를 넘을 수 있음 (넘은 프로세스가 다시 세어서 정리)
+
+사용법:
+    cache = RunCache()                                      # .run_cache/, 최대 MAX_CACHE_BYTES
+    backtest = bt.BinanceETHFuturesBacktest(cache=cache)    # 같은 입력이면 저장된 결과 반환
+
+    python run_cache.py info               # 파일 수/크기
+    python run_cache.py prune --max-mb=500 # 500MB까지 오래 안 쓴 것부터 삭제
+    python run_cache.py clear
+"""
+
+import os
+import pickle
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+RUN_CACHE_DIR = Path(__file__).parent / '.run_cache'
+MAX_CACHE_BYTES = 2 << 30  # 2GB
+EVICT_TO = 0.8
+FORMAT_VERSION = 1
+
+
+class RunCache:
+    """run_backtest 결과 캐시 (키 -> 실행 후 상태 dict)"""
+
+    def __init__(self, root: Path = RUN_CACHE_DIR, max_bytes: int = MAX_CACHE_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._size: Optional[int] = None  # 첫 저장 때 디렉터리를 훑어서 계산
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.pkl"
+
+    def get(self, key: str) -> Optional[Dict]:
+        """저장된 상태 (없거나 읽을 수 없으면 None)"""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                entry = pickle.load(f)
+        except FileNotFoundError:
+            entry = None
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            path.unlink(missing_ok=True)  # 형식이 맞지 않는 파일은 지우고 다시 계산
+            entry = None
+        if entry is None or entry.get('format') != FORMAT_VERSION or entry.get('key') != key:
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)  # 최근 사용 시각 (LRU)
+        except FileNotFoundError:
+            pass
+        self.hits += 1
+        return entry['state']
+
+    def put(self, key: str, state: Dict):
+        """상태 저장 (임시 파일 후 교체), 용량을 넘으면 오래 안 쓴 것부터 삭제"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp_path = path.with_name(f".{path.stem}.{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({'format': FORMAT_VERSION, 'key': key, 'state': state}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self.entries())
+        self._size += tmp_path.stat().st_size
+        os.replace(tmp_path, path)
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def entries(self) -> List[Tuple[Path, int, float]]:
+        """(경로, 크기, 최근 사용 시각) 목록, 오래 안 쓴 순"""
+        out = []
+        for path in self.root.glob('*.pkl') if self.root.exists() else []:
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            out.append((path, stat.st_size, stat.st_mtime))
+        return sorted(out, key=lambda entry: entry[2])
+
+    def evict(self, max_bytes: Optional[int] = None) -> int:
+        """전체 크기를 (max_bytes x EVICT_TO) 이하로 줄임 -> 삭제한 파일 수"""
+        limit = (self.max_bytes if max_bytes is None else max_bytes) * EVICT_TO
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for path, size, _ in entries:
+            if total <= limit:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        self._size = total
+        return removed
+
+    def clear(self) -> int:
+        removed = 0
+        for path, _, _ in self.entries():
+            path.unlink(missing_ok=True)
+            removed += 1
+        self._size = 0
+        return removed
+
+
+def main():
+    args = sys.argv[1:]
+    if not args or args[0] not in ('info', 'prune', 'clear'):
+        print(__doc__)
+        return
+    cache = RunCache()
+    command = args[0]
+
+    if command == 'clear':
+        print(f"[실행 캐시] {cache.clear()}개 삭제: {cache.root}")
+        return
+    if command == 'prune':
+        max_mb = next((float(a.split('=', 1)[1]) for a in args if a.startswith('--max-mb=')),
+                      MAX_CACHE_BYTES / 2**20)
+        print(f"[실행 캐시] {cache.evict(int(max_mb * 2**20 / EVICT_TO))}개 삭제")
+
+    entries = cache.entries()
+    total = sum(size for _, size, _ in entries)
+    print(f"[실행 캐시] {cache.root}: {len(entries):,}개, {total / 2**20:.1f}MB "
+          f"(최대 {cache.max_bytes / 2**20:.0f}MB)")
+    if entries:
+        print(f"  가장 오래 안 쓴 항목: {time.strftime('%Y-%m-%d %H:%M', time.localtime(entries[0][2]))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,323 @@
+"""
+백테스트 실행 카탈로그 (SQLite)
+
+- save_results가 실행마다 한 줄씩 기록: 실행 폴더, 저장 키, 데이터 구간, 코드 버전(소스 해시 + git 커밋),
+  설정/전략 상수(p_<이름> 컬럼), _generate_results의 모든 성과 지표(지표 이름 그대로 컬럼)
+- 새 상수/지표가 생기면 컬럼을 자동으로 추가
+- 주요 지표 컬럼에 인덱스가 있어서 수천 개 실행 중 최고 성과 조회도 쿼리 한 번
+- 카탈로그 파일/스키마는 기록(record_run, reindex)할 때만 생성. 조회는 읽기 전용으로 열고
+  카탈로그가 없으면 빈 결과 (get_run은 reindex 안내와 함께 KeyError)
+
+사용법:
+    python run_catalog.py list [개수]                       # 최근 실행
+    python run_catalog.py best [지표] [개수] ["SQL 조건"]    # 지표 기준 상위 (기본 total_return_pct)
+    python run_catalog.py filter "SQL 조건" [개수]          # 예: "p_ADX_STRONG_THRESHOLD = 30 AND total_trades >= 50"
+    python run_catalog.py diff <실행 A> <실행 B>            # 실행 id 또는 폴더 이름
+    python run_catalog.py reindex                          # 기존 실행 폴더(run.json / 예전 summary.txt) 다시 등록
+"""
+
+import json
+import re
+import sqlite3
+import subprocess
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+import pandas as pd
+
+CATALOG_FILE = 'catalog.sqlite'
+PARAM_PREFIX = 'p_'
+INDEXED_METRICS = ('total_return_pct', 'max_drawdown', 'profit_factor', 'win_rate', 'total_trades')
+LIST_COLUMNS = ['id', 'run_dir', 'created_at', 'data_from', 'data_to', 'total_trades',
+                'total_return_pct', 'max_drawdown', 'win_rate', 'profit_factor']
+
+BASE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    run_dir TEXT NOT NULL UNIQUE,
+    run_key TEXT,
+    created_at TEXT,
+    data_from TEXT,
+    data_to TEXT,
+    bars INTEGER,
+    code_version TEXT,
+    git_commit TEXT,
+    config TEXT
+)
+"""
+
+# 예전 summary.txt 항목 -> 지표 이름 (reindex에서 run.json이 없는 폴더용)
+LEGACY_SUMMARY_FIELDS = {
+    '최종 자본': 'final_capital',
+    '총 수익': 'total_return',
+    '총 수익률': 'total_return_pct',
+    '총 거래 수': 'total_trades',
+    '승리 거래': 'winning_trades',
+    '손실 거래': 'losing_trades',
+    '승률': 'win_rate',
+    '평균 수익': 'avg_win',
+    '평균 손실': 'avg_loss',
+    '손익비 (평균 수익/평균 손실)': 'risk_reward_ratio',
+    '최대 수익 거래': 'max_win',
+    '최대 손실 거래': 'max_loss',
+    '수익 팩터': 'profit_factor',
+    '최대 낙폭': 'max_drawdown',
+    '손절 거래': 'stop_loss_trades',
+    '익절 거래': 'take_profit_trades',
+    '총 펀딩비': 'total_funding_cost',
+}
+_NUMBER = re.compile(r'-?\d+(?:\.\d+)?')
+
+
+# ================================
+# 연결/스키마
+# ================================
+def catalog_path(results_root: Union[str, Path]) -> Path:
+    return Path(results_root) / CATALOG_FILE
+
+
+def connect(results_root: Union[str, Path]) -> sqlite3.Connection:
+    """기록용 카탈로그 연결 (없으면 생성). 여러 프로세스가 동시에 기록할 수 있도록 대기 시간 설정"""
+    Path(results_root).mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(catalog_path(results_root), timeout=30)
+    conn.execute(BASE_SCHEMA)
+    for metric in INDEXED_METRICS:
+        _ensure_column(conn, metric, 'REAL')
+        conn.execute(f'CREATE INDEX IF NOT EXISTS idx_runs_{metric} ON runs("{metric}")')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_runs_run_key ON runs(run_key)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_runs_created_at ON runs(created_at)')
+    return conn
+
+
+def connect_readonly(results_root: Union[str, Path]) -> Optional[sqlite3.Connection]:
+    """조회용 읽기 전용 연결 (파일/스키마를 만들지 않음). 카탈로그가 없으면 None"""
+    path = catalog_path(results_root)
+    if not path.exists():
+        return None
+    return sqlite3.connect(f'{path.resolve().as_uri()}?mode=ro', uri=True, timeout=30)
+
+
+def _columns(conn: sqlite3.Connection) -> set:
+    return {row[1] for row in conn.execute('PRAGMA table_info(runs)')}
+
+
+def _ensure_column(conn: sqlite3.Connection, name: str, sql_type: str, existing: Optional[set] = None):
+    existing = _columns(conn) if existing is None else existing
+    if name not in existing:
+        conn.execute(f'ALTER TABLE runs ADD COLUMN "{name}" {sql_type}')
+        existing.add(name)
+
+
+def _sql_type(value) -> Optional[str]:
+    if isinstance(value, bool):
+        return 'INTEGER'
+    if isinstance(value, (int, float)):
+        return 'REAL'
+    if isinstance(value, str):
+        return 'TEXT'
+    return None
+
+
+@lru_cache(maxsize=None)
+def git_commit(path: str) -> Optional[str]:
+    """path가 속한 git 저장소의 현재 커밋 (git이 없으면 None)"""
+    try:
+        out = subprocess.run(['git', '-C', path, 'rev-parse', '--short', 'HEAD'],
+                             capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+# ================================
+# 기록
+# ================================
+def record_run(output_dir: Union[str, Path], run_key: Optional[str], results: Dict, meta: Optional[Dict] = None,
+               created_at: Optional[str] = None) -> int:
+    """
+    실행 1건 등록 (같은 실행 폴더가 이미 있으면 덮어씀)
+    output_dir의 상위 폴더(결과 루트)에 catalog.sqlite 생성
+    Returns: 실행 id
+    """
+    output_dir = Path(output_dir)
+    meta = meta or {}
+    config = meta.get('config', {})
+
+    row = {
+        'run_dir': output_dir.name,
+        'run_key': run_key,
+        'created_at': created_at or pd.Timestamp.now().isoformat(timespec='seconds'),
+        'data_from': meta.get('data_from'),
+        'data_to': meta.get('data_to'),
+        'bars': meta.get('bars'),
+        'code_version': meta.get('code_version'),
+        'git_commit': meta.get('git_commit', git_commit(str(Path(__file__).resolve().parent))),
+        'config': json.dumps(config, sort_keys=True, default=str),
+    }
+    for name, value in config.items():
+        row[PARAM_PREFIX + name] = value
+    for name, value in results.items():
+        row[name] = value.item() if hasattr(value, 'item') else value
+
+    conn = connect(output_dir.parent)
+    try:
+        with conn:
+            existing = _columns(conn)
+            for name, value in row.items():
+                sql_type = _sql_type(value)
+                if sql_type is not None:
+                    _ensure_column(conn, name, sql_type, existing)
+            row = {k: v for k, v in row.items() if v is None or _sql_type(v) is not None}
+            names = ', '.join(f'"{k}"' for k in row)
+            placeholders = ', '.join('?' for _ in row)
+            conn.execute('DELETE FROM runs WHERE run_dir = ?', (row['run_dir'],))
+            cursor = conn.execute(f'INSERT INTO runs ({names}) VALUES ({placeholders})', list(row.values()))
+            return cursor.lastrowid
+    finally:
+        conn.close()
+
+
+def _parse_legacy_summary(path: Path) -> Dict[str, float]:
+    """예전 summary.txt에서 지표 추출"""
+    results = {}
+    for line in path.read_text(encoding='utf-8').splitlines():
+        label, sep, value = line.partition(':')
+        name = LEGACY_SUMMARY_FIELDS.get(label.strip())
+        match = _NUMBER.search(value) if sep else None
+        if name and match:
+            results[name] = float(match.group())
+    return results
+
+
+def reindex(results_root: Union[str, Path]) -> int:
+    """결과 루트 아래 모든 실행 폴더 등록 (run.json 우선, 없으면 summary.txt 파싱)"""
+    count = 0
+    for run_dir in sorted(p for p in Path(results_root).iterdir() if p.is_dir()):
+        run_file = run_dir / 'run.json'
+        if run_file.exists():
+            with open(run_file, encoding='utf-8') as f:
+                info = json.load(f)
+            record_run(run_dir, info.get('key'), info.get('results', {}), info.get('meta', {}),
+                       created_at=info.get('created_at'))
+        elif (run_dir / 'summary.txt').exists():
+            results = _parse_legacy_summary(run_dir / 'summary.txt')
+            if not results:
+                continue
+            record_run(run_dir, None, results, {'git_commit': None}, created_at=_legacy_created_at(run_dir.name))
+        else:
+            continue
+        count += 1
+    return count
+
+
+def _legacy_created_at(name: str) -> Optional[str]:
+    """'20260105_142932_backtest' 같은 폴더 이름에서 실행 시각 추출"""
+    try:
+        return pd.Timestamp(pd.to_datetime(name[:15], format='%Y%m%d_%H%M%S')).isoformat()
+    except ValueError:
+        return None
+
+
+# ================================
+# 조회
+# ================================
+def query(results_root: Union[str, Path], where: Optional[str] = None, order_by: str = 'created_at',
+          descending: bool = True, limit: Optional[int] = None, columns: Optional[list] = None) -> pd.DataFrame:
+    """
+    조건/정렬 조회 (where는 SQL 조건식, 파라미터 컬럼은 p_<상수 이름>)
+    카탈로그가 없거나 아직 실행이 등록되지 않았으면 빈 DataFrame
+    """
+    conn = connect_readonly(results_root)
+    if conn is None:
+        return pd.DataFrame(columns=columns or LIST_COLUMNS)
+    try:
+        available = _columns(conn)
+        if not available:
+            return pd.DataFrame(columns=columns or LIST_COLUMNS)
+        if order_by not in available:
+            raise KeyError(f"카탈로그에 없는 컬럼: {order_by}")
+        select = ', '.join(f'"{c}"' for c in columns if c in available) if columns else '*'
+        sql = f'SELECT {select} FROM runs'
+        if where:
+            sql += f' WHERE {where}'
+        sql += f' ORDER BY "{order_by}" {"DESC" if descending else "ASC"}'
+        if limit:
+            sql += f' LIMIT {int(limit)}'
+        return pd.read_sql_query(sql, conn)
+    finally:
+        conn.close()
+
+
+def best(results_root: Union[str, Path], metric: str = 'total_return_pct', limit: int = 10,
+         where: Optional[str] = None) -> pd.DataFrame:
+    """지표 기준 상위 실행 (max_drawdown은 작을수록 좋음, 지표가 없는 실행은 제외)"""
+    condition = f'"{metric}" IS NOT NULL' + (f' AND ({where})' if where else '')
+    return query(results_root, condition, order_by=metric, descending=metric != 'max_drawdown', limit=limit)
+
+
+def get_run(results_root: Union[str, Path], run: Union[int, str]) -> pd.Series:
+    """실행 id 또는 폴더 이름으로 한 건 조회"""
+    run = str(run)
+    where = f'id = {int(run)}' if run.isdigit() else "run_dir = '{}'".format(Path(run).name.replace("'", "''"))
+    found = query(results_root, where, limit=1)
+    if len(found) == 0:
+        raise KeyError(f"카탈로그에 없는 실행: {run} ('python run_catalog.py reindex'로 기존 결과를 등록할 수 있음)")
+    return found.iloc[0]
+
+
+def diff(results_root: Union[str, Path], run_a: Union[int, str], run_b: Union[int, str]) -> pd.DataFrame:
+    """두 실행의 값이 다른 항목 (파라미터, 데이터 구간, 지표)"""
+    a = get_run(results_root, run_a)
+    b = get_run(results_root, run_b)
+    rows = []
+    for name in a.index:
+        if name in ('id', 'run_dir', 'config', 'created_at'):
+            continue
+        va, vb = a[name], b[name]
+        if pd.isna(va) and pd.isna(vb):
+            continue
+        if va == vb:
+            continue
+        delta = vb - va if isinstance(va, float) and isinstance(vb, float) else None
+        rows.append({'field': name, 'a': va, 'b': vb, 'delta': delta})
+    return pd.DataFrame(rows, columns=['field', 'a', 'b', 'delta'])
+
+
+def main():
+    from binance_eth_futures_backtest import OUTPUT_DIR
+    root = Path(__file__).parent / OUTPUT_DIR
+    args = sys.argv[1:]
+    command = args[0] if args else 'list'
+
+    pd.set_option('display.width', 200)
+    pd.set_option('display.max_columns', 20)
+
+    if command != 'reindex' and not catalog_path(root).exists():
+        print(f"카탈로그가 없습니다: {catalog_path(root)}\n"
+              f"'python run_catalog.py reindex'로 기존 결과를 등록하거나 백테스트를 먼저 실행하세요.")
+        sys.exit(1)
+
+    if command == 'list':
+        limit = int(args[1]) if len(args) > 1 else 20
+        print(query(root, limit=limit, columns=LIST_COLUMNS).to_string(index=False))
+    elif command == 'best':
+        metric = args[1] if len(args) > 1 else 'total_return_pct'
+        limit = int(args[2]) if len(args) > 2 else 10
+        where = args[3] if len(args) > 3 else None
+        print(best(root, metric, limit, where)[LIST_COLUMNS].to_string(index=False))
+    elif command == 'filter' and len(args) > 1:
+        limit = int(args[2]) if len(args) > 2 else None
+        print(query(root, args[1], limit=limit, columns=LIST_COLUMNS).to_string(index=False))
+    elif command == 'diff' and len(args) > 2:
+        print(diff(root, args[1], args[2]).to_string(index=False))
+    elif command == 'reindex':
+        print(f"[카탈로그] {reindex(root)}개 실행 등록: {catalog_path(root)}")
+    else:
+        print(__doc__)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+백테스트 결과 저장소 (압축 바이너리 + 내용 주소 기반 중복 제거)
+
+- 거래 내역/이벤트/자산 곡선을 컬럼별 배열로 압축 저장 (npz)
+  자산 곡선은 float32 (30 USDT 기준 오차 1e-5 USDT 미만), 거래/이벤트 숫자는 float64 그대로
+  문자열 컬럼은 코드 + 범주 배열, 시각 컬럼은 int64 ns
+- 저장 키 = 입력(봉 데이터 + 설정 상수 + 백테스트 코드)의 해시
+  입력이 같은 재실행은 objects/<key>.npz 하나만 쓰고 실행 폴더에는 run.json(키 + 요약)만 남김
+- CSV는 필요할 때만 내보냄: python run_store.py export <실행 폴더>
+
+디렉터리 구조:
+    backtest_results/
+        objects/<key>.npz          # 실제 데이터 (입력이 같으면 공유)
+        <실행 폴더>/run.json        # 키, 성과 요약, 데이터 구간
+        <실행 폴더>/summary.txt
+"""
+
+import hashlib
+import json
+import os
+import sys
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+OBJECTS_DIR = 'objects'
+RUN_FILE = 'run.json'
+FORMAT_VERSION = 1
+TABLES = ('trades', 'events')
+
+
+# ================================
+# 키 계산
+# ================================
+@lru_cache(maxsize=None)
+def code_version(paths: tuple) -> str:
+    """백테스트 결과에 영향을 주는 소스 파일들의 해시 (앞 12자리)"""
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(Path(path).read_bytes())
+    return digest.hexdigest()[:12]
+
+
+def run_key(frames: Iterable[pd.DataFrame], config: Dict, code: str) -> str:
+    """
+    입력 내용 해시
+    frames: 백테스트에 넣은 봉 데이터 (컬럼 이름/값/인덱스 모두 포함, 지표가 미리 계산돼 있으면 지표도 포함)
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps({'config': config, 'code': code, 'format': FORMAT_VERSION},
+                             sort_keys=True, default=str).encode())
+    for df in frames:
+        digest.update(json.dumps([str(c) for c in df.columns]).encode())
+        digest.update(np.ascontiguousarray(df.index.values.astype('datetime64[ns]').view(np.int64)).data)
+        digest.update(np.ascontiguousarray(df.to_numpy(dtype=np.float64)).data)
+    return digest.hexdigest()[:24]
+
+
+# ================================
+# 테이블 인코딩
+# ================================
+def _encode_table(name: str, df: pd.DataFrame, arrays: Dict[str, np.ndarray]) -> List[List[str]]:
+    """DataFrame -> 컬럼별 배열 (arrays에 추가), 스키마 [(컬럼, 종류)] 반환"""
+    schema = []
+    for col in df.columns:
+        series = df[col]
+        key = f"{name}/{col}"
+        if pd.api.types.is_datetime64_any_dtype(series):
+            arrays[key] = series.values.astype('datetime64[ns]').view(np.int64)
+            kind = 'datetime'
+        elif isinstance(series.dtype, pd.CategoricalDtype):
+            arrays[key] = series.cat.codes.to_numpy(dtype=np.int16)
+            arrays[f"{key}#categories"] = np.asarray(series.cat.categories.astype(str), dtype=str)
+            kind = 'category'
+        elif pd.api.types.is_bool_dtype(series):
+            arrays[key] = series.to_numpy(dtype=bool)
+            kind = 'bool'
+        elif pd.api.types.is_numeric_dtype(series):
+            arrays[key] = series.to_numpy()
+            kind = 'numeric'
+        else:
+            # 문자열/혼합 타입: 범주 코드 (결측은 -1)
+            values = series.map(lambda v: None if v is None or (isinstance(v, float) and np.isnan(v)) else str(v))
+            cat = pd.Categorical(values)
+            arrays[key] = cat.codes.astype(np.int16)
+            arrays[f"{key}#categories"] = np.asarray(cat.categories, dtype=str)
+            kind = 'category'
+        schema.append([col, kind])
+    return schema
+
+
+def _decode_table(name: str, schema: List[List[str]], data) -> pd.DataFrame:
+    columns = {}
+    for col, kind in schema:
+        values = data[f"{name}/{col}"]
+        if kind == 'datetime':
+            columns[col] = pd.to_datetime(values.view('datetime64[ns]'))
+        elif kind == 'category':
+            categories = data[f"{name}/{col}#categories"]
+            columns[col] = pd.Categorical.from_codes(values, categories).astype(object)
+        else:
+            columns[col] = values
+    return pd.DataFrame(columns)
+
+
+# ================================
+# 저장/로드
+# ================================
+def _as_frame(rows) -> pd.DataFrame:
+    return rows if isinstance(rows, pd.DataFrame) else pd.DataFrame(rows)
+
+
+def objects_dir(output_dir: Path) -> Path:
+    """실행 폴더가 속한 결과 루트의 objects 폴더"""
+    return Path(output_dir).parent / OBJECTS_DIR
+
+
+def save_run(output_dir: Path, key: str, results: Dict, trades: Union[pd.DataFrame, List[Dict]],
+             events: Union[pd.DataFrame, List[Dict]], equity_curve, meta: Optional[Dict] = None) -> bool:
+    """
+    실행 결과 저장 (trades/events는 DataFrame 또는 dict 리스트)
+    Returns: 새로 객체를 썼으면 True, 같은 키가 이미 있어서 공유했으면 False
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    store = objects_dir(output_dir)
+    store.mkdir(parents=True, exist_ok=True)
+    object_path = store / f"{key}.npz"
+
+    created = not object_path.exists()
+    if created:
+        arrays = {'equity': np.asarray(equity_curve, dtype=np.float32)}
+        schema = {
+            'trades': _encode_table('trades', _as_frame(trades), arrays),
+            'events': _encode_table('events', _as_frame(events), arrays),
+        }
+        arrays['schema'] = np.array(json.dumps(schema))
+        # 동시에 같은 키를 쓰는 프로세스가 있어도 완성된 파일만 보이도록 임시 파일 후 교체
+        tmp_path = store / f".{key}.{os.getpid()}.tmp.npz"
+        np.savez_compressed(tmp_path, **arrays)
+        os.replace(tmp_path, object_path)
+
+    run_info = {
+        'key': key,
+        'format': FORMAT_VERSION,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'results': {k: (v.item() if isinstance(v, np.generic) else v) for k, v in results.items()},
+        'meta': meta or {},
+    }
+    with open(output_dir / RUN_FILE, 'w', encoding='utf-8') as f:
+        json.dump(run_info, f, ensure_ascii=False, indent=2, default=str)
+    return created
+
+
+def load_run(run: Union[str, Path]) -> Dict:
+    """
+    실행 결과 로드
+    run: 실행 폴더 (run.json 포함) 또는 objects/<key>.npz 경로
+    Returns: {'key', 'results', 'meta', 'trades', 'events', 'equity'}
+    """
+    run = Path(run)
+    if run.is_dir():
+        with open(run / RUN_FILE, encoding='utf-8') as f:
+            info = json.load(f)
+        object_path = objects_dir(run) / f"{info['key']}.npz"
+    else:
+        info = {'key': run.stem, 'results': {}, 'meta': {}}
+        object_path = run
+
+    with np.load(object_path) as data:
+        schema = json.loads(str(data['schema']))
+        out = {
+            'key': info['key'],
+            'results': info['results'],
+            'meta': info['meta'],
+            'equity': data['equity'].astype(np.float64),
+        }
+        for name in TABLES:
+            out[name] = _decode_table(name, schema[name], data)
+    return out
+
+
+def export_csv(run_dir: Union[str, Path]):
+    """실행 폴더에 기존 CSV 형식(trades.csv, events.csv, equity_curve.csv) 내보내기"""
+    run_dir = Path(run_dir)
+    run = load_run(run_dir)
+
+    if len(run['trades']) > 0:
+        run['trades'].to_csv(run_dir / 'trades.csv', index=False, encoding='utf-8-sig')
+        print(f"  [내보내기] 거래 내역: trades.csv ({len(run['trades'])}건)")
+    if len(run['events']) > 0:
+        run['events'].to_csv(run_dir / 'events.csv', index=False, encoding='utf-8-sig')
+        print(f"  [내보내기] 이벤트 로그: events.csv ({len(run['events'])}건)")
+    if len(run['equity']) > 0:
+        pd.DataFrame({'bar_index': range(len(run['equity'])), 'equity': run['equity']}).to_csv(
+            run_dir / 'equity_curve.csv', index=False, encoding='utf-8-sig')
+        print(f"  [내보내기] 자산 곡선: equity_curve.csv ({len(run['equity'])}개)")
+
+
+def main():
+    if len(sys.argv) < 3 or sys.argv[1] not in ('export', 'info'):
+        print("사용법: python run_store.py export|info <실행 폴더>")
+        sys.exit(1)
+    command, run_dir = sys.argv[1], Path(sys.argv[2])
+
+    if command == 'export':
+        export_csv(run_dir)
+        return
+
+    run = load_run(run_dir)
+    print(f"키: {run['key']}")
+    for name, value in run['meta'].items():
+        print(f"{name}: {value}")
+    print(f"거래 {len(run['trades'])}건, 이벤트 {len(run['events'])}건, 자산 곡선 {len(run['equity'])}개")
+    print(f"최종 자본: {run['results'].get('final_capital', float('nan')):.2f} USDT")
+
+
+if __name__ == "__main__":
+    main()
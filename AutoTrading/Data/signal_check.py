@@ -0,0 +1,82 @@
+"""
+진입 신호 동등성 확인 (합성 봉, CSV 불필요, 오프라인 실행)
+
+행 단위 경로(check_entry_signal / get_trend_strength / calculate_position_size)와
+벡터 경로(trading_strategy.entry_rules)가 봉마다 같은 신호/추세 강도/포지션 비율을 내는지 확인
+- 백테스터: BinanceETHFuturesBacktest.signal_mismatches (bt.entry_signals -> entry_rules)
+- 실전 봇: trading_strategy.TradingStrategy.signal_mismatches (generate_signals -> entry_rules)
+- 기본 상수와 신호가 자주 나오도록 완화한 상수(LOOSE_PARAMS) 두 가지로 확인
+- 합성 1분봉은 benchmark.generate_minutes (고정 시드), bt.RESAMPLE_TIMEFRAME으로 리샘플링
+
+사용법:
+    python signal_check.py [개월]     # 기본 1개월, 불일치가 있으면 종료 코드 1
+"""
+
+import sys
+from typing import Dict
+
+import pandas as pd
+
+import binance_eth_futures_backtest as bt
+import trading_strategy as ts
+from benchmark import generate_minutes
+
+# ================================
+# 설정
+# ================================
+DEFAULT_MONTHS = 1
+LOOSE_PARAMS = {'ADX_STRONG_THRESHOLD': 20.0, 'ADX_WEAK_THRESHOLD': 15.0,
+                'VOLUME_MIN_THRESHOLD': 0.9, 'VOLUME_STRONG_MULT': 1.1}
+
+
+def synthetic_bars(months: int = DEFAULT_MONTHS) -> pd.DataFrame:
+    """합성 1분봉 -> bt.RESAMPLE_TIMEFRAME OHLCV 봉"""
+    minutes = generate_minutes(months).set_index('timestamp')
+    return minutes.resample(bt.RESAMPLE_TIMEFRAME).agg(
+        {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}).dropna()
+
+
+def check(bars: pd.DataFrame) -> Dict[str, Dict[str, int]]:
+    """경로/상수 조합별 {'mismatches', 'signals'} (상수는 끝나면 원래 값으로 복원)"""
+    out = {}
+    bt_defaults = bt.get_strategy_params()
+    ts_defaults = ts.rule_params()
+    bt_df = bt.BinanceETHFuturesBacktest().calculate_indicators(bars)
+    ts_df = ts.TradingStrategy().calculate_indicators(bars)
+    try:
+        for label, overrides in (('default', {}), ('loose', LOOSE_PARAMS)):
+            bt.set_strategy_params({**bt_defaults, **overrides})
+            for name, value in {**ts_defaults, **overrides}.items():
+                setattr(ts, name, value)
+
+            backtest = bt.BinanceETHFuturesBacktest()
+            signals = backtest.generate_signals(bt_df)
+            out[f'backtest/{label}'] = {'mismatches': backtest.signal_mismatches(bt_df),
+                                        'signals': int((signals['long'] | signals['short']).sum())}
+            strategy = ts.TradingStrategy()
+            signals = strategy.generate_signals(ts_df)
+            out[f'live/{label}'] = {'mismatches': strategy.signal_mismatches(ts_df),
+                                    'signals': int((signals['long'] | signals['short']).sum())}
+    finally:
+        bt.set_strategy_params(bt_defaults)
+        for name, value in ts_defaults.items():
+            setattr(ts, name, value)
+    return out
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    months = int(args[0]) if args else DEFAULT_MONTHS
+    bars = synthetic_bars(months)
+    print(f"[신호 확인] 합성 {bt.RESAMPLE_TIMEFRAME} 봉 {len(bars):,}개 ({months}개월)")
+    results = check(bars)
+    for name, r in results.items():
+        print(f"  {name:18s} 신호 {r['signals']:4d}봉, 불일치 {r['mismatches']}봉")
+    if any(r['mismatches'] for r in results.values()):
+        print("[신호 확인] 벡터 경로가 행 단위 경로와 다릅니다")
+        sys.exit(1)
+    print("[신호 확인] 모두 일치")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,397 @@
+"""
+전략 플러그인 API (여러 전략이 같은 엔진/데이터/피처 저장소/스윕을 공유)
+
+- Strategy(abc.ABC): 필요한 지표(그룹 -> 기간)와 벡터 훅 두 개만 정의 (하나라도 없으면 생성 시 TypeError)
+    signals(df): 봉 i 종가 기준 진입 신호 (다음 봉 시가 진입)
+                 -> long, short, capital_ratio [, trend, volume_ratio]
+    exits(df):   손절/익절 거리, 부분 익절 후 트레일링 거리, 종가 청산 신호
+                 -> stop_dist, take_profit_dist [, partial_dist, trail_dist, exit_long, exit_short]
+  신호(long/short)는 신호 봉, 나머지 값은 그 값을 쓰는 봉(진입 봉/보유 중인 봉)의 행에서 읽음
+  (BinanceETHFuturesBacktest와 같은 규칙). 진입 시점에 알 수 있는 값만 쓰려면 전략에서 shift(1)
+- StrategyBacktest: BinanceETHFuturesBacktest 하위 클래스 (봉 건너뛰기 루프, 장부, 자산 곡선 재구성,
+  성과 지표, run_cache, 저장 형식, 체결 재생 모드를 그대로 사용)
+- 지표: bt.INDICATOR_GROUPS + INDICATORS(플러그인용 추가 그룹), feature_store에 같은 방식으로 저장/재사용
+- 스윕: sweep.evaluate 작업에 'strategy': 이름을 넣으면 해당 전략으로 실행 (공유 메모리 df는
+  with_strategy_indicators로 만든 것)
+- 저장 키에 전략 이름/파라미터와 전략 소스 파일 해시 포함
+
+사용법:
+    strategy = create('donchian_regime', {'DONCHIAN_LEN': 40})
+    df = with_strategy_indicators(bt.load_data(csv_path), strategy)
+    results = StrategyBacktest(strategy).run_backtest(df)
+
+    python strategy_api.py [개월] [--strategies=ema_adx,donchian_regime]   # 같은 데이터로 전략 비교
+"""
+
+import inspect
+import sys
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Type
+
+import numpy as np
+import pandas as pd
+
+import binance_eth_futures_backtest as bt
+from data_pipeline import OHLCV_COLUMNS
+from feature_store import group_columns, with_indicators
+from run_cache import RunCache
+
+ATR_MA_SOURCE_PERIOD = 14  # atr_ma 그룹이 평균하는 ATR 기간
+
+
+# ================================
+# 플러그인용 추가 지표 그룹
+# ================================
+def _donchian(df: pd.DataFrame, period: int) -> Dict[str, pd.Series]:
+    """직전 period개 봉의 최고가/최저가 (현재 봉 제외)"""
+    return {'don_high': df['high'].rolling(period).max().shift(1),
+            'don_low': df['low'].rolling(period).min().shift(1)}
+
+
+def _atr_ma(df: pd.DataFrame, period: int) -> Dict[str, pd.Series]:
+    atr = bt.compute_indicator_group(df, 'atr', ATR_MA_SOURCE_PERIOD)['atr']
+    return {'atr_ma': atr.rolling(period).mean()}
+
+
+def _trend_ema_fast(df: pd.DataFrame, period: int) -> Dict[str, pd.Series]:
+    return {'trend_ema_fast': df['close'].ewm(span=period, adjust=False).mean()}
+
+
+def _trend_ema_slow(df: pd.DataFrame, period: int) -> Dict[str, pd.Series]:
+    return {'trend_ema_slow': df['close'].ewm(span=period, adjust=False).mean()}
+
+
+# 그룹 -> (만드는 컬럼, 계산 함수). bt.INDICATOR_GROUPS와 컬럼 이름이 겹치지 않게 정함
+INDICATORS = {
+    'donchian': (('don_high', 'don_low'), _donchian),
+    'atr_ma': (('atr_ma',), _atr_ma),
+    'trend_ema_fast': (('trend_ema_fast',), _trend_ema_fast),
+    'trend_ema_slow': (('trend_ema_slow',), _trend_ema_slow),
+}
+
+
+def compute_group(df: pd.DataFrame, group: str, period: int) -> Dict[str, pd.Series]:
+    """지표 그룹 하나 계산 (INDICATORS 우선, 없으면 bt.compute_indicator_group)"""
+    if group in INDICATORS:
+        return INDICATORS[group][1](df, period)
+    return bt.compute_indicator_group(df, group, period)
+
+
+# ================================
+# 전략 플러그인
+# ================================
+class Strategy(ABC):
+    """전략 플러그인 기본 클래스 (indicators/signals/exits를 모두 구현해야 생성 가능)"""
+
+    name = 'base'
+    PARAMS: Dict[str, float] = {}
+    timeframe: Optional[str] = None         # 전략 비교(main)에서 쓰는 주기 (None이면 bt.RESAMPLE_TIMEFRAME)
+    breakeven_after_partial = False         # 부분 익절 후 손절가를 진입가로 올림
+    signal_exit_after_partial = False       # 종가 청산 신호(exit_long/exit_short)를 부분 익절 후에만 사용
+
+    def __init__(self, params: Optional[Dict[str, float]] = None):
+        unknown = set(params or {}) - set(self.PARAMS)
+        if unknown:
+            raise KeyError(f"{self.name}: 알 수 없는 전략 파라미터 {sorted(unknown)}")
+        self.params = {**self.PARAMS, **(params or {})}
+
+    @abstractmethod
+    def indicators(self) -> Dict[str, int]:
+        """필요한 지표 그룹 -> 기간"""
+
+    def columns(self) -> Tuple[str, ...]:
+        return tuple(col for group in self.indicators() for col in group_columns(group, INDICATORS))
+
+    def required_columns(self) -> Tuple[str, ...]:
+        """모두 유효한 봉부터 실행 (지표 워밍업 구간 제외)"""
+        return self.columns()
+
+    @abstractmethod
+    def signals(self, df: pd.DataFrame) -> pd.DataFrame:
+        """진입 신호 (long, short, capital_ratio [, trend, volume_ratio])"""
+
+    @abstractmethod
+    def exits(self, df: pd.DataFrame) -> pd.DataFrame:
+        """청산 거리/신호 (stop_dist, take_profit_dist [, partial_dist, trail_dist, exit_long, exit_short])"""
+
+    def partial_ratio(self) -> float:
+        return 0.5
+
+
+class EmaAdxStrategy(Strategy):
+    """기존 BinanceETHFuturesBacktest 전략 (EMA 교차 + RSI + ADX/거래량 추세 강도, ATR 배수 손절/익절)"""
+
+    name = 'ema_adx'
+
+    def __init__(self, params: Optional[Dict[str, float]] = None):
+        self.PARAMS = bt.get_strategy_params()  # 현재 전역 전략 상수가 기본값
+        self.periods = bt.indicator_periods()
+        super().__init__(params)
+
+    def indicators(self) -> Dict[str, int]:
+        return dict(self.periods)
+
+    def required_columns(self) -> Tuple[str, ...]:
+        return bt.BinanceETHFuturesBacktest.required_columns
+
+    def signals(self, df: pd.DataFrame) -> pd.DataFrame:
+        signals = bt.entry_signals(df, self.params)
+        labels = np.array([bt.TREND_NAMES[code] for code in sorted(bt.TREND_NAMES)])
+        signals['trend'] = labels[signals['trend'].to_numpy()]
+        return signals
+
+    def exits(self, df: pd.DataFrame) -> pd.DataFrame:
+        p = self.params
+        atr = df['atr'].to_numpy(dtype=np.float64)
+        return pd.DataFrame({'stop_dist': atr * p['STOP_LOSS_ATR_MULT'],
+                             'take_profit_dist': atr * p['TAKE_PROFIT_ATR_MULT'],
+                             'partial_dist': atr * p['PARTIAL_TAKE_PROFIT_ATR_MULT']}, index=df.index)
+
+    def partial_ratio(self) -> float:
+        return self.params['PARTIAL_TAKE_PROFIT_RATIO']
+
+
+class DonchianRegimeStrategy(Strategy):
+    """
+    돈치안 돌파 + 시장 상태별 익절 (이상적인 백테스팅.txt)
+    - 진입: 종가가 직전 N봉 최고가 돌파 + 추세 EMA 정배열 (숏은 반대)
+    - 크기: 자본의 RISK_PER_TRADE를 1 ATR 손실로 잃는 수량 (MAX_CAPITAL_RATIO 이내)
+    - 시장 상태: ATR/ATR 이동평균 < RANGE_ATR_RATIO면 횡보(익절 짧게), 아니면 추세
+    - 관리: TP1 부분 익절 -> 손절가를 진입가로 -> 극값 - ATR x TRAIL_ATR_MULT 트레일링 -> TP2 또는 추세 EMA 이탈 종가 청산
+    크기/손절/익절 거리는 신호 봉 값 (진입 봉에서 shift(1)로 읽음)
+    """
+
+    name = 'donchian_regime'
+    timeframe = '1h'
+    breakeven_after_partial = True
+    signal_exit_after_partial = True
+    PARAMS = {
+        'DONCHIAN_LEN': 55, 'ATR_LEN': 14, 'ATR_MA_LEN': 100, 'EMA_FAST': 20, 'EMA_SLOW': 60,
+        'RISK_PER_TRADE': 0.007, 'MAX_CAPITAL_RATIO': 1.0, 'RANGE_ATR_RATIO': 0.8,
+        'STOP_ATR_MULT': 1.0, 'TREND_TP1': 1.0, 'TREND_TP2': 1.5, 'RANGE_TP1': 0.5, 'RANGE_TP2': 1.0,
+        'TRAIL_ATR_MULT': 1.0, 'PARTIAL_RATIO': 0.5,
+    }
+
+    def indicators(self) -> Dict[str, int]:
+        p = self.params
+        return {'donchian': int(p['DONCHIAN_LEN']), 'atr': int(p['ATR_LEN']), 'atr_ma': int(p['ATR_MA_LEN']),
+                'trend_ema_fast': int(p['EMA_FAST']), 'trend_ema_slow': int(p['EMA_SLOW'])}
+
+    def _regime(self, df: pd.DataFrame) -> np.ndarray:
+        """0 = 횡보, 1 = 상승, 2 = 하락"""
+        atr = df['atr'].to_numpy(dtype=np.float64)
+        atr_ma = df['atr_ma'].to_numpy(dtype=np.float64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            ratio = np.where(atr_ma > 0, atr / atr_ma, 0.0)
+        uptrend = df['trend_ema_fast'].to_numpy() > df['trend_ema_slow'].to_numpy()
+        return np.where(ratio < self.params['RANGE_ATR_RATIO'], 0, np.where(uptrend, 1, 2))
+
+    def signals(self, df: pd.DataFrame) -> pd.DataFrame:
+        p = self.params
+        close = df['close'].to_numpy(dtype=np.float64)
+        fast = df['trend_ema_fast'].to_numpy(dtype=np.float64)
+        slow = df['trend_ema_slow'].to_numpy(dtype=np.float64)
+        with np.errstate(invalid='ignore'):
+            long = (close > df['don_high'].to_numpy()) & (fast > slow)
+            short = ~long & (close < df['don_low'].to_numpy()) & (fast < slow)
+
+        # 진입 봉에서 읽는 값은 신호 봉 기준 (shift(1))
+        atr = df['atr'].shift(1).to_numpy(dtype=np.float64)
+        prev_close = df['close'].shift(1).to_numpy(dtype=np.float64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            ratio = p['RISK_PER_TRADE'] * prev_close / (atr * bt.LEVERAGE)
+        capital_ratio = np.where(np.isfinite(ratio) & (ratio > 0), np.minimum(ratio, p['MAX_CAPITAL_RATIO']), 0.0)
+        regime = pd.Series(self._regime(df), index=df.index).shift(1).fillna(0).astype(int).to_numpy()
+        labels = np.array(['RANGE', 'UPTREND', 'DOWNTREND'])
+        return pd.DataFrame({'long': long, 'short': short, 'capital_ratio': capital_ratio,
+                             'trend': labels[regime]}, index=df.index)
+
+    def exits(self, df: pd.DataFrame) -> pd.DataFrame:
+        p = self.params
+        atr = df['atr'].shift(1).to_numpy(dtype=np.float64)
+        ranging = pd.Series(self._regime(df), index=df.index).shift(1).fillna(0).to_numpy() == 0
+        close = df['close'].to_numpy(dtype=np.float64)
+        slow = df['trend_ema_slow'].to_numpy(dtype=np.float64)
+        return pd.DataFrame({
+            'stop_dist': atr * p['STOP_ATR_MULT'],
+            'partial_dist': atr * np.where(ranging, p['RANGE_TP1'], p['TREND_TP1']),
+            'take_profit_dist': atr * np.where(ranging, p['RANGE_TP2'], p['TREND_TP2']),
+            'trail_dist': atr * p['TRAIL_ATR_MULT'],
+            'exit_long': close < slow,
+            'exit_short': close > slow,
+        }, index=df.index)
+
+    def partial_ratio(self) -> float:
+        return self.params['PARTIAL_RATIO']
+
+
+STRATEGIES: Dict[str, Type[Strategy]] = {}
+
+
+def register_strategy(cls: Type[Strategy]) -> Type[Strategy]:
+    """전략 등록 (클래스 데코레이터로 사용, 스윕 작업의 'strategy' 이름으로 찾음)"""
+    if inspect.isabstract(cls):
+        raise TypeError(f"{cls.name}: 구현하지 않은 메서드 {sorted(cls.__abstractmethods__)}")
+    STRATEGIES[cls.name] = cls
+    return cls
+
+
+register_strategy(EmaAdxStrategy)
+register_strategy(DonchianRegimeStrategy)
+
+
+def create(name: str, params: Optional[Dict[str, float]] = None) -> Strategy:
+    if name not in STRATEGIES:
+        raise KeyError(f"등록되지 않은 전략: {name} (가능: {', '.join(STRATEGIES)})")
+    return STRATEGIES[name](params)
+
+
+def with_strategy_indicators(df: pd.DataFrame, strategy: Strategy, timeframe: Optional[str] = None,
+                             verbose: bool = False) -> pd.DataFrame:
+    """OHLCV + 전략 지표 컬럼 (feature_store 메모리 맵, 없는 그룹만 계산)"""
+    return with_indicators(df[OHLCV_COLUMNS], timeframe, verbose=verbose,
+                           periods=strategy.indicators(), groups=INDICATORS)
+
+
+# ================================
+# 엔진 연결
+# ================================
+class StrategyBacktest(bt.BinanceETHFuturesBacktest):
+    """전략 플러그인으로 신호/크기/청산 가격을 정하는 BinanceETHFuturesBacktest"""
+
+    def __init__(self, strategy: Strategy, **kwargs):
+        super().__init__(**kwargs)
+        self.strategy = strategy
+        self.indicator_columns = strategy.columns()
+        self.required_columns = strategy.required_columns()
+        self._extreme = 0.0  # 보유 중 최고가(롱)/최저가(숏), 트레일링용
+
+    def calculate_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
+        df = df.copy()
+        for group, period in self.strategy.indicators().items():
+            with self.profiler.span(f"indicators/{group}"):
+                for col, values in compute_group(df, group, period).items():
+                    df[col] = values
+        return df
+
+    def generate_signals(self, df: pd.DataFrame) -> pd.DataFrame:
+        """전략 훅을 한 번씩 호출해서 봉별 배열로 보관 (루프에서는 row.name 위치로 조회)"""
+        signals = self.strategy.signals(df)
+        exits = self.strategy.exits(df)
+        n = len(df)
+
+        def column(frame: pd.DataFrame, name: str, default, dtype=np.float64) -> np.ndarray:
+            return frame[name].to_numpy(dtype=dtype) if name in frame else np.full(n, default, dtype=dtype)
+
+        self._trend = column(signals, 'trend', self.strategy.name.upper(), object)
+        self._volume_ratio = column(signals, 'volume_ratio', np.nan)
+        self._capital_ratio = column(signals, 'capital_ratio', 0.0)
+        self._stop_dist = column(exits, 'stop_dist', np.nan)
+        self._take_profit_dist = column(exits, 'take_profit_dist', np.nan)
+        self._partial_dist = column(exits, 'partial_dist', np.nan)
+        self._trail_dist = column(exits, 'trail_dist', np.nan)
+        self._exit_long = column(exits, 'exit_long', False, bool)
+        self._exit_short = column(exits, 'exit_short', False, bool)
+        return signals
+
+    def entry_size(self, row: pd.Series, entry_price: float) -> Tuple[str, float, float, float]:
+        i = row.name
+        trend_strength = str(self._trend[i])
+        capital_ratio = self._capital_ratio[i]
+        if not np.isfinite(capital_ratio) or capital_ratio <= 0:
+            return trend_strength, self._volume_ratio[i], 0.0, 0.0
+        available_capital = self.capital * capital_ratio
+        leveraged_capital = available_capital * bt.LEVERAGE
+        return trend_strength, self._volume_ratio[i], leveraged_capital / entry_price, available_capital
+
+    def exit_levels(self, row: pd.Series, direction: str, fill_price: float) -> Optional[Tuple[float, float, float]]:
+        i = row.name
+        stop, take_profit, partial = self._stop_dist[i], self._take_profit_dist[i], self._partial_dist[i]
+        if not np.isfinite(stop) or stop <= 0 or not np.isfinite(take_profit):
+            return None
+        has_partial = np.isfinite(partial)
+        if direction == "long":
+            return fill_price - stop, fill_price + take_profit, (fill_price + partial) if has_partial else None
+        return fill_price + stop, fill_price - take_profit, (fill_price - partial) if has_partial else None
+
+    def partial_ratio(self) -> float:
+        return self.strategy.partial_ratio()
+
+    def enter_position(self, row: pd.Series, direction: str, entry_price: float):
+        super().enter_position(row, direction, entry_price)
+        if self.position is not None:
+            self._extreme = self.position.entry_price
+
+    def check_exit(self, row: pd.Series) -> Tuple[bool, float, str, bool]:
+        pos = self.position
+        if pos is None:
+            return super().check_exit(row)
+        i = row.name
+        is_long = pos.side == "long"
+
+        # 부분 익절 후 손절가 조정 (직전 봉까지의 극값 기준이라 현재 봉 정보는 쓰지 않음)
+        if pos.partial_taken:
+            if self.strategy.breakeven_after_partial:
+                pos.stop_loss = max(pos.stop_loss, pos.entry_price) if is_long else min(pos.stop_loss, pos.entry_price)
+            trail = self._trail_dist[i]
+            if np.isfinite(trail):
+                pos.stop_loss = max(pos.stop_loss, self._extreme - trail) if is_long \
+                    else min(pos.stop_loss, self._extreme + trail)
+
+        result = super().check_exit(row)
+        if not result[0] and (pos.partial_taken or not self.strategy.signal_exit_after_partial):
+            if self._exit_long[i] if is_long else self._exit_short[i]:
+                result = (True, row['close'], "SIGNAL_EXIT", False)
+
+        self._extreme = max(self._extreme, row['high']) if is_long else min(self._extreme, row['low'])
+        return result
+
+    def _run_config(self, extra_config: Optional[Dict] = None) -> Dict:
+        config = super()._run_config(extra_config)
+        config['strategy'] = self.strategy.name
+        config['strategy_params'] = dict(self.strategy.params)
+        return config
+
+    def _record_run_inputs(self, frames, extra_config: Optional[Dict] = None, extra_sources: Tuple[Path, ...] = ()):
+        sources = (Path(__file__).resolve(), Path(inspect.getsourcefile(type(self.strategy))).resolve())
+        super()._record_run_inputs(frames, extra_config, tuple(extra_sources) + tuple(dict.fromkeys(sources)))
+
+
+# ================================
+# 전략 비교
+# ================================
+def main():
+    args = sys.argv[1:]
+    months = next((int(a) for a in args if not a.startswith('--')), bt.TEST_MONTHS)
+    names = next((a.split('=', 1)[1].split(',') for a in args if a.startswith('--strategies=')), list(STRATEGIES))
+    csv_path = Path(__file__).parent / bt.CSV_FILE
+    default_timeframe = bt.RESAMPLE_TIMEFRAME
+
+    rows = []
+    try:
+        for name in names:
+            strategy = create(name)
+            timeframe = strategy.timeframe or default_timeframe
+            print(f"\n[전략 비교] {name} ({timeframe})")
+            df = with_strategy_indicators(bt.load_data(str(csv_path), months=months, timeframe=timeframe),
+                                          strategy, verbose=True)
+            # 백테스터는 연율화/저장 키에 RESAMPLE_TIMEFRAME을 쓰므로 실행하는 동안만 바꿈 (finally에서 복원)
+            bt.RESAMPLE_TIMEFRAME = timeframe
+            started = time.perf_counter()
+            backtest = StrategyBacktest(strategy, cache=RunCache() if bt.USE_RUN_CACHE else None)
+            results = backtest.run_backtest(df, verbose=False)
+            rows.append({'strategy': name, 'timeframe': timeframe, 'trades': results['total_trades'],
+                         'return_pct': results['total_return_pct'], 'max_dd_pct': results['max_drawdown'],
+                         'win_rate': results['win_rate'], 'profit_factor': results['profit_factor'],
+                         'sharpe': results['sharpe_ratio'], 'seconds': time.perf_counter() - started})
+    finally:
+        bt.RESAMPLE_TIMEFRAME = default_timeframe
+
+    print(f"\n{'='*80}")
+    print(pd.DataFrame(rows).to_string(index=False, float_format=lambda v: f"{v:.2f}"))
+
+
+if __name__ == "__main__":
+    main()
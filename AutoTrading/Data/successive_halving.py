@@ -0,0 +1,249 @@
+"""
+연속 절반 탈락(Successive Halving) 전략 상수 최적화
+
+- 탐색 공간(SEARCH_SPACE)에서 후보 N_CANDIDATES개를 무작위 추출 (고정 시드, 모순되는 조합 제외)
+- 1단계: 모든 후보를 최근 MIN_MONTHS개월 구간에서 백테스트 -> 상위 1/ETA만 다음 단계로
+- 단계마다 구간을 ETA배로 늘려서(최근 구간 기준) 반복, 마지막 단계는 전체 기간
+- 지표는 전체 기간에서 한 번만 계산하고, 모든 단계가 같은 공유 메모리/워커 풀 사용 (sweep.SweepPool)
+- bt.USE_INTRABAR_EXITS면 모든 단계를 1분봉 봉 내부 체결 판별로 실행 (단일 실행과 같은 체결 방식)
+- 사용한 봉 수(후보 x 구간 길이 합)를 "모든 후보를 전체 기간으로 실행"한 경우와 비교해서 절감률 보고
+  --compare를 주면 실제로 모든 후보를 전체 기간에서 실행해서 선택 결과의 순위 확인
+
+사용법:
+    python successive_halving.py                    # 전체 데이터
+    python successive_halving.py 12                 # 최근 12개월만
+    python successive_halving.py --candidates=243 --compare
+"""
+
+import itertools
+import json
+import math
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+import binance_eth_futures_backtest as bt
+from feature_store import with_indicators
+from sweep import SweepPool, fill_mode, load_sweep_data
+
+# ================================
+# 설정
+# ================================
+N_CANDIDATES = 81   # 1단계 후보 수
+ETA = 3             # 단계마다 남기는 비율의 역수 (상위 1/3 통과) = 구간 증가 배수
+MIN_MONTHS = 1      # 1단계 구간 길이 (개월, 30일 기준, 데이터 끝에서부터)
+SEED = 42
+MIN_TRADES = 1      # 거래가 이보다 적으면 점수 제외 (짧은 구간에서는 거래가 드물어 낮게 둠)
+
+# 탐색할 전략 상수 (현재 값 주변)
+SEARCH_SPACE = {
+    'ADX_STRONG_THRESHOLD': [26.0, 28.0, 30.0, 32.0],
+    'ADX_WEAK_THRESHOLD': [19.0, 21.0, 23.0, 25.0],
+    'VOLUME_STRONG_MULT': [1.35, 1.5, 1.65],
+    'VOLUME_MIN_THRESHOLD': [1.04, 1.08, 1.12, 1.16],
+    'STRONG_TREND_POSITION_RATIO': [0.2, 0.24, 0.28],
+    'WEAK_TREND_POSITION_RATIO': [0.1, 0.13, 0.16],
+    'RSI_LONG_MIN': [52.0, 54.0, 56.0],
+    'RSI_SHORT_MAX': [44.0, 46.0, 48.0],
+    'STOP_LOSS_ATR_MULT': [0.6, 0.72, 0.85, 1.0],
+    'TAKE_PROFIT_ATR_MULT': [12.0, 16.0, 20.0],
+}
+
+
+def is_consistent(params: Dict[str, float]) -> bool:
+    """서로 모순되는 조합 제외 (약한 추세 기준 < 강한 추세 기준, 비중 순서 유지)"""
+    merged = {**bt.get_strategy_params(), **params}
+    return (merged['ADX_WEAK_THRESHOLD'] < merged['ADX_STRONG_THRESHOLD']
+            and merged['WEAK_TREND_POSITION_RATIO'] < merged['STRONG_TREND_POSITION_RATIO'] <= merged['MAX_POSITION_RATIO']
+            and merged['PARTIAL_TAKE_PROFIT_ATR_MULT'] < merged['TAKE_PROFIT_ATR_MULT'])
+
+
+def sample_candidates(space: Dict[str, List[float]], n: int, seed: int = SEED) -> List[Dict[str, float]]:
+    """탐색 공간에서 중복 없이 n개 추출 (공간이 n보다 작으면 전체)"""
+    names = list(space)
+    sizes = [len(space[name]) for name in names]
+    total = math.prod(sizes)
+    rng = np.random.default_rng(seed)
+
+    if total <= n * 4:
+        combos = [dict(zip(names, values)) for values in itertools.product(*(space[name] for name in names))]
+        combos = [c for c in combos if is_consistent(c)]
+        order = rng.permutation(len(combos))
+        return [combos[i] for i in order[:n]]
+
+    seen, candidates = set(), []
+    while len(candidates) < n:
+        picks = tuple(int(rng.integers(size)) for size in sizes)
+        if picks in seen:
+            continue
+        seen.add(picks)
+        params = {name: space[name][i] for name, i in zip(names, picks)}
+        if is_consistent(params):
+            candidates.append(params)
+    return candidates
+
+
+def score(results: Dict) -> float:
+    """단계 점수: 수익률 / 최대 낙폭 (거래 수 부족 시 제외)"""
+    if results.get('total_trades', 0) < MIN_TRADES:
+        return float('-inf')
+    return results['total_return_pct'] / max(results['max_drawdown'], 1.0)
+
+
+def make_rungs(index: pd.DatetimeIndex, min_months: int = MIN_MONTHS, eta: int = ETA) -> List[Dict]:
+    """단계별 구간 (데이터 끝에서부터 min_months x eta^r개월, 마지막은 전체 기간)"""
+    rungs = []
+    months = min_months
+    while True:
+        start = int(index.searchsorted(index[-1] - pd.Timedelta(days=months * 30), side='left'))
+        if start <= 0:
+            rungs.append({'rung': len(rungs), 'months': None, 'start': 0, 'end': len(index)})
+            return rungs
+        rungs.append({'rung': len(rungs), 'months': months, 'start': start, 'end': len(index)})
+        months *= eta
+
+
+def run_successive_halving(df: pd.DataFrame, candidates: List[Dict[str, float]], eta: int = ETA,
+                           min_months: int = MIN_MONTHS, workers: Optional[int] = None,
+                           compare: bool = False, minutes: Optional[pd.DataFrame] = None) -> Dict:
+    """
+    연속 절반 탈락 실행
+    df: load_data() 결과 (리샘플링된 OHLCV). 지표는 전체 기간 기준으로 피처 저장소에서 가져옴
+    minutes: 1분봉 high/low (sweep.load_sweep_data). 모든 단계(와 --compare)가 같은 체결 방식으로 실행
+    Returns: {'best', 'history'(DataFrame), 'rungs', 'bars_used', 'bars_full_grid', 'compare'(선택)}
+    """
+    print("[연속 절반 탈락] 전체 기간 지표 준비 중 (피처 저장소)...")
+    df = with_indicators(df)
+    df = df[['open', 'high', 'low', 'close', 'volume'] + list(bt.INDICATOR_COLUMNS)]
+
+    rungs = make_rungs(df.index, min_months, eta)
+    alive = list(range(len(candidates)))
+    history = []
+    bars_used = 0
+
+    with SweepPool(df, workers, minutes) as pool:
+        for rung in rungs:
+            is_last = rung is rungs[-1] or len(alive) == 1
+            if is_last and rung['start'] != 0:
+                rung = {**rung, 'months': None, 'start': 0}
+            length = rung['end'] - rung['start']
+            label = '전체' if rung['months'] is None else f"최근 {rung['months']}개월"
+            print(f"[{rung['rung'] + 1}단계] 후보 {len(alive)}개 x {label} ({length:,}봉)")
+
+            tasks = [{'candidate': c, 'params': candidates[c], 'start': rung['start'], 'end': rung['end']}
+                     for c in alive]
+            outs = pool.map(tasks)
+            bars_used += length * len(tasks)
+
+            # 점수 내림차순, 동점이면 후보 번호 순 (실행 순서와 무관하게 결정적)
+            ranked = sorted(outs, key=lambda o: (-score(o['results']), o['candidate']))
+            keep = len(ranked) if is_last else max(1, math.ceil(len(ranked) / eta))
+            for rank, out in enumerate(ranked):
+                r = out['results']
+                history.append({
+                    'rung': rung['rung'], 'months': rung['months'], 'bars': length,
+                    'candidate': out['candidate'], 'rank': rank, 'score': score(r),
+                    'trades': r['total_trades'], 'return_pct': r['total_return_pct'],
+                    'max_drawdown': r['max_drawdown'], 'promoted': not is_last and rank < keep,
+                    'params': json.dumps(out['params'], sort_keys=True),
+                })
+            alive = [out['candidate'] for out in ranked[:keep]]
+            if is_last:
+                best_out = ranked[0]
+                break
+
+        compared = None
+        if compare:
+            print(f"[비교] 후보 {len(candidates)}개 전체를 전체 기간에서 실행 중...")
+            full = pool.map([{'candidate': c, 'params': p, 'start': 0, 'end': len(df)}
+                             for c, p in enumerate(candidates)])
+            full_ranked = sorted(full, key=lambda o: (-score(o['results']), o['candidate']))
+            ranks = [o['candidate'] for o in full_ranked]
+            compared = {
+                'best_candidate': full_ranked[0]['candidate'],
+                'best_score': score(full_ranked[0]['results']),
+                'selected_rank': ranks.index(best_out['candidate']),
+            }
+
+    bars_full_grid = len(df) * len(candidates)
+    return {
+        'best': {'candidate': best_out['candidate'], 'params': best_out['params'],
+                 'score': score(best_out['results']), 'results': best_out['results']},
+        'history': pd.DataFrame(history),
+        'rungs': len({h['rung'] for h in history}),
+        'bars_used': bars_used,
+        'bars_full_grid': bars_full_grid,
+        'compare': compared,
+        'fill_mode': fill_mode(minutes),
+    }
+
+
+def save_successive_halving(output_dir: Path, sh: Dict, n_candidates: int):
+    """단계별 결과(rungs.csv) + 요약 저장"""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    sh['history'].to_csv(output_dir / 'rungs.csv', index=False, encoding='utf-8-sig')
+    print(f"  [저장] 단계별 결과: rungs.csv ({len(sh['history'])}행)")
+
+    best = sh['best']
+    saved_pct = (1 - sh['bars_used'] / sh['bars_full_grid']) * 100
+    with open(output_dir / 'summary.txt', 'w', encoding='utf-8') as f:
+        f.write("="*60 + "\n")
+        f.write("연속 절반 탈락 최적화 요약\n")
+        f.write("="*60 + "\n\n")
+        f.write(f"후보 수: {n_candidates}개, ETA: {ETA}, 단계 수: {sh['rungs']}\n")
+        f.write(f"사용 봉 수: {sh['bars_used']:,} (전체 그리드 {sh['bars_full_grid']:,}, {saved_pct:.1f}% 절감)\n")
+        f.write(f"청산 체결: {sh['fill_mode']}\n\n")
+        f.write(f"선택 후보: #{best['candidate']} (점수 {best['score']:.3f})\n")
+        f.write(f"전체 기간 수익률: {best['results']['total_return_pct']:.2f}%\n")
+        f.write(f"전체 기간 최대 낙폭: {best['results']['max_drawdown']:.2f}%\n")
+        f.write(f"전체 기간 거래 수: {best['results']['total_trades']}건\n")
+        f.write(f"전략 상수: {json.dumps(best['params'], sort_keys=True)}\n")
+        if sh['compare'] is not None:
+            f.write(f"\n전체 그리드 최고 후보: #{sh['compare']['best_candidate']} "
+                    f"(점수 {sh['compare']['best_score']:.3f}), 선택 후보 순위: {sh['compare']['selected_rank'] + 1}위\n")
+    print(f"  [저장] 성과 요약: summary.txt")
+
+
+def main():
+    args = sys.argv[1:]
+    n_candidates = N_CANDIDATES
+    compare = '--compare' in args
+    for arg in args:
+        if arg.startswith('--candidates='):
+            n_candidates = int(arg.split('=', 1)[1])
+    positional = [a for a in args if not a.startswith('--')]
+    months = int(positional[0]) if positional else bt.TEST_MONTHS
+
+    csv_path = Path(__file__).parent / bt.CSV_FILE
+    df, minutes = load_sweep_data(csv_path, months)
+    candidates = sample_candidates(SEARCH_SPACE, n_candidates)
+
+    started = datetime.now()
+    sh = run_successive_halving(df, candidates, compare=compare, minutes=minutes)
+    elapsed = (datetime.now() - started).total_seconds()
+
+    best = sh['best']
+    saved_pct = (1 - sh['bars_used'] / sh['bars_full_grid']) * 100
+    print(f"\n{'='*60}")
+    print(f"연속 절반 탈락 완료 ({elapsed:.1f}초)")
+    print(f"{'='*60}")
+    print(f"사용 봉 수: {sh['bars_used']:,} / 전체 그리드 {sh['bars_full_grid']:,} ({saved_pct:.1f}% 절감)")
+    print(f"선택 후보 #{best['candidate']}: 점수 {best['score']:.3f}, "
+          f"수익률 {best['results']['total_return_pct']:.2f}%, 최대 낙폭 {best['results']['max_drawdown']:.2f}%")
+    print(f"전략 상수: {json.dumps(best['params'], sort_keys=True)}")
+    print(f"청산 체결: {sh['fill_mode']}")
+    if sh['compare'] is not None:
+        print(f"전체 그리드 최고 후보 #{sh['compare']['best_candidate']} (점수 {sh['compare']['best_score']:.3f}), "
+              f"선택 후보 순위 {sh['compare']['selected_rank'] + 1}위 / {n_candidates}")
+
+    timestamp = started.strftime("%Y%m%d_%H%M%S")
+    output_dir = Path(__file__).parent / bt.OUTPUT_DIR / f"{timestamp}_successive_halving"
+    save_successive_halving(output_dir, sh, n_candidates)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+파라미터 스윕 공용 실행기
+
+- 지표까지 계산된 봉 데이터를 공유 메모리(SharedMemory)에 한 번만 올리고
+  워커 프로세스는 복사 없이 붙어서(attach) 구간만 잘라 백테스트 실행
+- 워커마다 전략 상수를 덮어쓰고(set_strategy_params) BinanceETHFuturesBacktest를 그대로 사용
+- bt.USE_RUN_CACHE면 같은 (구간, 파라미터) 재실행은 run_cache에서 결과를 읽음 (중복 후보/반복 스윕)
+- 작업에 'strategy'가 있으면 strategy_api 플러그인으로 실행 ('params'는 전략 파라미터,
+  공유 프레임은 with_strategy_indicators로 만든 것이어야 함)
+- 워크포워드 최적화 등 여러 파라미터 세트를 병렬로 돌리는 모듈에서 공통으로 사용
+- SweepPool: 공유 메모리/워커를 유지한 채 여러 번 실행 (단계별로 후보를 줄여가는 최적화용)
+- minutes(1분봉 high/low)를 넘기면 같은 방식으로 공유 메모리에 올리고 워커마다 IntrabarExitResolver 생성
+  (단일 실행과 같은 봉 내부 체결 판별). load_sweep_data가 bt.USE_INTRABAR_EXITS에 따라 함께 로드
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+import binance_eth_futures_backtest as bt
+from intrabar import IntrabarExitResolver
+from run_cache import RunCache
+from strategy_api import StrategyBacktest, create
+
+
+# ================================
+# 공유 메모리 프레임
+# ================================
+class SharedFrame:
+    """
+    DataFrame(숫자 컬럼 + DatetimeIndex)을 공유 메모리 2D 배열로 보관
+    생성한 프로세스가 close()/unlink() 책임을 짐 (with 문 사용 권장)
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        values = np.ascontiguousarray(df.to_numpy(dtype=np.float64))
+        index = df.index.values.astype('datetime64[ns]').view(np.int64)
+
+        self.columns = list(df.columns)
+        self.index_name = df.index.name
+        self.shape = values.shape
+
+        self._values_shm = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+        self._index_shm = shared_memory.SharedMemory(create=True, size=max(index.nbytes, 1))
+        np.ndarray(values.shape, dtype=np.float64, buffer=self._values_shm.buf)[:] = values
+        np.ndarray(index.shape, dtype=np.int64, buffer=self._index_shm.buf)[:] = index
+
+    def spec(self) -> Dict:
+        """워커에 넘길 접속 정보 (pickle 가능)"""
+        return {
+            'values_name': self._values_shm.name,
+            'index_name': self._index_shm.name,
+            'shape': self.shape,
+            'columns': self.columns,
+            'index_label': self.index_name,
+        }
+
+    def close(self):
+        self._values_shm.close()
+        self._index_shm.close()
+        self._values_shm.unlink()
+        self._index_shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def attach_frame(spec: Dict):
+    """
+    공유 메모리에 붙어서 DataFrame 뷰 생성
+    Returns: (df, handles) - handles는 프로세스가 살아있는 동안 유지해야 함
+    """
+    values_shm = shared_memory.SharedMemory(name=spec['values_name'])
+    index_shm = shared_memory.SharedMemory(name=spec['index_name'])
+    values = np.ndarray(spec['shape'], dtype=np.float64, buffer=values_shm.buf)
+    index = np.ndarray((spec['shape'][0],), dtype=np.int64, buffer=index_shm.buf)
+
+    df = pd.DataFrame(
+        values,
+        columns=spec['columns'],
+        index=pd.DatetimeIndex(index.view('datetime64[ns]'), name=spec['index_label']),
+        copy=False,
+    )
+    return df, (values_shm, index_shm)
+
+
+# ================================
+# 워커
+# ================================
+_FRAME: Optional[pd.DataFrame] = None
+_HANDLES = None
+_DEFAULT_PARAMS: Dict[str, float] = {}
+_CACHE: Optional[RunCache] = None
+_RESOLVER: Optional[IntrabarExitResolver] = None
+
+
+def _init_worker(spec: Dict, minutes_spec: Optional[Dict] = None, timeframe: Optional[str] = None):
+    global _FRAME, _HANDLES, _DEFAULT_PARAMS, _CACHE, _RESOLVER
+    _FRAME, _HANDLES = attach_frame(spec)
+    _DEFAULT_PARAMS = bt.get_strategy_params()
+    _CACHE = RunCache() if bt.USE_RUN_CACHE else None
+    if minutes_spec is not None:
+        minutes, minute_handles = attach_frame(minutes_spec)
+        _RESOLVER = IntrabarExitResolver(minutes, timeframe)
+        _HANDLES = _HANDLES + minute_handles
+
+
+def evaluate(task: Dict) -> Dict:
+    """
+    파라미터 세트 1개를 [start, end) 구간에서 백테스트
+    task: {'params': {...}, 'start': int, 'end': int, 'want_equity': bool, ...(그대로 반환되는 키)}
+          'strategy': 이름이 있으면 해당 전략 플러그인 (params는 전략 파라미터)
+    """
+    if 'strategy' in task:
+        bt.set_strategy_params(_DEFAULT_PARAMS)  # 이전 작업이 바꾼 전역 상수 복원 (ema_adx 기본값)
+        backtest = StrategyBacktest(create(task['strategy'], task.get('params')),
+                                    exit_resolver=_RESOLVER, cache=_CACHE)
+    else:
+        bt.set_strategy_params({**_DEFAULT_PARAMS, **task.get('params', {})})
+        backtest = bt.BinanceETHFuturesBacktest(exit_resolver=_RESOLVER, cache=_CACHE)
+    results = backtest.run_backtest(_FRAME.iloc[task['start']:task['end']], verbose=False)
+
+    out = {key: value for key, value in task.items() if key != 'want_equity'}
+    out['results'] = results
+    if task.get('want_equity'):
+        out['equity_curve'] = np.asarray(backtest.equity_curve, dtype=np.float64)
+        out['trades'] = backtest.trades.to_frame()
+    return out
+
+
+class SweepPool:
+    """
+    공유 메모리 프레임 + 프로세스 풀 (여러 번 map해도 데이터/워커를 다시 만들지 않음)
+    같은 데이터로 여러 단계를 이어서 실행하는 최적화(연속 절반 탈락 등)에서 사용. with 문 사용 권장
+    minutes: 1분봉 high/low (load_data(keep_minutes=True)). 넘기면 봉 내부 체결 판별 사용, None이면 손절 우선 가정
+    timeframe: df의 리샘플링 주기 (기본 bt.RESAMPLE_TIMEFRAME, minutes가 있을 때만 사용)
+    """
+
+    def __init__(self, df: pd.DataFrame, workers: Optional[int] = None,
+                 minutes: Optional[pd.DataFrame] = None, timeframe: Optional[str] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self._frame = SharedFrame(df)
+        self._minutes = SharedFrame(minutes[['high', 'low']]) if minutes is not None else None
+        minutes_spec = self._minutes.spec() if self._minutes is not None else None
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                         initargs=(self._frame.spec(), minutes_spec,
+                                                   timeframe or bt.RESAMPLE_TIMEFRAME))
+
+    def map(self, tasks: List[Dict]) -> List[Dict]:
+        """결과 순서는 tasks 순서와 동일"""
+        if not tasks:
+            return []
+        chunksize = max(1, len(tasks) // (self.workers * 4))
+        return list(self._pool.map(evaluate, tasks, chunksize=chunksize))
+
+    def close(self):
+        self._pool.shutdown()
+        self._frame.close()
+        if self._minutes is not None:
+            self._minutes.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def run_tasks(df: pd.DataFrame, tasks: List[Dict], workers: Optional[int] = None,
+              minutes: Optional[pd.DataFrame] = None) -> List[Dict]:
+    """
+    tasks를 프로세스 풀에서 실행 (df는 지표 컬럼까지 포함된 전체 기간 데이터)
+    minutes: 1분봉 high/low (SweepPool과 같음, None이면 봉 내부 체결 판별 없음)
+    결과 순서는 tasks 순서와 동일
+    """
+    if not tasks:
+        return []
+    with SweepPool(df, workers, minutes) as pool:
+        return pool.map(tasks)
+
+
+def load_sweep_data(csv_path, months: int = 0):
+    """
+    스윕 입력 로드 -> (봉, 1분봉 high/low 또는 None)
+    bt.USE_INTRABAR_EXITS면 단일 실행(bt.main)과 같이 1분봉도 보관해서 워커의 봉 내부 체결 판별에 사용
+    """
+    if bt.USE_INTRABAR_EXITS:
+        return bt.load_data(str(csv_path), months=months, keep_minutes=True)
+    return bt.load_data(str(csv_path), months=months), None
+
+
+def fill_mode(minutes: Optional[pd.DataFrame]) -> str:
+    """결과 요약에 남길 청산 체결 방식"""
+    return '1분봉 봉 내부 체결 판별' if minutes is not None else '봉 내부 체결 판별 없음 (손절 우선 가정)'
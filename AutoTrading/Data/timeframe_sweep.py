@@ -0,0 +1,70 @@
+"""
+주기(RESAMPLE_TIMEFRAME)별 백테스트 비교
+
+- data_pipeline.load_bars로 모든 주기를 1분봉 한 번 읽기로 생성 (두 번째 실행부터는 .bar_cache에서 바로 로드)
+- 주기마다 RESAMPLE_TIMEFRAME을 바꿔서 같은 전략으로 백테스트 (저장 키/카탈로그에도 주기가 반영됨)
+- 지표는 주기별로 피처 저장소(feature_store)에서 가져옴 (두 번째 실행부터 지표 계산 없음)
+- 봉 내부 체결 판별(USE_INTRABAR_EXITS)은 1분봉을 따로 보관해야 하므로 여기서는 사용하지 않음 (손절 우선 가정)
+
+사용법:
+    python timeframe_sweep.py                     # MULTI_TIMEFRAMES 전체, 전체 데이터
+    python timeframe_sweep.py 15min 1h 4h         # 주기 선택
+    python timeframe_sweep.py --months=3 15min 1h # 최근 N개월
+"""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List
+
+import binance_eth_futures_backtest as bt
+from data_pipeline import MULTI_TIMEFRAMES, last_timestamp, load_bars
+from feature_store import with_indicators
+
+
+def run_timeframes(csv_path: str, timeframes: List[str], months: int = 0) -> Dict[str, Dict]:
+    """주기별 (백테스터, 결과). 봉은 한 번에 만들고 주기마다 RESAMPLE_TIMEFRAME만 바꿔서 실행"""
+    start = last_timestamp(csv_path) - timedelta(days=months * 30) if months > 0 else None
+    bars = load_bars(csv_path, timeframes, start=start)
+
+    original = bt.RESAMPLE_TIMEFRAME
+    out = {}
+    try:
+        for tf in timeframes:
+            bt.RESAMPLE_TIMEFRAME = tf
+            backtest = bt.BinanceETHFuturesBacktest()
+            results = backtest.run_backtest(with_indicators(bars[tf], tf), verbose=False)
+            out[tf] = {'backtest': backtest, 'results': results, 'bars': len(bars[tf])}
+    finally:
+        bt.RESAMPLE_TIMEFRAME = original
+    return out
+
+
+def main():
+    args = sys.argv[1:]
+    months = 0
+    for arg in args:
+        if arg.startswith('--months='):
+            months = int(arg.split('=', 1)[1])
+    timeframes = [a for a in args if not a.startswith('--')] or list(MULTI_TIMEFRAMES)
+    csv_path = Path(__file__).parent / bt.CSV_FILE
+
+    print(f"[주기 비교] {', '.join(timeframes)} ({'전체' if months == 0 else f'최근 {months}개월'})")
+    out = run_timeframes(str(csv_path), timeframes, months)
+
+    print(f"\n{'주기':<8} {'봉 수':>9} {'거래':>6} {'승률':>8} {'수익률':>9} {'최대 낙폭':>9} {'수익 팩터':>9}")
+    print("-" * 66)
+    for tf, item in out.items():
+        r = item['results']
+        print(f"{tf:<8} {item['bars']:>9,} {r['total_trades']:>6} {r['win_rate']:>7.2f}% "
+              f"{r['total_return_pct']:>8.2f}% {r['max_drawdown']:>8.2f}% {r['profit_factor']:>9.2f}")
+
+    # 주기별 결과 저장 (카탈로그에서 config의 RESAMPLE_TIMEFRAME으로 구분)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    for tf, item in out.items():
+        output_dir = Path(__file__).parent / bt.OUTPUT_DIR / f"{timestamp}_tf_{tf}"
+        item['backtest'].save_results(output_dir, item['results'])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""
+워크포워드(Walk-Forward) 최적화
+
+- 리샘플링된 전체 기간을 롤링 학습/검증 구간(fold)으로 분할
+- 학습 구간마다 PARAM_GRID의 모든 조합을 백테스트해서 최적 전략 상수 선택
+- 선택된 상수로 바로 다음 검증(out-of-sample) 구간만 백테스트
+- 검증 구간들의 자산 곡선을 이어 붙여 OOS 성과 산출 (in-sample 과최적화 확인용)
+- 모든 (fold, 파라미터) 조합은 공유 메모리 위에서 프로세스 풀로 동시에 실행 (sweep.run_tasks)
+- bt.USE_INTRABAR_EXITS면 학습/검증 모두 1분봉 봉 내부 체결 판별로 실행 (단일 실행과 같은 체결 방식)
+"""
+
+import itertools
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+import binance_eth_futures_backtest as bt
+from feature_store import with_indicators
+from sweep import fill_mode, load_sweep_data, run_tasks
+
+# ================================
+# 설정
+# ================================
+TRAIN_MONTHS = 6   # 학습 구간 길이 (개월, 30일 기준)
+TEST_MONTHS = 1    # 검증 구간 길이 (개월) = fold 이동 간격
+MIN_TRAIN_TRADES = 10  # 학습 구간 최소 거래 수 (미만이면 점수 제외)
+
+# 학습 구간에서 탐색할 전략 상수 (현재 값 주변)
+PARAM_GRID = {
+    'ADX_STRONG_THRESHOLD': [28.0, 30.0, 32.0],
+    'ADX_WEAK_THRESHOLD': [21.0, 23.0, 25.0],
+    'VOLUME_MIN_THRESHOLD': [1.08, 1.12, 1.16],
+    'STOP_LOSS_ATR_MULT': [0.6, 0.72, 0.85],
+    'TAKE_PROFIT_ATR_MULT': [12.0, 16.0],
+}
+
+
+def param_combinations(grid: Dict[str, List[float]]) -> List[Dict[str, float]]:
+    """그리드의 모든 조합"""
+    names = list(grid.keys())
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[n] for n in names))]
+
+
+def score(results: Dict) -> float:
+    """학습 구간 점수: 수익률 / 최대 낙폭 (거래 수 부족 시 제외)"""
+    if results.get('total_trades', 0) < MIN_TRAIN_TRADES:
+        return float('-inf')
+    return results['total_return_pct'] / max(results['max_drawdown'], 1.0)
+
+
+def make_folds(index: pd.DatetimeIndex, train_months: int = TRAIN_MONTHS,
+               test_months: int = TEST_MONTHS) -> List[Dict]:
+    """
+    롤링 fold 생성 (위치 인덱스 기준, [start, end))
+    검증 구간이 test_months보다 짧게 남으면 마지막 데이터까지 포함
+    """
+    train_len = pd.Timedelta(days=train_months * 30)
+    test_len = pd.Timedelta(days=test_months * 30)
+
+    folds = []
+    train_start_time = index[0]
+    while True:
+        test_start_time = train_start_time + train_len
+        if test_start_time > index[-1]:
+            break
+        test_end_time = test_start_time + test_len
+
+        train_start = int(index.searchsorted(train_start_time, side='left'))
+        test_start = int(index.searchsorted(test_start_time, side='left'))
+        test_end = int(index.searchsorted(test_end_time, side='left'))
+        if test_end - test_start < 2:
+            break
+
+        folds.append({
+            'fold': len(folds),
+            'train_start': train_start,
+            'train_end': test_start,
+            'test_start': test_start,
+            'test_end': test_end,
+        })
+        train_start_time += test_len
+    return folds
+
+
+def run_walk_forward(df: pd.DataFrame, grid: Optional[Dict[str, List[float]]] = None,
+                     train_months: int = TRAIN_MONTHS, test_months: int = TEST_MONTHS,
+                     workers: Optional[int] = None, minutes: Optional[pd.DataFrame] = None) -> Dict:
+    """
+    워크포워드 실행
+    df: load_data() 결과 (리샘플링된 OHLCV). 지표는 전체 기간 기준으로 피처 저장소에서 가져와 fold마다 잘라 씀
+    minutes: 1분봉 high/low (sweep.load_sweep_data). 학습/검증 구간 모두 같은 체결 방식으로 실행
+    """
+    grid = grid or PARAM_GRID
+    combos = param_combinations(grid)
+
+    print("[워크포워드] 전체 기간 지표 준비 중 (피처 저장소)...")
+    df = with_indicators(df)
+    df = df[['open', 'high', 'low', 'close', 'volume'] + list(bt.INDICATOR_COLUMNS)]
+
+    folds = make_folds(df.index, train_months, test_months)
+    if not folds:
+        raise ValueError("fold를 만들 수 없습니다: 데이터 기간이 학습 구간보다 짧습니다")
+    print(f"[워크포워드] fold {len(folds)}개 x 파라미터 조합 {len(combos)}개")
+
+    # 1) 학습 구간: 모든 (fold, 조합) 동시 실행
+    train_tasks = [
+        {'fold': f['fold'], 'combo': c, 'params': params,
+         'start': f['train_start'], 'end': f['train_end']}
+        for f in folds for c, params in enumerate(combos)
+    ]
+    train_out = run_tasks(df, train_tasks, workers, minutes)
+
+    best = {}
+    for out in train_out:
+        s = score(out['results'])
+        fold_id = out['fold']
+        # 동점이면 조합 번호가 작은 쪽 (결과가 실행 순서와 무관하게 결정적)
+        if fold_id not in best or s > best[fold_id]['score']:
+            best[fold_id] = {'score': s, 'combo': out['combo'], 'params': out['params'],
+                             'train_results': out['results']}
+
+    # 2) 검증 구간: fold별 최적 상수로 OOS 백테스트
+    test_tasks = [
+        {'fold': f['fold'], 'params': best[f['fold']]['params'],
+         'start': f['test_start'], 'end': f['test_end'], 'want_equity': True}
+        for f in folds
+    ]
+    test_out = sorted(run_tasks(df, test_tasks, workers, minutes), key=lambda o: o['fold'])
+
+    wf = _stitch(df, folds, best, test_out)
+    wf['fill_mode'] = fill_mode(minutes)
+    return wf
+
+
+def _stitch(df: pd.DataFrame, folds: List[Dict], best: Dict, test_out: List[Dict]) -> Dict:
+    """검증 구간 자산 곡선을 복리로 이어 붙이기 (각 fold는 INITIAL_CAPITAL로 시작하므로 배율로 환산)"""
+    equity_parts = []
+    trades = []
+    fold_rows = []
+    carry = bt.INITIAL_CAPITAL
+
+    for fold, out in zip(folds, test_out):
+        scale = carry / bt.INITIAL_CAPITAL
+        curve = out['equity_curve'] * scale
+        if len(curve) > 0:
+            equity_parts.append(curve)
+            fold_end = float(curve[-1])
+        else:
+            fold_end = carry
+
+        if len(out['trades']) > 0:
+            trades.append(out['trades'].assign(fold=fold['fold']))
+
+        test_results = out['results']
+        fold_rows.append({
+            'fold': fold['fold'],
+            'train_from': df.index[fold['train_start']],
+            'train_to': df.index[fold['train_end'] - 1],
+            'test_from': df.index[fold['test_start']],
+            'test_to': df.index[fold['test_end'] - 1],
+            'train_score': best[fold['fold']]['score'],
+            'train_return_pct': best[fold['fold']]['train_results']['total_return_pct'],
+            'test_trades': test_results['total_trades'],
+            'test_return_pct': test_results['total_return_pct'],
+            'test_max_drawdown': test_results['max_drawdown'],
+            'params': json.dumps(best[fold['fold']]['params'], sort_keys=True),
+        })
+        carry = fold_end
+
+    equity = np.concatenate(equity_parts) if equity_parts else np.array([bt.INITIAL_CAPITAL])
+    peak = np.maximum.accumulate(equity)
+    max_drawdown = float(abs(np.min((equity - peak) / peak)) * 100)
+
+    total_return_pct = (carry - bt.INITIAL_CAPITAL) / bt.INITIAL_CAPITAL * 100
+    return {
+        'folds': pd.DataFrame(fold_rows),
+        'oos_equity': equity,
+        'oos_trades': pd.concat(trades, ignore_index=True) if trades else pd.DataFrame(),
+        'final_capital': carry,
+        'total_return_pct': total_return_pct,
+        'max_drawdown': max_drawdown,
+        'total_trades': sum(len(t) for t in trades),
+    }
+
+
+def save_walk_forward(output_dir: Path, wf: Dict):
+    """워크포워드 결과 저장"""
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    wf['folds'].to_csv(output_dir / 'folds.csv', index=False, encoding='utf-8-sig')
+    print(f"  [저장] fold별 결과: folds.csv ({len(wf['folds'])}개)")
+
+    if len(wf['oos_trades']) > 0:
+        wf['oos_trades'].to_csv(output_dir / 'oos_trades.csv', index=False, encoding='utf-8-sig')
+        print(f"  [저장] OOS 거래 내역: oos_trades.csv ({len(wf['oos_trades'])}건)")
+
+    pd.DataFrame({'bar_index': range(len(wf['oos_equity'])), 'equity': wf['oos_equity']}).to_csv(
+        output_dir / 'oos_equity_curve.csv', index=False, encoding='utf-8-sig')
+    print(f"  [저장] OOS 자산 곡선: oos_equity_curve.csv ({len(wf['oos_equity'])}개)")
+
+    with open(output_dir / 'summary.txt', 'w', encoding='utf-8') as f:
+        f.write("="*60 + "\n")
+        f.write("워크포워드 OOS 성과 요약\n")
+        f.write("="*60 + "\n\n")
+        f.write(f"학습/검증 구간: {TRAIN_MONTHS}개월 / {TEST_MONTHS}개월\n")
+        f.write(f"fold 수: {len(wf['folds'])}개\n")
+        f.write(f"청산 체결: {wf['fill_mode']}\n\n")
+        f.write(f"초기 자본: {bt.INITIAL_CAPITAL} USDT\n")
+        f.write(f"최종 자본: {wf['final_capital']:.2f} USDT\n")
+        f.write(f"OOS 총 수익률: {wf['total_return_pct']:.2f}%\n")
+        f.write(f"OOS 최대 낙폭: {wf['max_drawdown']:.2f}%\n")
+        f.write(f"OOS 총 거래 수: {wf['total_trades']}건\n")
+    print(f"  [저장] 성과 요약: summary.txt")
+
+
+def main():
+    csv_path = Path(__file__).parent / bt.CSV_FILE
+    months = int(sys.argv[1]) if len(sys.argv) > 1 else bt.TEST_MONTHS
+    df, minutes = load_sweep_data(csv_path, months)
+
+    started = datetime.now()
+    wf = run_walk_forward(df, minutes=minutes)
+    elapsed = (datetime.now() - started).total_seconds()
+
+    print(f"\n{'='*60}")
+    print(f"워크포워드 완료 ({elapsed:.1f}초)")
+    print(f"{'='*60}")
+    print(wf['folds'][['fold', 'test_from', 'test_to', 'train_return_pct',
+                       'test_trades', 'test_return_pct']].to_string(index=False))
+    print(f"\nOOS 총 수익률: {wf['total_return_pct']:.2f}%")
+    print(f"OOS 최대 낙폭: {wf['max_drawdown']:.2f}%")
+    print(f"OOS 총 거래 수: {wf['total_trades']}건")
+    print(f"청산 체결: {wf['fill_mode']}")
+
+    timestamp = started.strftime("%Y%m%d_%H%M%S")
+    output_dir = Path(__file__).parent / bt.OUTPUT_DIR / f"{timestamp}_walk_forward"
+    save_walk_forward(output_dir, wf)
+
+
+if __name__ == "__main__":
+    main()
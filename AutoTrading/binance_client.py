@@ -64,6 +64,22 @@ class BinanceFuturesClient:
             logger.error(f"잔고 조회 실패: {e}")
             return None
     
+    def get_margin_balance(self) -> Optional[float]:
+        """
+        USDT 마진 잔고 (지갑 잔고 + 미실현 손익, 포지션 증거금 포함) - 자산 곡선/거래 손익 계산용
+        get_balance(free)는 포지션 증거금이 빠지고 교차 마진에서는 미실현 손익이 이미 반영된 값이라 자산으로 쓰지 않음
+        """
+        try:
+            balance = self.exchange.fetch_balance()
+            info = balance.get('info') or {}
+            if info.get('totalMarginBalance') is not None:
+                return float(info['totalMarginBalance'])
+            total = float(balance.get('USDT', {}).get('total', 0) or 0)
+            return total + float(info.get('totalUnrealizedProfit', 0) or 0)
+        except Exception as e:
+            logger.error(f"마진 잔고 조회 실패: {e}")
+            return None
+    
     def get_current_price(self) -> Optional[float]:
         """현재 가격 조회"""
         try:
@@ -35,6 +35,12 @@ MAX_TRADES_PER_DAY = int(os.getenv('MAX_TRADES_PER_DAY', '10'))  # 일일 최대
 ENABLE_TRADING = os.getenv('ENABLE_TRADING', 'false').lower() == 'true'  # 실제 거래 활성화 여부
 MIN_BALANCE = float(os.getenv('MIN_BALANCE', '10.0'))  # 최소 잔고 (이하일 경우 거래 중단)
 
+# 다중 시간 프레임 (1분봉 1번 조회로 상위 봉/지표를 증분 갱신, TIMEFRAME 포함 쉼표 구분. 비어 있으면 사용 안 함)
+LIVE_TIMEFRAMES = [tf for tf in os.getenv('LIVE_TIMEFRAMES', '').split(',') if tf]
+
+# 섀도 전략 변형 (모의 거래만, JSON 파일 경로. 비어 있으면 사용 안 함)
+SHADOW_VARIANTS_FILE = os.getenv('SHADOW_VARIANTS_FILE', '')
+
 # 로깅
 LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
 LOG_FILE = LOG_DIR / 'trading_bot.log'
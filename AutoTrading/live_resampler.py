@@ -0,0 +1,210 @@
+"""
+실시간 다중 시간 프레임 리샘플러 (완성된 1분봉 1개씩 받아 상위 봉과 지표를 증분 갱신)
+
+- 1분봉을 한 번만 받아 5m/15m/1h/4h 등 여러 봉을 동시에 유지 (시간 프레임마다 REST 조회 안 함)
+- 봉 구간은 UTC 기준 정렬 (바이낸스 캔들과 같음). 구간의 마지막 1분봉이 들어오면 상위 봉 완성 이벤트
+  중간 1분봉이 빠진 채 다음 구간으로 넘어가면 그 시점에 이전 봉을 완성 처리 (빠진 분 수는 gaps에 누적)
+- 지표: trading_strategy.calculate_indicators와 같은 식 (EMA, RSI, ATR, ADX/+DI/-DI, 거래량 비율)을
+  이동 합(deque + 누적 합)으로 봉마다 O(1) 갱신. 1분봉당 작업량은 시간 프레임 수에만 비례
+- 시작 시 시간 프레임별 과거 봉(seed)과 최근 1분봉으로 지표/진행 중인 봉을 한 번 채움 (이후 추가 조회 없음)
+- 완성된 봉은 candle_data와 같은 dict 형식 (timestamp, OHLCV, 지표 컬럼), 시간 프레임별 최근 BUFFER_BARS개 보관
+
+사용법:
+    resampler = LiveResampler(('5m', '15m', '1h', '4h'))
+    resampler.seed('1h', client.get_klines('1h', limit=200)[:-1])   # 시작 시 1번 (완성된 봉만)
+    resampler.seed_minutes(client.get_klines('1m', limit=240)[:-1])  # 진행 중인 상위 봉 채우기
+
+    for timeframe, bar in resampler.on_minute(kline):   # 완성된 1분봉 [ms, o, h, l, c, v]
+        ...                                             # 이번 분에 완성된 상위 봉
+    resampler.latest('4h')                              # 마지막 완성 4시간봉 (지표 포함)
+"""
+
+import math
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+import trading_strategy as ts
+
+# ================================
+# 설정
+# ================================
+MINUTE_MS = 60_000
+BUFFER_BARS = 200        # 시간 프레임별 보관 봉 수 (LiveTradingBot.candle_data와 같은 길이)
+RESUM_EVERY = 10_000     # 이동 합을 다시 더하는 주기 (부동소수점 오차 누적 방지)
+
+
+def timeframe_ms(timeframe: str) -> int:
+    """'5m', '1h', '4h' -> 밀리초"""
+    return int(pd.Timedelta(timeframe).total_seconds() * 1000)
+
+
+class _RollingMean:
+    """최근 n개 값의 평균 (n개가 차기 전에는 NaN, pandas rolling(n).mean()과 같음)"""
+
+    def __init__(self, n: int):
+        self.values = deque(maxlen=n)
+        self.total = 0.0
+        self._updates = 0
+
+    def push(self, value: float) -> float:
+        if len(self.values) == self.values.maxlen:
+            self.total -= self.values[0]
+        self.values.append(value)
+        self.total += value
+        self._updates += 1
+        if self._updates % RESUM_EVERY == 0:
+            self.total = math.fsum(self.values)
+        return self.total / len(self.values) if len(self.values) == self.values.maxlen else math.nan
+
+
+class IncrementalIndicators:
+    """trading_strategy.calculate_indicators 지표를 봉 1개씩 갱신"""
+
+    def __init__(self):
+        self.ema_fast: Optional[float] = None
+        self.ema_slow: Optional[float] = None
+        self.prev: Optional[Tuple[float, float, float]] = None  # 직전 봉 (high, low, close)
+        self._alpha_fast = 2 / (ts.EMA_FAST + 1)
+        self._alpha_slow = 2 / (ts.EMA_SLOW + 1)
+        self._gain = _RollingMean(ts.RSI_PERIOD)
+        self._loss = _RollingMean(ts.RSI_PERIOD)
+        self._atr = _RollingMean(ts.ATR_PERIOD)
+        self._adx_tr = _RollingMean(ts.ADX_PERIOD)
+        self._plus_dm = _RollingMean(ts.ADX_PERIOD)
+        self._minus_dm = _RollingMean(ts.ADX_PERIOD)
+        self._dx = _RollingMean(ts.ADX_PERIOD)
+        self._volume = _RollingMean(ts.VOLUME_MA_PERIOD)
+
+    def update(self, high: float, low: float, close: float, volume: float) -> Dict[str, float]:
+        """완성된 봉 1개 반영 -> 지표 컬럼 값"""
+        # EMA (adjust=False, 첫 값은 종가)
+        if self.ema_fast is None:
+            self.ema_fast, self.ema_slow = close, close
+        else:
+            self.ema_fast += self._alpha_fast * (close - self.ema_fast)
+            self.ema_slow += self._alpha_slow * (close - self.ema_slow)
+
+        # 직전 봉이 없으면 변화량/이동폭은 0, TR은 고가-저가 (pandas의 NaN 처리와 같음)
+        if self.prev is None:
+            delta, tr, up_move, down_move = 0.0, high - low, 0.0, 0.0
+        else:
+            prev_high, prev_low, prev_close = self.prev
+            delta = close - prev_close
+            tr = max(high - low, abs(high - prev_close), abs(low - prev_close))
+            up_move, down_move = high - prev_high, prev_low - low
+        self.prev = (high, low, close)
+
+        # RSI
+        gain = self._gain.push(delta if delta > 0 else 0.0)
+        loss = self._loss.push(-delta if delta < 0 else 0.0)
+        if math.isnan(gain) or math.isnan(loss) or gain == 0 and loss == 0:
+            rsi = math.nan
+        else:
+            rsi = 100.0 if loss == 0 else 100 - 100 / (1 + gain / loss)
+
+        # ATR / ADX (워밍업 구간의 DI/DX는 0, _calculate_adx와 같음)
+        atr = self._atr.push(tr)
+        atr_smooth = self._adx_tr.push(tr)
+        plus_dm = self._plus_dm.push(up_move if up_move > down_move and up_move > 0 else 0.0)
+        minus_dm = self._minus_dm.push(down_move if down_move > up_move and down_move > 0 else 0.0)
+        plus_di = 100 * plus_dm / atr_smooth if atr_smooth > 0 else 0.0
+        minus_di = 100 * minus_dm / atr_smooth if atr_smooth > 0 else 0.0
+        di_sum = plus_di + minus_di
+        adx = self._dx.push(100 * abs(plus_di - minus_di) / di_sum if di_sum > 0 else 0.0)
+
+        # 거래량 비율
+        volume_ma = self._volume.push(volume)
+        volume_ratio = volume / volume_ma if volume_ma == volume_ma and volume_ma != 0 else math.nan
+
+        return {'ema_fast': self.ema_fast, 'ema_slow': self.ema_slow, 'rsi': rsi, 'atr': atr,
+                'adx': adx, 'plus_di': plus_di, 'minus_di': minus_di,
+                'volume_ma': volume_ma, 'volume_ratio': volume_ratio}
+
+
+class _TimeframeState:
+    """시간 프레임 1개: 진행 중인 봉 + 완성된 봉 버퍼 + 지표"""
+
+    def __init__(self, timeframe: str, buffer_bars: int):
+        self.timeframe = timeframe
+        self.ms = timeframe_ms(timeframe)
+        self.bars: deque = deque(maxlen=buffer_bars)
+        self.indicators = IncrementalIndicators()
+        self.last_closed: Optional[int] = None  # 마지막 완성 봉 시작 시각 (ms)
+        self.current: Optional[List[float]] = None  # [시작 ms, open, high, low, close, volume, 분 수]
+
+    def close_bar(self, start: int, o: float, h: float, l: float, c: float, v: float) -> Dict:
+        bar = {'timestamp': pd.Timestamp(start, unit='ms'), 'open': o, 'high': h, 'low': l, 'close': c,
+               'volume': v}
+        bar.update(self.indicators.update(h, l, c, v))
+        self.bars.append(bar)
+        self.last_closed = start
+        return bar
+
+
+class LiveResampler:
+    """완성된 1분봉 -> 여러 시간 프레임 봉/지표 (증분)"""
+
+    def __init__(self, timeframes: Sequence[str] = ('5m', '15m', '1h', '4h'), buffer_bars: int = BUFFER_BARS):
+        self.states = {tf: _TimeframeState(tf, buffer_bars) for tf in timeframes}
+        self.last_minute: Optional[int] = None  # 마지막으로 받은 1분봉 시작 시각 (ms)
+        self.gaps = 0                           # 빠진 1분봉 수 (연결 끊김 등)
+
+    def seed(self, timeframe: str, klines: Iterable[Sequence[float]]):
+        """완성된 과거 봉 [ms, o, h, l, c, v]로 지표/버퍼 채우기 (시작 시 1번)"""
+        state = self.states[timeframe]
+        for kline in klines:
+            start = int(kline[0])
+            if state.last_closed is None or start > state.last_closed:
+                state.close_bar(start, *(float(x) for x in kline[1:6]))
+
+    def seed_minutes(self, klines: Iterable[Sequence[float]]):
+        """최근 완성된 1분봉으로 진행 중인 상위 봉 채우기 (이미 seed된 구간은 무시, 이벤트 버림)"""
+        for kline in klines:
+            self.on_minute(kline)
+
+    def on_minute(self, kline: Sequence[float]) -> List[Tuple[str, Dict]]:
+        """
+        완성된 1분봉 1개 반영
+        Returns: 이번 분에 완성된 (시간 프레임, 봉) 목록 (짧은 시간 프레임부터). 이미 받은 분이면 빈 목록
+        """
+        minute = int(kline[0])
+        if self.last_minute is not None and minute <= self.last_minute:
+            return []
+        if self.last_minute is not None and minute - self.last_minute > MINUTE_MS:
+            self.gaps += (minute - self.last_minute) // MINUTE_MS - 1
+        self.last_minute = minute
+        o, h, l, c, v = (float(x) for x in kline[1:6])
+
+        events = []
+        for tf, state in sorted(self.states.items(), key=lambda item: item[1].ms):
+            start = minute - minute % state.ms
+            if state.last_closed is not None and start <= state.last_closed:
+                continue  # seed된 봉에 이미 포함된 분
+            cur = state.current
+            if cur is not None and cur[0] != start:
+                # 구간 마지막 분이 빠진 채 다음 구간으로 넘어감 -> 이전 봉 완성 처리
+                events.append((tf, state.close_bar(*cur[:6])))
+                cur = None
+            if cur is None:
+                state.current = cur = [start, o, h, l, c, v, 1]
+            else:
+                cur[2] = max(cur[2], h)
+                cur[3] = min(cur[3], l)
+                cur[4] = c
+                cur[5] += v
+                cur[6] += 1
+            if minute + MINUTE_MS == start + state.ms:
+                events.append((tf, state.close_bar(*cur[:6])))
+                state.current = None
+        return events
+
+    def latest(self, timeframe: str) -> Optional[Dict]:
+        """마지막 완성 봉 (지표 포함)"""
+        bars = self.states[timeframe].bars
+        return bars[-1] if bars else None
+
+    def bars(self, timeframe: str) -> List[Dict]:
+        """완성된 봉 목록 (오래된 순, candle_data와 같은 형식)"""
+        return list(self.states[timeframe].bars)
@@ -11,6 +11,9 @@ from typing import Optional, Dict
 from pathlib import Path
 
 from trading_strategy import TradingStrategy
+from performance_metrics import PerformanceMetrics, bars_per_year
+from shadow_variants import ShadowBook
+from live_resampler import LiveResampler, BUFFER_BARS, timeframe_ms
 from binance_client import BinanceFuturesClient
 import config
 
@@ -25,6 +28,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+MINUTE_POLL_LIMIT = 5  # 1분봉 조회 개수 (마지막 1개는 진행 중, 조회가 늦어도 4분까지 누락 없음)
+
 
 class LiveTradingBot:
     """실전 거래 봇"""
@@ -45,6 +50,10 @@ class LiveTradingBot:
         self.daily_pnl = 0.0
         self.initial_balance = None
         self.max_equity = None
+        self.metrics: Optional[PerformanceMetrics] = None  # 실시간 성과 지표 (백테스트와 같은 계산)
+        self.open_trade: Optional[Dict] = None  # 진입 시점 잔고/추세 강도 (청산 시 손익 계산용)
+        self.shadows: Optional[ShadowBook] = None  # 섀도 변형 모의 거래 (주문 없음)
+        self.resampler: Optional[LiveResampler] = None  # 1분봉 -> 다중 시간 프레임 봉/지표 (LIVE_TIMEFRAMES)
         
         # 데이터 저장
         self.candle_data = []  # 캔들 데이터 저장
@@ -72,8 +81,17 @@ class LiveTradingBot:
         
         self.initial_balance = balance
         self.max_equity = balance
+        # 성과 지표 자산 = 마진 잔고 (지갑 잔고 + 미실현 손익, free 잔고는 증거금이 빠져 있음)
+        equity = self.client.get_margin_balance()
+        self.metrics = PerformanceMetrics(equity if equity is not None else balance, bars_per_year(config.TIMEFRAME))
         logger.info(f"초기 잔고: {balance:.2f} USDT")
         
+        # 섀도 변형 (같은 캔들/지표로 모의 거래)
+        if config.SHADOW_VARIANTS_FILE:
+            self.shadows = ShadowBook.from_file(config.SHADOW_VARIANTS_FILE, balance, config.TIMEFRAME)
+            logger.info(f"섀도 변형 {len(self.shadows.variants)}개: "
+                        f"{', '.join(v.name for v in self.shadows.variants)}")
+        
         # 기존 포지션 확인
         position = self.client.get_position()
         if position:
@@ -101,10 +119,69 @@ class LiveTradingBot:
         self.candle_data = df.to_dict('records')
         
         logger.info(f"캔들 데이터 {len(df)}개 수집 완료")
+        
+        if config.LIVE_TIMEFRAMES and not self.init_resampler():
+            return False
         logger.info("="*60)
         
         return True
     
+    def init_resampler(self) -> bool:
+        """
+        다중 시간 프레임 리샘플러 초기화 (시작 시 시간 프레임별 과거 봉 + 최근 1분봉 1번씩 조회)
+        이후에는 1분봉 조회 1번으로 모든 시간 프레임을 갱신
+        """
+        timeframes = list(dict.fromkeys(config.LIVE_TIMEFRAMES + [config.TIMEFRAME]))
+        self.resampler = LiveResampler(timeframes)
+        for tf in timeframes:
+            klines = self.client.get_klines(tf, limit=BUFFER_BARS + 1)
+            if not klines:
+                logger.error(f"{tf} 캔들 데이터 수집 실패")
+                return False
+            self.resampler.seed(tf, klines[:-1])  # 마지막 봉은 진행 중
+        
+        # 진행 중인 상위 봉을 채울 만큼의 최근 1분봉
+        minutes = max(timeframe_ms(tf) for tf in timeframes) // 60_000
+        klines = self.client.get_klines('1m', limit=minutes + 1)
+        if not klines:
+            logger.error("1분봉 데이터 수집 실패")
+            return False
+        self.resampler.seed_minutes(klines[:-1])
+        # 이후 캔들 데이터는 리샘플러 버퍼 (완성된 봉만, 지표 증분 계산)
+        self.candle_data = self.resampler.bars(config.TIMEFRAME)
+        logger.info(f"다중 시간 프레임: {', '.join(timeframes)} (1분봉 증분 갱신)")
+        return True
+    
+    def poll_minutes(self) -> list:
+        """
+        완성된 1분봉을 리샘플러에 반영 (조회 1번)
+        Returns: 이번에 완성된 config.TIMEFRAME 봉 목록 (오래된 순, candle_data와 같은 dict, 없으면 빈 목록)
+                 조회가 늦어 봉 여러 개가 한 번에 완성되면 모두 반환
+        """
+        klines = self.client.get_klines('1m', limit=MINUTE_POLL_LIMIT)
+        if not klines:
+            return []
+        gaps = self.resampler.gaps
+        closed = []
+        for kline in klines[:-1]:  # 마지막 봉은 진행 중
+            for tf, bar in self.resampler.on_minute(kline):
+                logger.debug(f"[{tf}] 봉 완성: {bar['timestamp']} 종가 {bar['close']:.2f}")
+                if tf == config.TIMEFRAME:
+                    closed.append(bar)
+        if self.resampler.gaps > gaps:
+            logger.warning(f"1분봉 누락 {self.resampler.gaps - gaps}개 (조회 간격이 {MINUTE_POLL_LIMIT - 1}분 초과)")
+        return closed
+    
+    def log_metrics(self):
+        """현재까지 성과 요약 로그 (PerformanceMetrics 누적값, 과거 기록 재조회 없음)"""
+        m = self.metrics.summary()
+        logger.info(f"[성과] 거래 {m['total_trades']}건, 승률 {m['win_rate']:.1f}%, "
+                    f"수익 팩터 {m['profit_factor']:.2f}, 최대 낙폭 {m['max_drawdown']:.2f}%, "
+                    f"샤프 {m['sharpe_ratio']:.2f}, 소르티노 {m['sortino_ratio']:.2f}, 노출 {m['exposure_pct']:.1f}%, "
+                    f"최근 {m['rolling_trades']}건 승률 {m['rolling_win_rate']:.1f}%")
+        if self.shadows is not None:
+            self.shadows.log_summary(logger)
+    
     def check_risk_limits(self) -> bool:
         """리스크 제한 확인"""
         balance = self.client.get_balance()
@@ -189,12 +266,11 @@ class LiveTradingBot:
             df['timestamp'] = pd.to_datetime(df['timestamp'])
             df.set_index('timestamp', inplace=True)
             
-            row = df.iloc[-1]
-            prev_row = df.iloc[-2]
-            
-            should_enter, direction = self.strategy.check_entry_signal(row, prev_row)
+            # 마지막 봉 신호 (백테스트/섀도 변형과 같은 entry_rules, 직전 봉은 EMA 교차 확인용)
+            signal = self.strategy.generate_signals(df.iloc[-2:]).iloc[-1]
+            direction = "long" if signal['long'] else ("short" if signal['short'] else "")
             
-            if should_enter:
+            if direction:
                 logger.info(f"진입 신호 발견: {direction}")
                 return direction
             
@@ -239,6 +315,9 @@ class LiveTradingBot:
                 logger.warning("포지션 크기가 0 이하")
                 return False
             
+            # 진입 전 마진 잔고 (청산 후 마진 잔고와의 차이 = 거래 순손익)
+            equity_before = self.client.get_margin_balance()
+            
             # 주문 실행
             side = 'buy' if direction == 'long' else 'sell'
             order = self.client.place_market_order(side, quantity)
@@ -283,6 +362,7 @@ class LiveTradingBot:
                 'volume_ratio': volume_ratio
             }
             
+            self.open_trade = {'balance_before': equity_before, 'trend_strength': trend_strength}
             self.daily_trades += 1
             logger.info(f"포지션 진입 완료: {direction} {quantity:.3f} @ {current_price:.2f}")
             
@@ -292,6 +372,24 @@ class LiveTradingBot:
             logger.error(f"포지션 진입 실패: {e}")
             return False
     
+    def record_closed_trade(self):
+        """거래소에서 포지션이 청산됨 (손절/익절 주문 체결 등): 거래 1건 기록 후 포지션 상태 초기화"""
+        logger.info("포지션이 청산되었습니다")
+        
+        # 포지션 정보 로깅
+        exit_price = self.client.get_current_price()
+        if exit_price:
+            logger.info(f"청산 가격: {exit_price:.2f}")
+        
+        # 성과 지표: 진입 전 마진 잔고 대비 변화를 거래 1건의 순손익으로 기록 (수수료/펀딩비 포함)
+        equity = self.client.get_margin_balance()
+        if self.open_trade and self.open_trade['balance_before'] is not None and equity is not None:
+            self.metrics.update_trade(equity - self.open_trade['balance_before'],
+                                      trend_strength=self.open_trade['trend_strength'])
+            self.log_metrics()
+        self.open_trade = None
+        self.position = None
+    
     def check_exit_conditions(self) -> bool:
         """청산 조건 확인 (주문이 체결되었는지 확인)"""
         if not self.position:
@@ -302,14 +400,7 @@ class LiveTradingBot:
             
             # 포지션이 없으면 청산된 것
             if not position or position['size'] == 0:
-                logger.info("포지션이 청산되었습니다")
-                
-                # 포지션 정보 로깅
-                exit_price = self.client.get_current_price()
-                if exit_price:
-                    logger.info(f"청산 가격: {exit_price:.2f}")
-                
-                self.position = None
+                self.record_closed_trade()
                 return True
             
             return False
@@ -335,15 +426,22 @@ class LiveTradingBot:
                     logger.error("리스크 제한 도달. 거래 중단")
                     break
                 
-                # 최신 캔들 데이터 조회
-                klines = self.client.get_klines(config.TIMEFRAME, limit=1)
-                if not klines:
-                    logger.warning("캔들 데이터 조회 실패")
-                    time.sleep(60)
-                    continue
-                
-                latest_candle = klines[-1]
-                candle_time = pd.to_datetime(latest_candle[0], unit='ms')
+                # 최신 캔들 데이터 조회 (다중 시간 프레임이면 1분봉으로 모든 봉 갱신)
+                if self.resampler is not None:
+                    closed_bars = self.poll_minutes()
+                    if not closed_bars:
+                        time.sleep(30)
+                        continue
+                    candle_time = closed_bars[-1]['timestamp']
+                else:
+                    klines = self.client.get_klines(config.TIMEFRAME, limit=1)
+                    if not klines:
+                        logger.warning("캔들 데이터 조회 실패")
+                        time.sleep(60)
+                        continue
+                    latest_candle = klines[-1]
+                    candle_time = pd.to_datetime(latest_candle[0], unit='ms')
+                    closed_bars = [latest_candle]
                 
                 # 새 봉이 완성되었는지 확인
                 if self.last_candle_time and candle_time <= self.last_candle_time:
@@ -355,17 +453,29 @@ class LiveTradingBot:
                 logger.info(f"새 봉 완성: {candle_time}")
                 self.last_candle_time = candle_time
                 
-                # 캔들 데이터 업데이트
-                if not self.update_candle_data(latest_candle):
+                # 캔들 데이터 업데이트 (리샘플러가 있으면 그 버퍼를 그대로 사용, 지표 재계산 없음)
+                if self.resampler is not None:
+                    self.candle_data = self.resampler.bars(config.TIMEFRAME)
+                    if len(closed_bars) > 1:
+                        logger.warning(f"봉 {len(closed_bars)}개가 한 번에 완성됨 (진입 확인은 마지막 봉만)")
+                elif not self.update_candle_data(latest_candle):
                     logger.warning("캔들 데이터 업데이트 실패")
                     continue
                 
+                # 섀도 변형 모의 거래 (같은 캔들 버퍼, 주문/API 호출 없음). 한 번에 완성된 봉은 오래된 순으로 모두
+                if self.shadows is not None:
+                    for pending in range(len(closed_bars) - 1, -1, -1):
+                        self.shadows.on_bar(self.candle_data[:len(self.candle_data) - pending])
+                
                 # 현재 포지션 확인
                 current_position = self.client.get_position()
                 
                 if not current_position:
-                    # 포지션이 없으면 진입 신호 확인
-                    if not self.position:
+                    if self.position:
+                        # 직전 봉 이후 거래소 손절/익절 주문으로 청산됨 (이번 봉은 진입하지 않음)
+                        self.record_closed_trade()
+                    else:
+                        # 포지션이 없으면 진입 신호 확인
                         direction = self.check_entry_signal()
                         if direction:
                             self.enter_position(direction)
@@ -387,6 +497,16 @@ class LiveTradingBot:
                     if not self.max_equity or balance > self.max_equity:
                         self.max_equity = balance
                 
+                # 봉 단위 성과 지표 (자산 = 마진 잔고(증거금/미실현 손익 포함), 노출 = 포지션 수량 x 종가)
+                equity = self.client.get_margin_balance()
+                if equity:
+                    exposure = 0.0
+                    if current_position:
+                        exposure = current_position['size'] * float(self.candle_data[-1]['close'])
+                        if current_position['side'] == 'short':
+                            exposure = -exposure
+                    self.metrics.update_bar(equity, exposure)
+                
                 # 대기 (다음 봉 완성까지)
                 time.sleep(60)
                 
@@ -395,5 +515,7 @@ class LiveTradingBot:
         except Exception as e:
             logger.error(f"예상치 못한 오류: {e}", exc_info=True)
         finally:
+            if self.metrics is not None:
+                self.log_metrics()
             logger.info("거래 봇 종료")
 
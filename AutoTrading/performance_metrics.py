@@ -0,0 +1,273 @@
+"""
+스트리밍 성과 지표 모듈
+백테스트와 실전 거래에서 공통으로 사용 (거래/봉이 들어올 때마다 O(1)로 갱신, 과거 기록을 다시 읽지 않음)
+
+- 거래 단위: 거래 수, 승률, 평균 수익/손실, 손익비, 수익 팩터, 최대 수익/손실, 손절/익절 비율,
+  추세 강도별 거래 수/손익, 펀딩비 (백테스트 _generate_results의 기존 항목 전부)
+- 봉 단위: 최대 낙폭, 봉 수익률 평균/표준편차(Welford) -> 샤프/소르티노 비율(연율화), 변동성,
+  시장 노출 비율(포지션 보유 봉 비율), 평균 레버리지(|노출| / 자산)
+- 롤링: 최근 ROLLING_TRADES건 승률/손익, 최근 ROLLING_DAYS일 봉 수익률/샤프 (고정 길이 deque + 누적 합)
+- update_bars: 봉 배열을 한 번에 반영 (백테스트용). 낙폭/롤링 값은 update_bar를 봉마다 호출한 것과 같고,
+  평균/분산은 구간 병합 공식으로 합침 (부동소수점 오차 수준 차이)
+"""
+
+import math
+from collections import deque
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# ================================
+# 설정
+# ================================
+ROLLING_TRADES = 20       # 롤링 승률/손익 거래 수
+ROLLING_DAYS = 30         # 롤링 수익률/샤프 기간 (봉 수는 periods_per_year로 환산)
+ROLLING_BARS = 96 * 30    # periods_per_year가 없을 때 롤링 봉 수 (15분봉 30일)
+DAYS_PER_YEAR = 365       # 코인 선물은 24시간/365일 거래
+
+
+def bars_per_year(timeframe: str) -> float:
+    """봉 주기 -> 연간 봉 수 (샤프/소르티노 연율화용). '15min', '15m', '1h' 등 pandas 주기 문자열"""
+    return pd.Timedelta(days=DAYS_PER_YEAR) / pd.Timedelta(timeframe)
+
+
+class _RollingSum:
+    """최근 n개 값의 합/제곱합 (값이 n개를 넘으면 가장 오래된 값을 빼고, n번마다 다시 합산해서 오차 누적 방지)"""
+
+    def __init__(self, n: int):
+        self.values = deque(maxlen=n)
+        self.total = 0.0
+        self.total_sq = 0.0
+        self._updates = 0
+
+    def push(self, value: float):
+        if len(self.values) == self.values.maxlen:
+            old = self.values[0]
+            self.total -= old
+            self.total_sq -= old * old
+        self.values.append(value)
+        self.total += value
+        self.total_sq += value * value
+        self._updates += 1
+        if self._updates % self.values.maxlen == 0:
+            self._resum()
+
+    def extend(self, values: np.ndarray):
+        """배열 뒤쪽 n개만 남기고 다시 합산 (push를 값마다 호출한 것과 같은 창)"""
+        self.values.extend(values[-self.values.maxlen:].tolist())
+        self._updates += len(values)
+        self._resum()
+
+    def _resum(self):
+        self.total = math.fsum(self.values)
+        self.total_sq = math.fsum(v * v for v in self.values)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class PerformanceMetrics:
+    """성과 지표 누적기 (update_trade: 청산 1건, update_bar: 봉 1개)"""
+
+    def __init__(self, initial_capital: float, periods_per_year: Optional[float] = None,
+                 rolling_trades: int = ROLLING_TRADES, rolling_bars: Optional[int] = None):
+        """
+        Args:
+            initial_capital: 초기 자본 (첫 봉 수익률 기준)
+            periods_per_year: 연간 봉 수 (bars_per_year). None이면 샤프/소르티노를 봉 단위로 보고 (연율화 안 함)
+            rolling_bars: 롤링 봉 수 (기본은 periods_per_year로 환산한 ROLLING_DAYS일, 없으면 ROLLING_BARS)
+        """
+        self.initial_capital = initial_capital
+        self.periods_per_year = periods_per_year
+        if rolling_bars is None:
+            rolling_bars = max(1, round(periods_per_year * ROLLING_DAYS / DAYS_PER_YEAR)) if periods_per_year \
+                else ROLLING_BARS
+
+        # 거래 단위
+        self.trades = 0
+        self.wins = 0
+        self.win_pnl = 0.0    # 수익 거래 순손익 합
+        self.loss_pnl = 0.0   # 손실 거래(순손익 <= 0) 순손익 합
+        self.max_win = 0.0
+        self.max_loss = 0.0
+        self.net_pnl = 0.0
+        self.funding_cost = 0.0
+        self.exit_reasons: Dict[str, int] = {}
+        self.trend_trades: Dict[str, int] = {}
+        self.trend_pnl: Dict[str, float] = {}
+        self._rolling_pnl = _RollingSum(rolling_trades)
+        self._rolling_wins = _RollingSum(rolling_trades)
+
+        # 봉 단위
+        self.bars = 0
+        self.equity = initial_capital   # 마지막 봉 자산
+        self.peak: Optional[float] = None
+        self.min_drawdown = 0.0         # 최고점 대비 최저 비율 (0 이하)
+        self._mean = 0.0                # 봉 수익률 평균 / 편차 제곱합 (Welford)
+        self._m2 = 0.0
+        self._downside_sq = 0.0         # 음수 수익률 제곱합 (소르티노)
+        self.bars_in_market = 0
+        self._leverage_sum = 0.0
+        self._rolling_returns = _RollingSum(rolling_bars)
+        self._rolling_equity = deque([initial_capital], maxlen=rolling_bars + 1)
+
+    # ================================
+    # 갱신
+    # ================================
+    def update_trade(self, net_pnl: float, exit_reason: Optional[str] = None,
+                     trend_strength: Optional[str] = None, funding_cost: float = 0.0):
+        """청산 1건 반영 (부분 익절도 1건)"""
+        self.trades += 1
+        self.net_pnl += net_pnl
+        self.funding_cost += funding_cost
+        if net_pnl > 0:
+            self.wins += 1
+            self.win_pnl += net_pnl
+            self.max_win = max(self.max_win, net_pnl)
+        else:
+            self.loss_pnl += net_pnl
+            self.max_loss = min(self.max_loss, net_pnl)
+        if exit_reason is not None:
+            self.exit_reasons[exit_reason] = self.exit_reasons.get(exit_reason, 0) + 1
+        if trend_strength is not None:
+            self.trend_trades[trend_strength] = self.trend_trades.get(trend_strength, 0) + 1
+            self.trend_pnl[trend_strength] = self.trend_pnl.get(trend_strength, 0.0) + net_pnl
+        self._rolling_pnl.push(net_pnl)
+        self._rolling_wins.push(1.0 if net_pnl > 0 else 0.0)
+
+    def update_bar(self, equity: float, exposure: float = 0.0):
+        """
+        봉 1개 반영
+        equity: 봉 마감 자산 (미실현 손익 포함), exposure: 포지션 명목 금액 (롱 +, 숏 -, 없으면 0)
+        """
+        ret = equity / self.equity - 1
+        self.bars += 1
+        delta = ret - self._mean
+        self._mean += delta / self.bars
+        self._m2 += delta * (ret - self._mean)
+        if ret < 0:
+            self._downside_sq += ret * ret
+
+        self.peak = equity if self.peak is None else max(self.peak, equity)
+        self.min_drawdown = min(self.min_drawdown, (equity - self.peak) / self.peak)
+        if exposure != 0:
+            self.bars_in_market += 1
+            self._leverage_sum += abs(exposure) / equity
+
+        self.equity = equity
+        self._rolling_returns.push(ret)
+        self._rolling_equity.append(equity)
+
+    def update_bars(self, equity: np.ndarray, exposure: Optional[np.ndarray] = None):
+        """봉 배열 한 번에 반영 (백테스트 종료 후 자산/노출 곡선 전체)"""
+        equity = np.asarray(equity, dtype=np.float64)
+        n = len(equity)
+        if n == 0:
+            return
+        returns = equity / np.concatenate(([self.equity], equity[:-1])) - 1
+
+        # 평균/분산: 기존 구간과 새 구간 병합 (Chan et al.)
+        mean_b = float(returns.mean())
+        m2_b = float(((returns - mean_b) ** 2).sum())
+        total = self.bars + n
+        delta = mean_b - self._mean
+        self._m2 += m2_b + delta * delta * self.bars * n / total
+        self._mean += delta * n / total
+        self.bars = total
+        self._downside_sq += float(np.square(returns[returns < 0]).sum())
+
+        if self.peak is None:
+            peaks = np.maximum.accumulate(equity)
+        else:
+            peaks = np.maximum.accumulate(np.concatenate(([self.peak], equity)))[1:]
+        self.min_drawdown = min(self.min_drawdown, float(np.min((equity - peaks) / peaks)))
+        self.peak = float(peaks[-1])
+        if exposure is not None:
+            exposure = np.asarray(exposure, dtype=np.float64)
+            in_market = exposure != 0
+            self.bars_in_market += int(in_market.sum())
+            self._leverage_sum += float((np.abs(exposure[in_market]) / equity[in_market]).sum())
+
+        self.equity = float(equity[-1])
+        self._rolling_returns.extend(returns)
+        self._rolling_equity.extend(equity[-self._rolling_equity.maxlen:].tolist())
+
+    # ================================
+    # 조회
+    # ================================
+    def _annualize(self, ratio: float) -> float:
+        return ratio * math.sqrt(self.periods_per_year) if self.periods_per_year else ratio
+
+    def sharpe_ratio(self) -> float:
+        if self.bars < 2 or self._m2 <= 0:
+            return 0.0
+        return self._annualize(self._mean / math.sqrt(self._m2 / (self.bars - 1)))
+
+    def sortino_ratio(self) -> float:
+        if self.bars == 0 or self._downside_sq <= 0:
+            return 0.0
+        return self._annualize(self._mean / math.sqrt(self._downside_sq / self.bars))
+
+    def rolling_sharpe(self) -> float:
+        r = self._rolling_returns
+        n = len(r)
+        if n < 2:
+            return 0.0
+        mean = r.total / n
+        var = (r.total_sq - n * mean * mean) / (n - 1)
+        return self._annualize(mean / math.sqrt(var)) if var > 0 else 0.0
+
+    def summary(self, final_capital: Optional[float] = None) -> Dict:
+        """
+        성과 요약 (_generate_results 형식 + 위험 조정/노출/롤링 지표)
+        final_capital: 최종 자본 (기본은 마지막 봉 자산, 봉이 없으면 초기 자본 + 누적 순손익)
+        """
+        if final_capital is None:
+            final_capital = self.equity if self.bars else self.initial_capital + self.net_pnl
+        losses = self.trades - self.wins
+        avg_win = self.win_pnl / self.wins if self.wins else 0.0
+        avg_loss = self.loss_pnl / losses if losses else 0.0
+        stop_loss_trades = self.exit_reasons.get('STOP_LOSS', 0)
+        take_profit_trades = self.exit_reasons.get('TAKE_PROFIT', 0)
+        total_return = final_capital - self.initial_capital
+        std = math.sqrt(self._m2 / (self.bars - 1)) if self.bars >= 2 and self._m2 > 0 else 0.0
+        rolling_trades = len(self._rolling_pnl)
+
+        return {
+            'total_trades': self.trades,
+            'winning_trades': self.wins,
+            'losing_trades': losses,
+            'win_rate': self.wins / self.trades * 100 if self.trades else 0.0,
+            'total_return': total_return,
+            'total_return_pct': total_return / self.initial_capital * 100,
+            'final_capital': final_capital,
+            'max_drawdown': abs(self.min_drawdown) * 100,
+            'profit_factor': abs(self.win_pnl / self.loss_pnl) if losses and self.loss_pnl < 0 else 0.0,
+            'avg_win': avg_win,
+            'avg_loss': avg_loss,
+            'risk_reward_ratio': avg_win / abs(avg_loss) if avg_loss < 0 else 0.0,
+            'max_win': self.max_win,
+            'max_loss': self.max_loss,
+            'stop_loss_trades': stop_loss_trades,
+            'take_profit_trades': take_profit_trades,
+            'stop_loss_rate': stop_loss_trades / self.trades * 100 if self.trades else 0.0,
+            'take_profit_rate': take_profit_trades / self.trades * 100 if self.trades else 0.0,
+            'strong_trend_trades': self.trend_trades.get('STRONG', 0),
+            'strong_trend_pnl': self.trend_pnl.get('STRONG', 0.0),
+            'weak_trend_trades': self.trend_trades.get('WEAK', 0),
+            'weak_trend_pnl': self.trend_pnl.get('WEAK', 0.0),
+            'total_funding_cost': self.funding_cost,
+            # 위험 조정 / 노출
+            'sharpe_ratio': self.sharpe_ratio(),
+            'sortino_ratio': self.sortino_ratio(),
+            'volatility_pct': self._annualize(std) * 100,
+            'exposure_pct': self.bars_in_market / self.bars * 100 if self.bars else 0.0,
+            'avg_leverage': self._leverage_sum / self.bars_in_market if self.bars_in_market else 0.0,
+            # 롤링 (최근 ROLLING_TRADES건 / ROLLING_DAYS일 봉)
+            'rolling_trades': rolling_trades,
+            'rolling_win_rate': self._rolling_wins.total / rolling_trades * 100 if rolling_trades else 0.0,
+            'rolling_pnl': self._rolling_pnl.total,
+            'rolling_return_pct': (self.equity / self._rolling_equity[0] - 1) * 100,
+            'rolling_sharpe': self.rolling_sharpe(),
+        }
@@ -0,0 +1,216 @@
+"""
+섀도 전략 변형 모듈 (실전 봇과 같은 캔들/지표로 여러 파라미터 변형을 모의 거래)
+
+- LiveTradingBot의 캔들 버퍼와 지표 컬럼을 그대로 사용 (추가 API 호출/지표 계산 없음)
+- 변형은 임계값/배수만 다르게 지정 (SHADOW_PARAM_NAMES). 지표 기간은 공유 컬럼을 쓰므로 변경 불가
+- 새 봉마다 공통 값(EMA/RSI/ADX/거래량/ATR)을 한 번 읽고, 모든 변형의 진입 조건을 배열로 한 번에 계산
+  (trading_strategy.entry_rules에 변형 축 임계값 배열을 넘김, 실전 봇/백테스트와 같은 규칙 구현)
+- 변형별 모의 체결: 신호 봉 종가 + 슬리피지로 진입, 이후 봉 고가/저가로 손절 > 부분 익절 > 익절 순서 확인
+  (백테스트와 같은 규칙, 펀딩비 제외). 수수료는 trading_strategy.FEE_RATE
+- 변형별 PerformanceMetrics (백테스트/실전 봇과 같은 성과 지표)
+- 주문은 실전 봇(primary)만 보냄. 'primary' 변형은 기본 상수 그대로의 모의 거래 (실제 체결과 비교용)
+
+사용법:
+    config.SHADOW_VARIANTS_FILE (환경 변수)에 JSON 파일 경로 지정
+    {"rsi_loose": {"RSI_LONG_MIN": 52, "RSI_SHORT_MAX": 48}, "wide_stop": {"STOP_LOSS_ATR_MULT": 1.0}}
+
+    book = ShadowBook.from_file(path, initial_capital=30.0)
+    book.on_bar(candle_data)      # 새 봉 완성 후 (LiveTradingBot.candle_data, 지표 포함)
+    book.log_summary(logger)
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+import trading_strategy as ts
+from performance_metrics import PerformanceMetrics, bars_per_year
+
+# ================================
+# 설정
+# ================================
+SLIPPAGE_RATE = 0.0005  # 모의 체결 슬리피지 (백테스트와 같은 값)
+PRIMARY_VARIANT = 'primary'
+
+# 변형별로 바꿀 수 있는 전략 상수 (진입 규칙 임계값/비율 + 청산 배수)
+SHADOW_PARAM_NAMES = ts.RULE_PARAM_NAMES + (
+    'STOP_LOSS_ATR_MULT', 'TAKE_PROFIT_ATR_MULT', 'PARTIAL_TAKE_PROFIT_ATR_MULT', 'PARTIAL_TAKE_PROFIT_RATIO',
+)
+
+
+def default_params() -> Dict[str, float]:
+    """trading_strategy의 현재 상수 값 (primary 변형)"""
+    return {name: getattr(ts, name) for name in SHADOW_PARAM_NAMES}
+
+
+class ShadowVariant:
+    """변형 1개의 모의 거래 상태"""
+
+    def __init__(self, name: str, params: Dict[str, float], initial_capital: float,
+                 periods_per_year: Optional[float] = None):
+        self.name = name
+        self.params = params
+        self.capital = initial_capital
+        self.position: Optional[Dict] = None
+        self.metrics = PerformanceMetrics(initial_capital, periods_per_year)
+
+    def enter(self, direction: str, price: float, atr: float, trend_strength: str, capital_ratio: float,
+              entry_time):
+        p = self.params
+        fill_price = price * (1 + SLIPPAGE_RATE) if direction == 'long' else price * (1 - SLIPPAGE_RATE)
+        capital_used = self.capital * capital_ratio
+        quantity = capital_used * ts.LEVERAGE / fill_price
+        if quantity <= 0 or not np.isfinite(atr) or atr <= 0:
+            return
+        sign = 1 if direction == 'long' else -1
+        self.capital -= fill_price * quantity * ts.FEE_RATE
+        self.position = {
+            'side': direction,
+            'entry_price': fill_price,
+            'entry_time': entry_time,
+            'quantity': quantity,
+            'remaining_quantity': quantity,
+            'stop_loss': fill_price - sign * atr * p['STOP_LOSS_ATR_MULT'],
+            'take_profit': fill_price + sign * atr * p['TAKE_PROFIT_ATR_MULT'],
+            'partial_take_profit': fill_price + sign * atr * p['PARTIAL_TAKE_PROFIT_ATR_MULT'],
+            'partial_taken': False,
+            'trend_strength': trend_strength,
+        }
+
+    def check_exit(self, high: float, low: float):
+        """봉 고가/저가로 청산 확인 (손절 > 부분 익절 > 익절)"""
+        pos = self.position
+        if pos['side'] == 'long':
+            stop_hit = low <= pos['stop_loss']
+            partial_hit = high >= pos['partial_take_profit']
+            tp_hit = high >= pos['take_profit']
+        else:
+            stop_hit = high >= pos['stop_loss']
+            partial_hit = low <= pos['partial_take_profit']
+            tp_hit = low <= pos['take_profit']
+
+        if stop_hit:
+            self._exit(pos['stop_loss'], 'STOP_LOSS', pos['remaining_quantity'])
+        elif partial_hit and not pos['partial_taken']:
+            pos['partial_taken'] = True
+            quantity = pos['quantity'] * self.params['PARTIAL_TAKE_PROFIT_RATIO']
+            self._exit(pos['partial_take_profit'], 'PARTIAL_TAKE_PROFIT', quantity)
+        elif tp_hit:
+            self._exit(pos['take_profit'], 'TAKE_PROFIT', pos['remaining_quantity'])
+
+    def _exit(self, price: float, reason: str, quantity: float):
+        pos = self.position
+        if pos['side'] == 'long':
+            fill_price = price * (1 - SLIPPAGE_RATE)
+            gross_pnl = (fill_price - pos['entry_price']) * quantity
+        else:
+            fill_price = price * (1 + SLIPPAGE_RATE)
+            gross_pnl = (pos['entry_price'] - fill_price) * quantity
+        net_pnl = gross_pnl - fill_price * quantity * ts.FEE_RATE
+        self.capital += net_pnl
+        self.metrics.update_trade(net_pnl, exit_reason=reason, trend_strength=pos['trend_strength'])
+        pos['remaining_quantity'] -= quantity
+        if reason != 'PARTIAL_TAKE_PROFIT':
+            self.position = None
+
+    def mark(self, close: float):
+        """봉 마감 자산/노출 반영"""
+        equity, exposure = self.capital, 0.0
+        pos = self.position
+        if pos is not None:
+            sign = 1 if pos['side'] == 'long' else -1
+            equity += sign * (close - pos['entry_price']) * pos['remaining_quantity']
+            exposure = sign * pos['remaining_quantity'] * close
+        self.metrics.update_bar(equity, exposure)
+
+
+class ShadowBook:
+    """섀도 변형 묶음 (진입 조건은 변형 축으로 벡터 계산)"""
+
+    def __init__(self, variants: Dict[str, Dict[str, float]], initial_capital: float,
+                 timeframe: Optional[str] = None):
+        """
+        Args:
+            variants: 변형 이름 -> 바꿀 상수 (나머지는 trading_strategy 기본값). 'primary'는 자동 추가
+            timeframe: 봉 주기 (샤프/소르티노 연율화, 기본은 연율화 안 함)
+        """
+        base = default_params()
+        periods_per_year = bars_per_year(timeframe) if timeframe else None
+        self.variants: List[ShadowVariant] = []
+        for name, overrides in {PRIMARY_VARIANT: {}, **variants}.items():
+            unknown = set(overrides) - set(SHADOW_PARAM_NAMES)
+            if unknown:
+                raise KeyError(f"섀도 변형 {name}: 바꿀 수 없는 상수 {sorted(unknown)} (지표 기간은 공유)")
+            self.variants.append(ShadowVariant(name, {**base, **overrides}, initial_capital, periods_per_year))
+        # 변형 축 임계값 배열 (ts.entry_rules에 넘겨 진입 조건 벡터 계산)
+        self._p = {name: np.array([v.params[name] for v in self.variants], dtype=np.float64)
+                   for name in ts.RULE_PARAM_NAMES}
+        self.last_time = None
+
+    @classmethod
+    def from_file(cls, path, initial_capital: float, timeframe: Optional[str] = None) -> 'ShadowBook':
+        with open(Path(path), encoding='utf-8') as f:
+            return cls(json.load(f), initial_capital, timeframe)
+
+    def entry_signals(self, row: Dict, prev_row: Dict):
+        """
+        모든 변형의 진입 신호 (trading_strategy.entry_rules, 임계값만 변형별)
+        Returns: (direction 배열 ('long'/'short'/''), trend 배열 ('STRONG'/'WEAK'/'NONE'), capital_ratio 배열)
+        """
+        values = {col: float(row.get(col, np.nan)) for col in ts.RULE_COLUMNS}
+        values['prev_ema_fast'] = float(prev_row.get('ema_fast', np.nan))
+        values['prev_ema_slow'] = float(prev_row.get('ema_slow', np.nan))
+        rules = ts.entry_rules(values, self._p)
+        direction = np.where(rules['long'], 'long', np.where(rules['short'], 'short', '')).astype(object)
+        trend = np.array([ts.TREND_NAMES[int(code)] for code in rules['trend']], dtype=object)
+        return direction, trend, rules['capital_ratio']
+
+    def on_bar(self, candle_data: List[Dict]):
+        """
+        새로 완성된 봉(candle_data[-1]) 처리: 보유 변형은 청산 확인, 보유하지 않던 변형은 진입 확인
+        같은 봉을 두 번 넘기면 무시
+        """
+        if len(candle_data) < 2:
+            return
+        row, prev_row = candle_data[-1], candle_data[-2]
+        if row.get('timestamp') == self.last_time:
+            return
+        self.last_time = row.get('timestamp')
+        high, low, close = float(row['high']), float(row['low']), float(row['close'])
+
+        flat = []
+        for i, variant in enumerate(self.variants):
+            if variant.position is not None:
+                variant.check_exit(high, low)
+            else:
+                flat.append(i)
+
+        if flat:
+            direction, trend, capital_ratio = self.entry_signals(row, prev_row)
+            atr = float(row.get('atr', np.nan))
+            for i in flat:
+                if direction[i]:
+                    self.variants[i].enter(direction[i], close, atr, trend[i], capital_ratio[i], row.get('timestamp'))
+
+        for variant in self.variants:
+            variant.mark(close)
+
+    def summary(self) -> List[Dict]:
+        """변형별 성과 요약 (PerformanceMetrics.summary + 이름/보유 여부)"""
+        out = []
+        for variant in self.variants:
+            summary = variant.metrics.summary()
+            summary['variant'] = variant.name
+            summary['in_position'] = variant.position is not None
+            out.append(summary)
+        return out
+
+    def log_summary(self, logger: logging.Logger):
+        for m in self.summary():
+            logger.info(f"[섀도 {m['variant']}] 수익률 {m['total_return_pct']:.2f}%, 거래 {m['total_trades']}건, "
+                        f"승률 {m['win_rate']:.1f}%, 수익 팩터 {m['profit_factor']:.2f}, "
+                        f"최대 낙폭 {m['max_drawdown']:.2f}%, 샤프 {m['sharpe_ratio']:.2f}"
+                        f"{' (보유 중)' if m['in_position'] else ''}")
@@ -44,6 +44,60 @@ PARTIAL_TAKE_PROFIT_ATR_MULT = 8.0
 PARTIAL_TAKE_PROFIT_RATIO = 0.5
 
 
+# 추세 강도 코드 (generate_signals/entry_rules의 trend 값, Data/binance_eth_futures_backtest.TREND_*도 이 값을 사용)
+TREND_NONE, TREND_WEAK, TREND_STRONG = 0, 1, 2
+TREND_NAMES = {TREND_NONE: "NONE", TREND_WEAK: "WEAK", TREND_STRONG: "STRONG"}
+
+# entry_rules 임계값/비율 (변형별로 바꿀 수 있는 값, shadow_variants에서 사용)
+RULE_PARAM_NAMES = (
+    'ADX_STRONG_THRESHOLD', 'ADX_WEAK_THRESHOLD', 'VOLUME_STRONG_MULT', 'VOLUME_MIN_THRESHOLD',
+    'STRONG_TREND_POSITION_RATIO', 'WEAK_TREND_POSITION_RATIO', 'MAX_POSITION_RATIO',
+    'RSI_LONG_MIN', 'RSI_SHORT_MAX',
+)
+# entry_rules 입력 지표 (+ prev_ema_fast, prev_ema_slow: 직전 봉 EMA)
+RULE_COLUMNS = ('adx', 'volume_ratio', 'ema_fast', 'ema_slow', 'rsi', 'plus_di', 'minus_di', 'close')
+
+
+def rule_params() -> Dict[str, float]:
+    """entry_rules 기본 임계값 (현재 모듈 상수)"""
+    return {name: globals()[name] for name in RULE_PARAM_NAMES}
+
+
+def entry_rules(values: Dict[str, np.ndarray], params: Optional[Dict] = None) -> Dict[str, np.ndarray]:
+    """
+    진입 신호 / 추세 강도 / 포지션 비율 규칙 (check_entry_signal, get_trend_strength와 같은 조건)
+    values: RULE_COLUMNS + prev_ema_fast/prev_ema_slow (봉 배열 또는 봉 1개의 스칼라)
+    params: 임계값 (기본은 rule_params()). 값이 배열이면 values와 브로드캐스트
+            (예: 봉 1개 x 변형 N개 -> 길이 N 결과, shadow_variants)
+    Returns: long, short, trend(TREND_*), capital_ratio
+    """
+    p = rule_params() if params is None else params
+    adx, vr = values['adx'], values['volume_ratio']
+    fast, slow = values['ema_fast'], values['ema_slow']
+    prev_fast, prev_slow = values['prev_ema_fast'], values['prev_ema_slow']
+    rsi, plus_di, minus_di, close = values['rsi'], values['plus_di'], values['minus_di'], values['close']
+    
+    with np.errstate(invalid='ignore'):
+        valid_trend = np.isfinite(adx) & np.isfinite(vr) & (vr >= p['VOLUME_MIN_THRESHOLD'])
+        strong = valid_trend & (adx >= p['ADX_STRONG_THRESHOLD']) & (vr >= p['VOLUME_STRONG_MULT'])
+        weak = valid_trend & ~strong & (adx >= p['ADX_WEAK_THRESHOLD'])
+        trend = np.where(strong, TREND_STRONG, np.where(weak, TREND_WEAK, TREND_NONE)).astype(np.int8)
+        
+        finite = (np.isfinite(fast) & np.isfinite(slow) & np.isfinite(prev_fast) & np.isfinite(prev_slow)
+                  & np.isfinite(rsi) & np.isfinite(plus_di) & np.isfinite(minus_di))
+        base = (trend != TREND_NONE) & finite
+        
+        long = base & (prev_fast <= prev_slow) & (fast > slow) & (rsi >= p['RSI_LONG_MIN']) \
+            & (close > fast) & (plus_di > minus_di)
+        short = base & ~long & (prev_fast >= prev_slow) & (fast < slow) & (rsi <= p['RSI_SHORT_MAX']) \
+            & (close < fast) & (minus_di > plus_di)
+    
+    capital_ratio = np.select([trend == TREND_STRONG, trend == TREND_WEAK],
+                              [np.minimum(p['STRONG_TREND_POSITION_RATIO'], p['MAX_POSITION_RATIO']),
+                               np.minimum(p['WEAK_TREND_POSITION_RATIO'], p['MAX_POSITION_RATIO'])], 0.0)
+    return {'long': long, 'short': short, 'trend': trend, 'capital_ratio': capital_ratio}
+
+
 class TradingStrategy:
     """거래 전략 클래스 - 지표 계산 및 신호 확인"""
     
@@ -208,6 +262,40 @@ class TradingStrategy:
         
         return False, ""
     
+    def generate_signals(self, df: pd.DataFrame, params: Optional[Dict[str, float]] = None) -> pd.DataFrame:
+        """
+        check_entry_signal / get_trend_strength / 포지션 비율을 전체 봉에 대해 벡터로 계산 (entry_rules)
+        i번째 행은 check_entry_signal(df.iloc[i], df.iloc[i-1])과 같음 (첫 행은 신호 없음)
+        Returns: long/short, trend(TREND_*), volume_ratio, capital_ratio(자본 대비 사용 비율)
+        """
+        values = {col: df[col].to_numpy(dtype=np.float64) for col in RULE_COLUMNS}
+        values['prev_ema_fast'] = df['ema_fast'].shift(1).to_numpy(dtype=np.float64)
+        values['prev_ema_slow'] = df['ema_slow'].shift(1).to_numpy(dtype=np.float64)
+        rules = entry_rules(values, params)
+        return pd.DataFrame({'long': rules['long'], 'short': rules['short'], 'trend': rules['trend'],
+                             'volume_ratio': values['volume_ratio'], 'capital_ratio': rules['capital_ratio']},
+                            index=df.index)
+    
+    def signal_mismatches(self, df: pd.DataFrame) -> int:
+        """
+        generate_signals와 행 단위 경로(check_entry_signal/get_trend_strength/calculate_position_size) 비교
+        df: 지표 계산된 봉. Returns: 결과가 다른 행 수 (0이어야 함)
+        """
+        signals = self.generate_signals(df)
+        mismatches = 0
+        for i in range(len(df)):
+            row = df.iloc[i]
+            should_enter, direction = self.check_entry_signal(row, df.iloc[i-1] if i >= 1 else row)
+            trend_strength, _ = self.get_trend_strength(row)
+            _, capital_used = self.calculate_position_size(1.0, trend_strength, 1.0)
+            sig = signals.iloc[i]
+            expected = "long" if sig['long'] else ("short" if sig['short'] else "")
+            if (direction if should_enter else "") != expected \
+                    or trend_strength != TREND_NAMES[int(sig['trend'])] \
+                    or capital_used != sig['capital_ratio']:
+                mismatches += 1
+        return mismatches
+    
     def calculate_stop_loss_take_profit(self, entry_price: float, atr: float, side: str) -> Tuple[float, float, float]:
         """
         손절/익절 가격 계산
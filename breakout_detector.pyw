@@ -5,10 +5,12 @@ import tkinter as tk
 from tkinter import Canvas, Toplevel
 from tkinter.scrolledtext import ScrolledText # 로그창용 위젯
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
 import calendar
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import pandas as pd
-from alpaca_trade_api.rest import REST, TimeFrame
 
 # ==========================================
 # [설정] API 키 입력 (필수!)
@@ -19,8 +21,18 @@ SECRET_KEY = "3kaUm9aMyXUKrHgtCB3TaJ1iwJgsyAuAXhD1PVQEc7Nn"
 BASE_URL = "https://paper-api.alpaca.markets"
 DATA_URL = "https://data.alpaca.markets"
 
-# API 연결 설정
-api = REST(API_KEY, SECRET_KEY, BASE_URL)
+# ==========================================
+# [NEW] 마켓 데이터 레이어 설정
+# ==========================================
+SCREENER_TOP = 50                # 스크리너 조회 종목 수
+SCREENER_CACHE_SECONDS = 60      # 스크리너 결과 캐시 유지 시간 (만료 전에는 재요청 안 함)
+BARS_LOOKBACK_MINUTES = 240      # 분봉 조회 구간 (최근 N분, 거래가 드문 프리장 종목도 BARS_PER_SYMBOL개를 채울 만큼)
+BARS_PER_SYMBOL = 10             # 종목별로 사용할 최근 분봉 개수 (기존 limit=10과 같은 최근 N개 기준)
+MIN_BARS = 5                     # 이보다 봉이 적은 종목은 판정 생략
+BARS_PAGE_LIMIT = 10000          # /v2/stocks/bars 한 페이지 최대 봉 개수 (API 제한)
+MAX_SYMBOLS_PER_REQUEST = 100    # 요청 1건당 최대 종목 수 (URL 길이 제한 고려)
+MAX_WORKERS = 4                  # 청크 동시 조회 스레드 수
+REQUEST_TIMEOUT = (3.05, 5)      # (연결, 읽기) 타임아웃 초
 
 # ==========================================
 # [NEW] 서머타임(DST) 계산기
@@ -56,22 +68,118 @@ def get_market_info():
             "notice_text": "※ 표준시간(겨울): 데이장(10:00 ~ 18:00) 미작동"
         }
 
+# ==========================================
+# [NEW] 마켓 데이터 레이어 (keep-alive 세션 + 심볼 배치)
+# ==========================================
+class MarketDataClient:
+    """
+    알파카 시세 조회 전용 클라이언트
+    - 하나의 requests.Session을 재사용 (매 요청마다 TCP/TLS 연결을 새로 맺지 않음)
+    - 429/5xx 응답은 지수 백오프로 자동 재시도
+    - 종목 리스트를 API 제한에 맞는 청크로 나눠 동시에 조회
+    - 스크리너 결과는 만료 시간까지 캐시
+    """
+
+    def __init__(self, api_key, secret_key, data_url=DATA_URL):
+        self.data_url = data_url
+        self.session = requests.Session()
+        self.session.headers.update({
+            "APCA-API-KEY-ID": api_key,
+            "APCA-API-SECRET-KEY": secret_key,
+        })
+        retry = Retry(
+            total=3, backoff_factor=0.3,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(["GET"]),
+            respect_retry_after_header=True,
+        )
+        adapter = HTTPAdapter(max_retries=retry, pool_connections=1, pool_maxsize=MAX_WORKERS)
+        self.session.mount("https://", adapter)
+        self.executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+
+        self._screener_cache = []
+        self._screener_expires = datetime.min
+
+    def _get(self, path, params):
+        response = self.session.get(f"{self.data_url}{path}", params=params, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        return response.json()
+
+    def get_most_actives(self, top=SCREENER_TOP):
+        """거래량 상위 종목 (캐시가 살아있으면 요청 없이 반환)"""
+        now = datetime.now()
+        if self._screener_cache and now < self._screener_expires:
+            return self._screener_cache, True
+
+        data = self._get("/v1beta1/screener/stocks/most-actives", {"by": "volume", "top": top})
+        self._screener_cache = [s['symbol'] for s in data['most_actives']]
+        self._screener_expires = now + timedelta(seconds=SCREENER_CACHE_SECONDS)
+        return self._screener_cache, False
+
+    def _chunk_size(self, count):
+        # 한 페이지 안에 청크의 모든 봉이 들어오고(페이지네이션 최소화),
+        # 종목이 적어도 MAX_WORKERS개 청크로 나뉘어 동시에 조회되도록 크기 결정
+        per_page = BARS_PAGE_LIMIT // BARS_LOOKBACK_MINUTES
+        per_worker = -(-count // MAX_WORKERS)
+        return max(1, min(MAX_SYMBOLS_PER_REQUEST, per_page, per_worker))
+
+    def _fetch_chunk(self, symbols, start):
+        """청크 1개 조회 (next_page_token이 있으면 이어서 조회)"""
+        params = {
+            "symbols": ",".join(symbols),
+            "timeframe": "1Min",
+            "start": start,
+            "limit": BARS_PAGE_LIMIT,
+        }
+        rows = []
+        while True:
+            data = self._get("/v2/stocks/bars", params)
+            for symbol, bars in (data.get('bars') or {}).items():
+                for b in bars:
+                    rows.append((symbol, b['t'], b['o'], b['h'], b['l'], b['c'], b['v']))
+            token = data.get('next_page_token')
+            if not token:
+                return rows
+            params["page_token"] = token
+
+    def get_minute_bars(self, symbols):
+        """
+        여러 종목의 최근 1분봉 조회
+        Returns: DataFrame (symbol, timestamp, open, high, low, close, volume), 종목별 최근 BARS_PER_SYMBOL개
+        """
+        columns = ['symbol', 'timestamp', 'open', 'high', 'low', 'close', 'volume']
+        if not symbols:
+            return pd.DataFrame(columns=columns)
+
+        start = (datetime.now(timezone.utc) - timedelta(minutes=BARS_LOOKBACK_MINUTES)).strftime('%Y-%m-%dT%H:%M:%SZ')
+        size = self._chunk_size(len(symbols))
+        chunks = [symbols[i:i + size] for i in range(0, len(symbols), size)]
+
+        if len(chunks) == 1:
+            results = [self._fetch_chunk(chunks[0], start)]
+        else:
+            results = list(self.executor.map(lambda c: self._fetch_chunk(c, start), chunks))
+
+        rows = [row for chunk_rows in results for row in chunk_rows]
+        if not rows:
+            return pd.DataFrame(columns=columns)
+
+        bars = pd.DataFrame(rows, columns=columns)
+        bars['timestamp'] = pd.to_datetime(bars['timestamp'], utc=True)
+        bars.sort_values(['symbol', 'timestamp'], inplace=True)
+        return bars.groupby('symbol', sort=False).tail(BARS_PER_SYMBOL).reset_index(drop=True)
+
+
+market_data = MarketDataClient(API_KEY, SECRET_KEY)
+
 # ==========================================
 # 1. 스크리너 (거래량 상위 종목 조회)
 # ==========================================
 def get_hot_stocks(log_func=None):
     try:
-        headers = {"APCA-API-KEY-ID": API_KEY, "APCA-API-SECRET-KEY": SECRET_KEY}
-        params = {"by": "volume", "top": 50} 
-        response = requests.get(
-            f"{DATA_URL}/v1beta1/screener/stocks/most-actives",
-            headers=headers, params=params, timeout=5
-        )
-        if response.status_code == 200:
-            data = response.json()
-            if log_func: log_func(f"[스크리너] 거래량 상위 50종목 갱신 완료")
-            return [s['symbol'] for s in data['most_actives']]
-        return []
+        symbols, cached = market_data.get_most_actives()
+        if log_func and not cached: log_func(f"[스크리너] 거래량 상위 {len(symbols)}종목 갱신 완료")
+        return symbols
     except Exception as e:
         if log_func: log_func(f"[스크리너 에러] {e}")
         return []
@@ -84,10 +192,9 @@ def check_surge(watch_list, cooldowns, alert_callback=None, log_func=None):
     try:
         # log_func(f"[감시] {len(watch_list)}개 종목 시세 조회 중...") # 너무 자주 찍히면 주석 처리
         
-        bars = api.get_bars(watch_list, TimeFrame.Minute, limit=10).df
+        bars = market_data.get_minute_bars(watch_list)
         if bars.empty: return
-
-        if 'symbol' not in bars.columns: bars = bars.reset_index()
+        bars_by_symbol = dict(tuple(bars.groupby('symbol', sort=False)))
 
         market_info = get_market_info()
         pre_start = market_info["pre_start_hour"]
@@ -114,8 +221,8 @@ def check_surge(watch_list, cooldowns, alert_callback=None, log_func=None):
                 else:
                     del cooldowns[symbol] 
 
-            df = bars[bars['symbol'] == symbol]
-            if len(df) < 5: continue
+            df = bars_by_symbol.get(symbol)
+            if df is None or len(df) < MIN_BARS: continue
 
             curr = df.iloc[-1]
             prev_avg_vol = df['volume'].iloc[:-1].mean()